@@ -0,0 +1,76 @@
+"""Historical backtests of a savings plan over every rolling window of past returns.
+
+The plan is the Retirement tab's: a starting balance plus a contribution at the end of
+each year (raised with inflation), invested in a stock/bond mix rebalanced every year.
+It is replayed against the bundled annual US returns (data/historical_returns.csv) for
+every run of consecutive years of the plan's length, so a 30-year plan is tested from
+1928-1957 through 1994-2023.
+
+All windows are evaluated at once: sliding_window_view turns the yearly series into a
+(windows, years) array without copying, and the balance path of every window follows
+from cumulative products and sums along the rows:
+    balance_t = growth_t * (savings + sum over j <= t of contribution_j / growth_j)
+where growth_t is the compound growth factor through year t.
+"""
+import csv
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+import retirement_sim
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'historical_returns.csv')
+
+# Calendar years and the matching annual returns as fractions
+History = namedtuple("History", "years stocks bonds inflation")
+
+# stock_share: fraction in stocks (the rest in bonds), rebalanced yearly
+BacktestParams = namedtuple(
+    "BacktestParams",
+    "savings contribution years stock_share index_contributions",
+    defaults=(0.6, True),
+)
+
+# start_years: first calendar year of each window; real_paths: balance in today's money
+# (the window's first year) at the end of each plan year, shaped (windows, years);
+# ending: real_paths[:, -1]; percentiles: of ending, keyed by retirement_sim.PERCENTILES;
+# worst: indexes of the windows with the lowest endings, worst first
+BacktestResult = namedtuple("BacktestResult", "start_years real_paths ending percentiles worst")
+
+
+@lru_cache(maxsize=4)
+def load_history(path=HISTORY_FILE):
+    years, stocks, bonds, inflation = [], [], [], []
+    with open(path, newline='') as f:
+        for row in csv.DictReader(line for line in f if not line.startswith('#')):
+            years.append(int(row['year']))
+            stocks.append(float(row['stocks']) / 100.0)
+            bonds.append(float(row['bonds']) / 100.0)
+            inflation.append(float(row['inflation']) / 100.0)
+    return History(np.array(years), np.array(stocks), np.array(bonds), np.array(inflation))
+
+
+def run_backtest(params, history=None, n_worst=5):
+    history = history or load_history()
+    years = int(params.years)
+    if not 0 < years <= len(history.years):
+        raise ValueError(f"The historical data covers {len(history.years)} years "
+                         f"({history.years[0]}-{history.years[-1]}); plans must fit within it.")
+    portfolio = params.stock_share * history.stocks + (1.0 - params.stock_share) * history.bonds
+
+    growth = np.cumprod(sliding_window_view(1.0 + portfolio, years), axis=1)
+    prices = np.cumprod(sliding_window_view(1.0 + history.inflation, years), axis=1)
+    contributions = np.full(growth.shape, float(params.contribution))
+    if params.index_contributions:
+        # Year j's contribution is raised by the inflation of the years before it
+        contributions[:, 1:] *= prices[:, :-1]
+    nominal = growth * (float(params.savings) + np.cumsum(contributions / growth, axis=1))
+    real_paths = nominal / prices
+
+    ending = real_paths[:, -1]
+    percentiles = dict(zip(retirement_sim.PERCENTILES, np.percentile(ending, retirement_sim.PERCENTILES)))
+    worst = np.argsort(ending, kind='stable')[:n_worst]
+    return BacktestResult(history.years[:len(ending)], real_paths, ending, percentiles, worst)
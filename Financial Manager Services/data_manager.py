@@ -1,57 +1,672 @@
+from collections import namedtuple
+from collections.abc import Sequence
 import json
-from datetime import datetime
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from datetime import date, datetime
 import os
+import threading
+
+from storage import CATEGORIES, DATE_FIELDS, KIND_FIELDS, JsonStore, JournalStore, SaveScheduler, SqliteStore, empty_data, migrate_json_to_sqlite
+from tax_engine import DEFAULT_TAX_PAYMENT_CATEGORIES, TaxEngine
+
+_MISSING = object()
+
+# Values accepted for DataManager(storage=...)
+STORAGE_MODES = ("json", "journal", "sqlite")
+
+# Materialized monthly rollups: name -> (source category, row filter). The filter names a
+# TaxEngine predicate, so the rollups follow the configured tax categories. Each rollup
+# keeps {month: {kind: [total, count]}}, kind being the expense category or income source.
+ROLLUPS = {
+    "expenses": ("expenses", None),
+    "income": ("income", None),
+    "deductible": ("expenses", "is_deductible"),
+    "tax_payments": ("expenses", "is_tax_payment"),
+}
+_ROLLUP_FIELDS = {"amount", "is_tax_deductible"} | set(KIND_FIELDS.values())
+
+# Published to subscribers after each change: op is "add", "update" or "delete",
+# ids a tuple of record ids and fields the names of updated fields (empty otherwise).
+DataChange = namedtuple("DataChange", "op category ids fields")
+
+
+def _to_ordinal(value):
+    """Day ordinal for a date, datetime, YYYY-MM-DD string or ordinal; None if missing or unparsable."""
+    if not value:
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, datetime):
+        return value.toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').toordinal()
+        except (TypeError, ValueError):
+            return None
+
+
+def _bound_ordinal(value, name):
+    """Day ordinal of a start/end range bound, or None for an open end (value None).
+
+    Unlike record dates, which may be missing and are then treated as undated, a bound
+    that cannot be parsed is a caller error and raises ValueError.
+    """
+    if value is None:
+        return None
+    ordinal = _to_ordinal(value)
+    if ordinal is None:
+        raise ValueError(f"{name} must be a date, datetime, YYYY-MM-DD string or None, not {value!r}")
+    return ordinal
+
+
+def _month_of(ordinal):
+    day = date.fromordinal(ordinal)
+    return day.year * 12 + day.month - 1
+
+
+def _month_bounds(ordinal):
+    """First and last day ordinals of the month containing ordinal."""
+    day = date.fromordinal(ordinal)
+    first = date(day.year, day.month, 1)
+    following = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    return first.toordinal(), following.toordinal() - 1
+
+class RangeView(Sequence):
+    """Read-only sequence of the records query_range would return, oldest first (or
+    newest first), read from the date index on each access instead of being copied.
+
+    len() and a slice cost O(log n + k) and always reflect the current data, so views
+    can back long tables and "most recent" lists without copying a category. index_of
+    finds a record's position in O(log n). Undated records sit at the start (end when
+    newest_first); positions among them cost O(undated).
+    """
+
+    def __init__(self, manager, category, start=None, end=None, include_undated=True, newest_first=False):
+        self._manager = manager
+        self.category = category
+        lo_day = _bound_ordinal(start, "start")
+        hi_day = _bound_ordinal(end, "end")
+        self._lo_key = None if lo_day is None else (lo_day,)
+        self._hi_key = None if hi_day is None else (hi_day, float('inf'))
+        self.include_undated = include_undated
+        self.newest_first = newest_first
+
+    def _bounds(self):
+        keys = self._manager._date_keys[self.category]
+        lo = 0 if self._lo_key is None else bisect_left(keys, self._lo_key)
+        hi = len(keys) if self._hi_key is None else bisect_right(keys, self._hi_key)
+        return keys, lo, max(lo, hi)
+
+    def _undated_ids(self):
+        return list(self._manager._undated[self.category]) if self.include_undated else []
+
+    def __len__(self):
+        with self._manager._lock:
+            _, lo, hi = self._bounds()
+            undated = len(self._manager._undated[self.category]) if self.include_undated else 0
+            return hi - lo + undated
+
+    def _records(self, i, j):
+        # Records at positions [i, j) of the view
+        with self._manager._lock:
+            keys, lo, hi = self._bounds()
+            undated = self._undated_ids() if self.include_undated and self._manager._undated[self.category] else []
+            dated = hi - lo
+            if self.newest_first:
+                ids = [item_id for _, item_id in reversed(keys[max(lo, hi - j):max(lo, hi - i)])]
+                if j > dated:
+                    ids.extend(reversed(undated[max(0, len(undated) - (j - dated)):len(undated) - max(0, i - dated)]))
+            else:
+                ids = undated[i:j]
+                ids.extend(item_id for _, item_id in keys[lo + max(0, i - len(undated)):min(hi, lo + max(0, j - len(undated)))])
+            by_id = self._manager._index[self.category]
+            return [by_id[item_id] for item_id in ids]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._records(start, max(start, stop))
+            return [self[i] for i in range(start, stop, step)]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("RangeView index out of range")
+        return self._records(index, index + 1)[0]
+
+    def __iter__(self):
+        pos = 0
+        while True:
+            chunk = self._records(pos, pos + 1000)
+            if not chunk:
+                return
+            yield from chunk
+            pos += len(chunk)
+
+    def index_of(self, item_id):
+        """Position of the record with this id (int or str) in the view, or None."""
+        try:
+            item_id = int(item_id)
+        except (TypeError, ValueError):
+            return None
+        with self._manager._lock:
+            record = self._manager._index[self.category].get(item_id)
+            if record is None:
+                return None
+            keys, lo, hi = self._bounds()
+            undated = self._manager._undated[self.category]
+            n_undated = len(undated) if self.include_undated else 0
+            ordinal = _to_ordinal(record.get(DATE_FIELDS[self.category]))
+            if ordinal is None:
+                if not self.include_undated:
+                    return None
+                pos = list(undated).index(item_id)
+                return hi - lo + n_undated - 1 - pos if self.newest_first else pos
+            pos = bisect_left(keys, (ordinal, item_id))
+            if not lo <= pos < hi or keys[pos] != (ordinal, item_id):
+                return None
+            return hi - 1 - pos if self.newest_first else n_undated + pos - lo
+
 
 class DataManager:
-    def __init__(self, data_file="moneymind_data.json"):
+    def __init__(self, data_file="moneymind_data.json", storage="json", tax_categories=DEFAULT_TAX_PAYMENT_CATEGORIES):
+        """storage: "json" rewrites the whole file on each save, "journal" appends each change to a log,
+        "sqlite" keeps one row per record in a .db file next to data_file.
+        tax_categories: expense categories counted as tax payments (see tax_engine)."""
         self.data_file = data_file
-        self.data = {
-            "income": [],
-            "expenses": [],
-            "debts": [],
-            "assets": [],
-            "investments": []
-        }
+        self._store = self._open_store(storage)
+        # Guards self._data against the background saver reading it mid-change
+        self._lock = threading.RLock()
+        # Whole-file stores save off the Tk thread; incremental stores write each change directly
+        self._saver = None if self._store.incremental else SaveScheduler(self._write_snapshot)
+        self._data = empty_data()
+        self._batch_changes = None
+        self._batch_undo = None
+        self._subscribers = []
+        # Bumped on every in-memory change, so derived results can be cached per version
+        self.version = 0
+        self.tax_engine = TaxEngine(self, tax_categories)
+        self._rebuild_indexes()
         self._load_data()
-        print(f"Data manager initialized using file: {self.data_file}")
+        print(f"Data manager initialized using file: {self.data_file} ({storage} storage)")
+
+    @property
+    def data(self):
+        """All records by category. Pending deletes are compacted away first, so deleted
+        records never show up here."""
+        with self._lock:
+            self._compact()
+            return self._data
+
+    @data.setter
+    def data(self, value):
+        with self._lock:
+            self._data = value
+            self._rebuild_indexes()
+
+    def _open_store(self, storage):
+        if storage not in STORAGE_MODES:
+            raise ValueError(f"Unknown storage {storage!r}; expected one of {STORAGE_MODES}")
+        if storage == "journal":
+            return JournalStore(self.data_file)
+        if storage == "sqlite":
+            db_file = os.path.splitext(self.data_file)[0] + ".db"
+            if not os.path.exists(db_file) and os.path.exists(self.data_file):
+                # First run on SQLite: bring the existing JSON data across once
+                count = migrate_json_to_sqlite(self.data_file, db_file)
+                print(f"Migrated {count} records from {self.data_file} to {db_file}.")
+            return SqliteStore(db_file)
+        return JsonStore(self.data_file)
 
     def _load_data(self):
-        if os.path.exists(self.data_file):
+        if self._store.exists():
             try:
-                with open(self.data_file, 'r') as f:
-                    self.data = json.load(f)
+                self._data = self._store.load()
                 print("Data loaded successfully.")
             except json.JSONDecodeError as e:
-                print(f"Error decoding JSON from {self.data_file}: {e}. Initializing with empty data.")
-                # If file is corrupt, start fresh
-                self.data = {
-                    "income": [],
-                    "expenses": [],
-                    "debts": [],
-                    "assets": [],
-                    "investments": []
-                }
+                # Keep the unreadable file for recovery instead of overwriting it on the next save
+                backup = f"{self.data_file}.corrupt-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+                try:
+                    os.replace(self.data_file, backup)
+                except OSError:
+                    backup = None
+                print(f"Error decoding JSON from {self.data_file}: {e}. Moved it to {backup}. Initializing with empty data.")
+                self._data = empty_data()
             except Exception as e:
                 print(f"An unexpected error occurred while loading data: {e}. Initializing with empty data.")
-                self.data = {
-                    "income": [],
-                    "expenses": [],
-                    "debts": [],
-                    "assets": [],
-                    "investments": []
-                }
+                self._data = empty_data()
         else:
             print(f"Data file '{self.data_file}' not found. Starting with empty data.")
             self.save_data() # Create an empty file for the first run
+        self._rebuild_indexes()
 
     def save_data(self):
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.data, f, indent=4)
+            with self._lock:
+                self._compact()
+                self._store.save(self._data)
             print("Data saved successfully.")
         except Exception as e:
             print(f"Error saving data: {e}")
 
+    def _write_snapshot(self):
+        # Runs on the saver thread: copy under the lock, serialize, write and fsync outside it
+        with self._lock:
+            self._compact()
+            snapshot = self._snapshot()
+        self._store.write(self._store.serialize(snapshot))
+
+    def _snapshot(self):
+        # Records are copied one level deep: updates replace field values rather than
+        # mutating them, so the copies stay consistent once the lock is released
+        snapshot = dict(self._data)
+        for category in CATEGORIES:
+            snapshot[category] = [dict(record) for record in self._data[category]]
+        snapshot["next_ids"] = dict(self._next_ids)
+        return snapshot
+
+    def flush(self):
+        """Write any changes still waiting for the background saver."""
+        if self._saver is not None:
+            self._saver.flush()
+
+    def _record_change(self, change, undo):
+        self.version += 1
+        if self._batch_changes is not None:
+            self._batch_changes.append(change)
+            self._batch_undo.append(undo)
+        else:
+            self._persist(change)
+            self._publish([change])
+
+    def subscribe(self, callback):
+        """Call callback(DataChange) after every committed change.
+
+        Callbacks run synchronously on the thread that made the change, so they
+        should only note what changed and defer real work.  A batch publishes
+        once on commit, with its changes merged per (op, category), and a
+        rolled-back batch publishes nothing.
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _publish(self, changes):
+        if not self._subscribers:
+            return
+        merged = {}
+        for change in changes:
+            ids, fields = merged.setdefault((change["op"], change["category"]), ({}, set()))
+            ids[change["id"]] = None
+            fields.update(change.get("fields", ()))
+        self._notify([DataChange(op, category, tuple(ids), frozenset(fields)) for (op, category), (ids, fields) in merged.items()])
+
+    def _notify(self, events):
+        for callback in list(self._subscribers):
+            for event in events:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"Error in data change subscriber: {e}")
+
+    def _persist(self, change):
+        # Journal and SQLite stores persist just this change; JSON mode schedules a background rewrite
+        if self._store.incremental:
+            try:
+                self._store.append(change)
+            except Exception as e:
+                print(f"Error recording change: {e}")
+        else:
+            self._saver.mark_dirty()
+
+    @contextmanager
+    def batch(self):
+        """Group several changes into a single write.
+
+        Nothing is persisted until the block exits, and then everything is written
+        at once (one journal record, one SQLite transaction or one file rewrite).
+        The data lock is held for the whole block, so the background saver and other
+        threads never see a half-finished batch.
+        If the block raises, the in-memory data is rolled back and none of its records
+        are written; only the id counters it advanced are saved, so ids handed out
+        inside a rolled-back batch are skipped, also after a reload.  Nested batches
+        join the outermost one.
+        """
+        if self._batch_changes is not None:
+            yield self
+            return
+        with self._lock:
+            self._batch_changes = []
+            self._batch_undo = []
+            start_ids = dict(self._next_ids)
+            try:
+                yield self
+            except BaseException:
+                undo = self._batch_undo
+                self._batch_changes = self._batch_undo = None
+                for entry in reversed(undo):
+                    self._undo(entry)
+                counters = [{"op": "next_id", "category": category, "next_id": next_id}
+                            for category, next_id in self._next_ids.items() if next_id != start_ids.get(category)]
+                if counters:
+                    self._persist({"op": "batch", "changes": counters})
+                elif undo and not self._store.incremental:
+                    # A snapshot may already be pending; make sure the next one is taken after the rollback
+                    self._saver.mark_dirty()
+                print(f"Batch rolled back ({len(undo)} changes discarded).")
+                raise
+            changes = self._batch_changes
+            self._batch_changes = self._batch_undo = None
+            if changes:
+                self._persist({"op": "batch", "changes": changes})
+        if changes:
+            self._publish(changes)
+
+    def _undo(self, entry):
+        with self._lock:
+            self.version += 1
+            op, category, record, old = entry
+            if op == "add":
+                self._index[category].pop(record["id"], None)
+                self._unindex_record(category, record)
+                items = self._data[category]
+                # The record was appended, so it is almost always at the end
+                for pos in range(len(items) - 1, -1, -1):
+                    if items[pos] is record:
+                        del items[pos]
+                        break
+            elif op == "update":
+                self._unindex_record(category, record)
+                for key, value in old.items():
+                    if value is _MISSING:
+                        record.pop(key, None)
+                    else:
+                        record[key] = value
+                self._index_record(category, record)
+            elif op == "delete":
+                dead = self._tombstones[category]
+                if any(item is record for item in dead):
+                    dead[:] = [item for item in dead if item is not record]
+                else:
+                    self._data[category].append(record)
+                self._index[category][record["id"]] = record
+                self._index_record(category, record)
+
+    def _rebuild_indexes(self):
+        # Per-category id -> record lookup. Deleted records stay in the list as
+        # tombstones until the list is compacted, so a delete never rebuilds it.
+        self._index = {}
+        self._tombstones = {}
+        # Monotonic id counters are saved with the data ("next_ids") so ids are never
+        # reused after a delete; taking the max with the loaded ids repairs old files.
+        self._next_ids = self._data.setdefault("next_ids", {})
+        # Date index: per category a sorted list of (day ordinal, id), parsed once here
+        # and kept up to date by the mutation primitives; undated records are kept apart.
+        self._date_keys = {}
+        self._undated = {}
+        self._rollups = {name: {} for name in ROLLUPS}
+        self._rollup_filters = {name: getattr(self.tax_engine, accepts) if accepts else None
+                                for name, (_, accepts) in ROLLUPS.items()}
+        self.version += 1
+        for category in CATEGORIES:
+            items = self._data.setdefault(category, [])
+            self._index[category] = {item["id"]: item for item in items}
+            self._tombstones[category] = []
+            self._next_ids[category] = max([self._next_ids.get(category, 1)] + [item_id + 1 for item_id in self._index[category]])
+            self._date_keys[category] = []
+            self._undated[category] = {}
+            for item in items:
+                ordinal = _to_ordinal(item.get(DATE_FIELDS[category]))
+                if ordinal is None:
+                    self._undated[category][item["id"]] = None
+                else:
+                    self._date_keys[category].append((ordinal, item["id"]))
+                self._rollup(category, item, ordinal, 1)
+            self._date_keys[category].sort()
+
+    def _index_record(self, category: str, record: dict):
+        ordinal = _to_ordinal(record.get(DATE_FIELDS[category]))
+        if ordinal is None:
+            self._undated[category][record["id"]] = None
+        else:
+            insort(self._date_keys[category], (ordinal, record["id"]))
+        self._rollup(category, record, ordinal, 1)
+
+    def _unindex_record(self, category: str, record: dict):
+        ordinal = _to_ordinal(record.get(DATE_FIELDS[category]))
+        self._rollup(category, record, ordinal, -1)
+        if ordinal is None:
+            self._undated[category].pop(record["id"], None)
+            return
+        keys = self._date_keys[category]
+        pos = bisect_left(keys, (ordinal, record["id"]))
+        if pos < len(keys) and keys[pos] == (ordinal, record["id"]):
+            del keys[pos]
+
+    def _rollup(self, category: str, record: dict, ordinal, sign: int):
+        # Add (sign=1) or retract (sign=-1) one record in every rollup fed by its category
+        month = None if ordinal is None else _month_of(ordinal)
+        for name, (source, _) in ROLLUPS.items():
+            accepts = self._rollup_filters[name]
+            if source != category or (accepts and not accepts(record)):
+                continue
+            months = self._rollups[name]
+            kinds = months.setdefault(month, {})
+            cell = kinds.setdefault(record.get(KIND_FIELDS[category], "Uncategorized"), [0.0, 0])
+            cell[0] += sign * float(record.get("amount") or 0.0)
+            cell[1] += sign
+            if cell[1] == 0:
+                del kinds[record.get(KIND_FIELDS[category], "Uncategorized")]
+                if not kinds:
+                    del months[month]
+
+    def query_range(self, category: str, start=None, end=None, include_undated: bool = True):
+        """Records of a category whose date falls in [start, end], oldest first.
+
+        start and end may be date/datetime objects, YYYY-MM-DD strings or None for an
+        open end.  Records without a parsable date come first unless include_undated
+        is False (reports have always included them).  Cost is O(log n + k).  An
+        unparsable start or end raises ValueError.
+        """
+        lo_day = _bound_ordinal(start, "start")
+        hi_day = _bound_ordinal(end, "end")
+        with self._lock:
+            keys = self._date_keys[category]
+            by_id = self._index[category]
+            lo = 0 if lo_day is None else bisect_left(keys, (lo_day,))
+            hi = len(keys) if hi_day is None else bisect_right(keys, (hi_day, float('inf')))
+            records = [by_id[item_id] for item_id in self._undated[category]] if include_undated else []
+            records.extend(by_id[item_id] for _, item_id in keys[lo:hi])
+            return records
+
+    def range_view(self, category: str, start=None, end=None, include_undated: bool = True, newest_first: bool = False):
+        """A RangeView of query_range's records: a live sequence read from the date index
+        on demand, so tables and recent-item lists do not copy the whole category."""
+        return RangeView(self, category, start, end, include_undated, newest_first)
+
+    def count_range(self, category: str, start=None, end=None, include_undated: bool = True) -> int:
+        """Number of records query_range would return, in O(log n)."""
+        lo_day = _bound_ordinal(start, "start")
+        hi_day = _bound_ordinal(end, "end")
+        with self._lock:
+            keys = self._date_keys[category]
+            lo = 0 if lo_day is None else bisect_left(keys, (lo_day,))
+            hi = len(keys) if hi_day is None else bisect_right(keys, (hi_day, float('inf')))
+            return max(0, hi - lo) + (len(self._undated[category]) if include_undated else 0)
+
+    def iter_range(self, category: str, start=None, end=None, include_undated: bool = True, chunk_size: int = 1000):
+        """Yield the records of query_range as lists of at most chunk_size copies.
+
+        The lock is held only while one chunk is copied, so this can run on another
+        thread while the data keeps changing. The walk resumes after the last key
+        it returned, so records are never repeated; records added or removed behind
+        the walk are not seen. The bounds are checked before the first chunk is asked for.
+        """
+        lo_day = _bound_ordinal(start, "start")
+        hi_day = _bound_ordinal(end, "end")
+        return self._iter_range(category, lo_day, hi_day, include_undated, chunk_size)
+
+    def _iter_range(self, category, lo_day, hi_day, include_undated, chunk_size):
+        if include_undated:
+            with self._lock:
+                undated = list(self._undated[category])
+            for pos in range(0, len(undated), chunk_size):
+                with self._lock:
+                    by_id = self._index[category]
+                    chunk = [dict(by_id[i]) for i in undated[pos:pos + chunk_size] if i in by_id]
+                if chunk:
+                    yield chunk
+        hi_key = (float('inf'),) if hi_day is None else (hi_day, float('inf'))
+        last_key = None
+        while True:
+            with self._lock:
+                keys = self._date_keys[category]
+                if last_key is not None:
+                    lo = bisect_right(keys, last_key)
+                else:
+                    lo = 0 if lo_day is None else bisect_left(keys, (lo_day,))
+                hi = min(lo + chunk_size, bisect_right(keys, hi_key))
+                if lo >= hi:
+                    return
+                by_id = self._index[category]
+                chunk = [dict(by_id[item_id]) for _, item_id in keys[lo:hi]]
+                last_key = keys[hi - 1]
+            yield chunk
+
+    def daily_totals(self, category: str, start=None, end=None) -> list:
+        """(day ordinal, total amount) for each day with dated records in [start, end],
+        oldest first. Read from the date index, so no dates are parsed."""
+        lo_day = _bound_ordinal(start, "start")
+        hi_day = _bound_ordinal(end, "end")
+        with self._lock:
+            keys = self._date_keys[category]
+            by_id = self._index[category]
+            lo = 0 if lo_day is None else bisect_left(keys, (lo_day,))
+            hi = len(keys) if hi_day is None else bisect_right(keys, (hi_day, float('inf')))
+            days, totals = [], []
+            for ordinal, item_id in keys[lo:hi]:
+                amount = float(by_id[item_id].get("amount") or 0.0)
+                if days and days[-1] == ordinal:
+                    totals[-1] += amount
+                else:
+                    days.append(ordinal)
+                    totals.append(amount)
+            return list(zip(days, totals))
+
+    def rollup_totals(self, name: str, start=None, end=None) -> dict:
+        """Totals per kind (expense category or income source) of a rollup over [start, end].
+
+        name is a key of ROLLUPS.  Whole months are summed from the monthly rollup and
+        only the partial months at either end are read from the date index, so the cost
+        is O(months) rather than O(transactions).  Undated records are included, as in
+        query_range.
+        """
+        category = ROLLUPS[name][0]
+        accepts = self._rollup_filters[name]
+        with self._lock:
+            lo = _bound_ordinal(start, "start")
+            hi = _bound_ordinal(end, "end")
+            spans = []
+            first_full = last_full = None
+            if lo is not None:
+                month_start, month_end = _month_bounds(lo)
+                first_full = _month_of(lo) if lo == month_start else _month_of(lo) + 1
+                if lo != month_start:
+                    spans.append((lo, month_end if hi is None else min(month_end, hi)))
+            if hi is not None:
+                month_start, month_end = _month_bounds(hi)
+                last_full = _month_of(hi) if hi == month_end else _month_of(hi) - 1
+                if hi != month_end and not (spans and _month_of(lo) == _month_of(hi)):
+                    spans.append((month_start if lo is None else max(month_start, lo), hi))
+            totals = {}
+            for month, kinds in self._rollups[name].items():
+                if month is not None and ((first_full is not None and month < first_full)
+                                          or (last_full is not None and month > last_full)):
+                    continue
+                for kind, (total, _) in kinds.items():
+                    totals[kind] = totals.get(kind, 0.0) + total
+            field = KIND_FIELDS[category]
+            for span_start, span_end in spans:
+                for record in self.query_range(category, span_start, span_end, include_undated=False):
+                    if accepts is None or accepts(record):
+                        kind = record.get(field, "Uncategorized")
+                        totals[kind] = totals.get(kind, 0.0) + float(record.get("amount") or 0.0)
+            return totals
+
+    def rollup_total(self, name: str, start=None, end=None) -> float:
+        return sum(self.rollup_totals(name, start, end).values())
+
+    def set_tax_categories(self, tax_categories):
+        """Change which expense categories count as tax payments and rebuild the rollups.
+
+        Subscribers get an expenses "update" event with no ids, since which records are
+        tax payments may have changed while the records themselves have not.
+        """
+        with self._lock:
+            self.tax_engine.set_tax_categories(tax_categories)
+            # Drop tombstones first: the rebuild indexes whatever is still in the lists
+            self._compact()
+            self._rebuild_indexes()
+        self._notify([DataChange("update", "expenses", (), frozenset(("category",)))])
+
+    def _compact(self, category: str = None):
+        with self._lock:
+            for cat in ([category] if category else CATEGORIES):
+                dead = self._tombstones[cat]
+                if dead:
+                    dead_ids = {id(item) for item in dead}
+                    # Slice assignment keeps the list object that callers may already hold
+                    self._data[cat][:] = [item for item in self._data[cat] if id(item) not in dead_ids]
+                    dead.clear()
+
+    def _find(self, category: str, item_id: int):
+        return self._index.get(category, {}).get(item_id)
+
+    def _insert(self, category: str, record: dict):
+        with self._lock:
+            self._data[category].append(record)
+            self._index[category][record["id"]] = record
+            self._index_record(category, record)
+            self._record_change({"op": "add", "category": category, "id": record["id"], "record": record},
+                                ("add", category, record, None))
+
+    def _modify(self, category: str, record: dict, fields: dict):
+        with self._lock:
+            old = {key: record.get(key, _MISSING) for key in fields}
+            redate = DATE_FIELDS[category] in fields or not _ROLLUP_FIELDS.isdisjoint(fields)
+            if redate:
+                self._unindex_record(category, record)
+            record.update(fields)
+            if redate:
+                self._index_record(category, record)
+            self._record_change({"op": "update", "category": category, "id": record["id"], "fields": fields},
+                                ("update", category, record, old))
+
+    def _remove(self, category: str, record: dict):
+        with self._lock:
+            self._index[category].pop(record["id"], None)
+            self._unindex_record(category, record)
+            dead = self._tombstones[category]
+            dead.append(record)
+            # Compact once tombstones make up a quarter of the list (reads compact too)
+            if len(dead) * 4 >= len(self._data[category]):
+                self._compact(category)
+            self._record_change({"op": "delete", "category": category, "id": record["id"]},
+                                ("delete", category, record, None))
+
+    def get_item(self, category: str, item_id: int):
+        """Return the record with this id from a category, or None."""
+        return self._find(category, item_id)
+
     def add_income(self, date: str, source: str, amount: float, notes: str = None, recurring: bool = False):
         income_entry = {
             "id": self._get_next_id("income"),
@@ -61,36 +676,37 @@ class DataManager:
             "notes": notes,
             "recurring": bool(recurring)
         }
-        self.data["income"].append(income_entry)
+        self._insert("income", income_entry)
         print(f"Added income: {source} - {amount}")
         return income_entry["id"]
 
     def get_income(self):
-        return self.data["income"]
+        self._compact("income")
+        return self._data["income"]
 
     def update_income(self, income_id: int, date: str = None, source: str = None, amount: float = None, notes: str = None, recurring: bool = None):
-        for entry in self.data["income"]:
-            if entry["id"] == income_id:
-                if date is not None: entry["date"] = date
-                if source is not None: entry["source"] = source
-                if amount is not None: entry["amount"] = amount
-                if notes is not None: entry["notes"] = notes
-                if recurring is not None: entry["recurring"] = bool(recurring)
-                self.save_data()
-                print(f"Updated income with ID {income_id}")
-                return True
+        entry = self._find("income", income_id)
+        if entry is not None:
+            fields = {}
+            if date is not None: fields["date"] = date
+            if source is not None: fields["source"] = source
+            if amount is not None: fields["amount"] = amount
+            if notes is not None: fields["notes"] = notes
+            if recurring is not None: fields["recurring"] = bool(recurring)
+            self._modify("income", entry, fields)
+            print(f"Updated income with ID {income_id}")
+            return True
         print(f"Income with ID {income_id} not found.")
         return False
 
     def delete_item(self, category: str, item_id: int):
-        if category not in self.data:
+        if category not in self._index:
             print(f"Category '{category}' not found.")
             return False
 
-        initial_len = len(self.data[category])
-        self.data[category] = [item for item in self.data[category] if item["id"] != item_id]
-        if len(self.data[category]) < initial_len:
-            self.save_data()
+        entry = self._find(category, item_id)
+        if entry is not None:
+            self._remove(category, entry)
             print(f"Deleted item with ID {item_id} from {category}.")
             return True
         print(f"Item with ID {item_id} not found in {category}.")
@@ -106,12 +722,13 @@ class DataManager:
             "is_tax_deductible": is_tax_deductible,
             "recurring": bool(recurring)
         }
-        self.data["expenses"].append(expense_entry)
+        self._insert("expenses", expense_entry)
         print(f"Added expense: {category} - {amount}")
         return expense_entry["id"]
 
     def get_expenses(self):
-        return self.data["expenses"]
+        self._compact("expenses")
+        return self._data["expenses"]
 
     def add_receipt_to_expense(self, expense_id: int, filepath: str):
         """Attach a receipt file to an expense. Copies the file into a receipts folder and stores the path."""
@@ -134,63 +751,62 @@ class DataManager:
             return False
 
         # Find expense and attach
-        for entry in self.data["expenses"]:
-            if entry["id"] == expense_id:
-                entry.setdefault('receipts', []).append(dest_path)
-                self.save_data()
-                print(f"Attached receipt to expense {expense_id}: {dest_path}")
-                return True
+        entry = self._find("expenses", expense_id)
+        if entry is not None:
+            self._modify("expenses", entry, {"receipts": entry.get('receipts', []) + [dest_path]})
+            print(f"Attached receipt to expense {expense_id}: {dest_path}")
+            return True
 
         print(f"Expense with ID {expense_id} not found to attach receipt.")
         return False
 
     def get_receipts_for_expense(self, expense_id: int):
-        for entry in self.data["expenses"]:
-            if entry["id"] == expense_id:
-                return entry.get('receipts', [])
+        entry = self._find("expenses", expense_id)
+        if entry is not None:
+            return entry.get('receipts', [])
         return []
 
     def remove_receipt_from_expense(self, expense_id: int, receipt_path: str, delete_file: bool = False) -> bool:
         """Remove a receipt reference from an expense. Optionally delete the file from disk."""
-        for entry in self.data["expenses"]:
-            if entry["id"] == expense_id:
-                receipts = entry.get('receipts', [])
-                if receipt_path in receipts:
-                    receipts.remove(receipt_path)
-                    entry['receipts'] = receipts
-                    # Optionally remove the actual file
-                    if delete_file:
-                        try:
-                            if os.path.exists(receipt_path):
-                                os.remove(receipt_path)
-                        except Exception:
-                            pass
-                    self.save_data()
-                    print(f"Removed receipt from expense {expense_id}: {receipt_path}")
-                    return True
-                return False
+        entry = self._find("expenses", expense_id)
+        if entry is not None:
+            receipts = list(entry.get('receipts', []))
+            if receipt_path in receipts:
+                receipts.remove(receipt_path)
+                # Optionally remove the actual file
+                if delete_file:
+                    try:
+                        if os.path.exists(receipt_path):
+                            os.remove(receipt_path)
+                    except Exception:
+                        pass
+                self._modify("expenses", entry, {"receipts": receipts})
+                print(f"Removed receipt from expense {expense_id}: {receipt_path}")
+                return True
+            return False
         return False
 
     def update_expense(self, expense_id: int, date: str = None, category: str = None, amount: float = None, description: str = None, is_tax_deductible: bool = None, recurring: bool = None):
-        for entry in self.data["expenses"]:
-            if entry["id"] == expense_id:
-                if date is not None: entry["date"] = date
-                if category is not None: entry["category"] = category
-                if amount is not None: entry["amount"] = amount
-                if description is not None: entry["description"] = description
-                if is_tax_deductible is not None: entry["is_tax_deductible"] = is_tax_deductible
-                if recurring is not None: entry["recurring"] = bool(recurring)
-                self.save_data()
-                print(f"Updated expense with ID {expense_id}")
-                return True
+        entry = self._find("expenses", expense_id)
+        if entry is not None:
+            fields = {}
+            if date is not None: fields["date"] = date
+            if category is not None: fields["category"] = category
+            if amount is not None: fields["amount"] = amount
+            if description is not None: fields["description"] = description
+            if is_tax_deductible is not None: fields["is_tax_deductible"] = is_tax_deductible
+            if recurring is not None: fields["recurring"] = bool(recurring)
+            self._modify("expenses", entry, fields)
+            print(f"Updated expense with ID {expense_id}")
+            return True
         print(f"Expense with ID {expense_id} not found.")
         return False
 
     def _get_next_id(self, category: str):
-        # Generate a simple incremental ID for new entries
-        if not self.data[category]:
-            return 1
-        return max(item["id"] for item in self.data[category]) + 1
+        # Hand out the next id from the persisted per-category counter
+        next_id = self._next_ids[category]
+        self._next_ids[category] = next_id + 1
+        return next_id
 
     # Placeholder methods for other categories (to be implemented)
     def add_debt(self, name: str, debt_type: str, original_amount: float, current_amount: float, interest_rate: float, minimum_payment: float, due_date: str, notes: str = None):
@@ -205,27 +821,29 @@ class DataManager:
             "due_date": due_date,
             "notes": notes
         }
-        self.data["debts"].append(debt_entry)
+        self._insert("debts", debt_entry)
         print(f"Added debt: {name} - {current_amount}")
         return debt_entry["id"]
 
     def get_debts(self):
-        return self.data["debts"]
+        self._compact("debts")
+        return self._data["debts"]
 
     def update_debt(self, debt_id: int, name: str = None, debt_type: str = None, original_amount: float = None, current_amount: float = None, interest_rate: float = None, minimum_payment: float = None, due_date: str = None, notes: str = None):
-        for entry in self.data["debts"]:
-            if entry["id"] == debt_id:
-                if name is not None: entry["name"] = name
-                if debt_type is not None: entry["type"] = debt_type
-                if original_amount is not None: entry["original_amount"] = original_amount
-                if current_amount is not None: entry["current_amount"] = current_amount
-                if interest_rate is not None: entry["interest_rate"] = interest_rate
-                if minimum_payment is not None: entry["minimum_payment"] = minimum_payment
-                if due_date is not None: entry["due_date"] = due_date
-                if notes is not None: entry["notes"] = notes
-                self.save_data()
-                print(f"Updated debt with ID {debt_id}")
-                return True
+        entry = self._find("debts", debt_id)
+        if entry is not None:
+            fields = {}
+            if name is not None: fields["name"] = name
+            if debt_type is not None: fields["type"] = debt_type
+            if original_amount is not None: fields["original_amount"] = original_amount
+            if current_amount is not None: fields["current_amount"] = current_amount
+            if interest_rate is not None: fields["interest_rate"] = interest_rate
+            if minimum_payment is not None: fields["minimum_payment"] = minimum_payment
+            if due_date is not None: fields["due_date"] = due_date
+            if notes is not None: fields["notes"] = notes
+            self._modify("debts", entry, fields)
+            print(f"Updated debt with ID {debt_id}")
+            return True
         print(f"Debt with ID {debt_id} not found.")
         return False
 
@@ -238,24 +856,26 @@ class DataManager:
             "date_updated": date_updated,
             "notes": notes
         }
-        self.data["assets"].append(asset_entry)
+        self._insert("assets", asset_entry)
         print(f"Added asset: {name} - {value}")
         return asset_entry["id"]
 
     def get_assets(self):
-        return self.data["assets"]
+        self._compact("assets")
+        return self._data["assets"]
 
     def update_asset(self, asset_id: int, name: str = None, asset_type: str = None, value: float = None, date_updated: str = None, notes: str = None):
-        for entry in self.data["assets"]:
-            if entry["id"] == asset_id:
-                if name is not None: entry["name"] = name
-                if asset_type is not None: entry["type"] = asset_type
-                if value is not None: entry["value"] = value
-                if date_updated is not None: entry["date_updated"] = date_updated
-                if notes is not None: entry["notes"] = notes
-                self.save_data()
-                print(f"Updated asset with ID {asset_id}")
-                return True
+        entry = self._find("assets", asset_id)
+        if entry is not None:
+            fields = {}
+            if name is not None: fields["name"] = name
+            if asset_type is not None: fields["type"] = asset_type
+            if value is not None: fields["value"] = value
+            if date_updated is not None: fields["date_updated"] = date_updated
+            if notes is not None: fields["notes"] = notes
+            self._modify("assets", entry, fields)
+            print(f"Updated asset with ID {asset_id}")
+            return True
         print(f"Asset with ID {asset_id} not found.")
         return False
 
@@ -272,31 +892,37 @@ class DataManager:
             "last_updated": last_updated,
             "notes": notes
         }
-        self.data["investments"].append(investment_entry)
+        self._insert("investments", investment_entry)
         print(f"Added investment: {name} - {current_price}")
         return investment_entry["id"]
 
     def get_investments(self):
-        return self.data["investments"]
+        self._compact("investments")
+        return self._data["investments"]
 
     def update_investment(self, investment_id: int, name: str = None, investment_type: str = None, quantity: float = None, purchase_price: float = None, current_price: float = None, date_purchased: str = None, last_updated: str = None, notes: str = None):
-        for entry in self.data["investments"]:
-            if entry["id"] == investment_id:
-                if name is not None: entry["name"] = name
-                if investment_type is not None: entry["type"] = investment_type
-                if quantity is not None: entry["quantity"] = quantity
-                if purchase_price is not None: entry["purchase_price"] = purchase_price
-                if current_price is not None: entry["current_price"] = current_price
-                if date_purchased is not None: entry["date_purchased"] = date_purchased
-                if last_updated is not None: entry["last_updated"] = last_updated
-                if notes is not None: entry["notes"] = notes
-                self.save_data()
-                print(f"Updated investment with ID {investment_id}")
-                return True
+        entry = self._find("investments", investment_id)
+        if entry is not None:
+            fields = {}
+            if name is not None: fields["name"] = name
+            if investment_type is not None: fields["type"] = investment_type
+            if quantity is not None: fields["quantity"] = quantity
+            if purchase_price is not None: fields["purchase_price"] = purchase_price
+            if current_price is not None: fields["current_price"] = current_price
+            if date_purchased is not None: fields["date_purchased"] = date_purchased
+            if last_updated is not None: fields["last_updated"] = last_updated
+            if notes is not None: fields["notes"] = notes
+            self._modify("investments", entry, fields)
+            print(f"Updated investment with ID {investment_id}")
+            return True
         print(f"Investment with ID {investment_id} not found.")
         return False
 
     # Close method is no longer needed for database connection,
     # but can be used to ensure data is saved on app exit.
     def close(self):
-        self.save_data()
\ No newline at end of file
+        if self._saver is not None:
+            self._saver.close()
+        if self._store.save_on_close:
+            self.save_data()
+        self._store.close()
\ No newline at end of file
@@ -0,0 +1,319 @@
+"""Report exports (CSV, Excel, PDF).
+
+These functions never touch Tk, so they can run on a worker thread. They take a
+snapshot of the report data gathered on the Tk thread and a job object: job.step()
+reports progress and raises ExportCancelled once the job has been cancelled, in
+which case any partly written output is removed.
+"""
+import csv
+import os
+import shutil
+from datetime import date, datetime
+
+
+class ExportCancelled(Exception):
+    """Raised from job.step() when the user cancels a running export."""
+
+
+class _NoJob:
+    def step(self, done, total, message=''):
+        pass
+
+
+NO_JOB = _NoJob()
+
+# Fixed columns per category, so files from different exports line up whatever the
+# records contain; keys outside the schema are left out
+COLUMNS = {
+    'income': ['id', 'date', 'source', 'amount', 'notes', 'recurring'],
+    'expenses': ['id', 'date', 'category', 'amount', 'description', 'is_tax_deductible', 'recurring', 'receipts'],
+    'debts': ['id', 'name', 'type', 'original_amount', 'current_amount', 'interest_rate', 'minimum_payment', 'due_date', 'notes'],
+    'assets': ['id', 'name', 'type', 'value', 'date_updated', 'notes'],
+    'investments': ['id', 'asset_id', 'name', 'type', 'quantity', 'purchase_price', 'current_price',
+                    'date_purchased', 'last_updated', 'notes'],
+}
+# Written to Excel as numbers and dates rather than text
+NUMBER_COLUMNS = frozenset(('amount', 'original_amount', 'current_amount', 'interest_rate', 'minimum_payment',
+                            'value', 'quantity', 'purchase_price', 'current_price'))
+DATE_COLUMNS = frozenset(('date', 'due_date', 'date_updated', 'date_purchased', 'last_updated'))
+CHUNK_SIZE = 1000
+
+
+REPORT_NAME = "moneymind_report"
+
+
+def report_basename(timestamp=None):
+    return f"{REPORT_NAME}_{timestamp or datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+
+def receipts_bundle_path(zip_receipts=False, report_name=REPORT_NAME):
+    """Where Excel exports bundle receipts. Keyed by the report name rather than the
+    timestamp, so repeated exports reuse the receipts already placed there."""
+    return report_name + ("_receipts.zip" if zip_receipts else "_files")
+
+
+def _remove_outputs(paths):
+    for path in paths:
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return ';'.join(str(v) for v in value)
+    return value
+
+
+def export_csv(data_manager, start, end, base, job=NO_JOB):
+    """Write <base>_income.csv and <base>_expenses.csv for [start, end]; returns the file names.
+
+    Records are read from the date index CHUNK_SIZE at a time and written with the
+    csv module, so memory stays flat however long the history is. Each file is written
+    under a temporary name and renamed into place once complete; if the export fails
+    or is cancelled, every file it wrote is removed.
+    """
+    sections = [(category, f"{base}_{category}.csv") for category in ('income', 'expenses')]
+    total = sum(data_manager.count_range(category, start, end) for category, _ in sections)
+    done = 0
+    written = []
+    try:
+        for category, path in sections:
+            columns = COLUMNS[category]
+            tmp_path = path + '.tmp'
+            written.append(tmp_path)
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                job.step(done, total, f'Writing {category}')
+                for chunk in data_manager.iter_range(category, start, end, chunk_size=CHUNK_SIZE):
+                    writer.writerows([_csv_value(record.get(col)) for col in columns] for record in chunk)
+                    done += len(chunk)
+                    job.step(min(done, total), total, f'Writing {category}')
+            os.replace(tmp_path, path)
+            written[-1] = path
+    except Exception:
+        # Cancelled or failed: remove the files already renamed into place as well as the
+        # one being written, so no half export is left behind
+        _remove_outputs(written)
+        raise
+    return [path for _, path in sections]
+
+
+def _excel_row(record, columns):
+    # openpyxl gives date values a yyyy-mm-dd number format by itself
+    row = []
+    for col in columns:
+        value = _csv_value(record.get(col))
+        if value == '':
+            value = None
+        elif col in NUMBER_COLUMNS:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                pass
+        elif col in DATE_COLUMNS and isinstance(value, str):
+            try:
+                value = date.fromisoformat(value)
+            except ValueError:
+                pass
+        row.append(value)
+    return row
+
+
+def export_excel(data_manager, start, end, base, job=NO_JOB, zip_receipts=False, bundle_path=None):
+    """Write <base>.xlsx with one sheet per section and bundle the expenses' receipts.
+
+    Receipts go to bundle_path (by default receipts_bundle_path(zip_receipts)): a folder
+    shared by every export, whose receipts/ subfolder only gains receipts that are new or
+    changed, or a zip archive rewritten each time (see receipt_bundler). The
+    receipt_files column holds their paths inside the bundle.
+
+    The workbook is opened in openpyxl's write-only mode and rows go straight from the
+    data manager's chunks to the sheets, so memory does not grow with the data. Amounts
+    are numeric cells, dates are date cells and every sheet has a frozen header row.
+    Income and expenses cover [start, end]; debts, assets and investments are exported
+    in full. Returns (workbook, receipts folder or archive).
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    from receipt_bundler import ReceiptBundler
+
+    # The workbook and an archive are written under temporary names and renamed into
+    # place once complete; the shared receipts folder is filled in place
+    workbook = base + ".xlsx"
+    workbook_tmp = workbook + ".tmp"
+    if bundle_path is None:
+        bundle_path = receipts_bundle_path(zip_receipts)
+    bundle_tmp = bundle_path + ".tmp" if zip_receipts else None
+    bundler = ReceiptBundler(bundle_tmp or bundle_path, as_zip=zip_receipts)
+
+    wb = Workbook(write_only=True)
+    expense_columns = COLUMNS['expenses'] + ['receipt_files']
+    sheets = {}
+    for name, columns in [('Income', COLUMNS['income']),
+                          ('TaxPayments', expense_columns),
+                          ('DeductibleExpenses', expense_columns),
+                          ('OtherExpenses', expense_columns),
+                          ('Assets', COLUMNS['assets']),
+                          ('Debts', COLUMNS['debts']),
+                          ('Investments', COLUMNS['investments'])]:
+        sheet = wb.create_sheet(name)
+        sheet.freeze_panes = 'A2'
+        header = []
+        for col in columns:
+            cell = WriteOnlyCell(sheet, value=col)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        sheet.append(header)
+        sheets[name] = (sheet, columns)
+
+    def write(name, record):
+        sheet, columns = sheets[name]
+        sheet.append(_excel_row(record, columns))
+
+    # Add all receipt files referenced in an expense to the bundle
+    def copy_receipts(e, prefix):
+        rel_paths = []
+        for r in e.get('receipts', []) or []:
+            rel_path = bundler.add(r, f"{prefix}_{e.get('id')}_{os.path.basename(r)}")
+            if rel_path is not None:
+                rel_paths.append(rel_path)
+        return ';'.join(rel_paths)
+
+    classify = data_manager.tax_engine.classify
+    ranged = ('income', 'expenses')
+    sections = [('income', 'Income'), ('expenses', None), ('assets', 'Assets'), ('debts', 'Debts'), ('investments', 'Investments')]
+    total = sum(data_manager.count_range(category, *((start, end) if category in ranged else (None, None)))
+                for category, _ in sections)
+    done = 0
+    try:
+        job.step(done, total, 'Writing Income')
+        for category, sheet_name in sections:
+            bounds = (start, end) if category in ranged else (None, None)
+            for chunk in data_manager.iter_range(category, *bounds, chunk_size=CHUNK_SIZE):
+                for record in chunk:
+                    if sheet_name is not None:
+                        write(sheet_name, record)
+                        continue
+                    # Expenses: tax payments and deductibles each get a sheet (an expense can be in both)
+                    is_tax_payment, is_deductible = classify(record)
+                    if is_tax_payment:
+                        write('TaxPayments', dict(record, receipt_files=copy_receipts(record, 'taxpay')))
+                    if is_deductible:
+                        write('DeductibleExpenses', dict(record, receipt_files=copy_receipts(record, 'ded')))
+                    elif not is_tax_payment:
+                        write('OtherExpenses', dict(record, receipt_files=copy_receipts(record, 'oth')))
+                done += len(chunk)
+                job.step(min(done, total), total, f'Writing {sheet_name or "Expenses"}')
+        # Links and zip entries are done by now; wait for any receipts that had to be copied
+        if bundler.pending_copies:
+            bundler.close(progress=lambda n, of: job.step(n, of, 'Copying receipts'))
+        bundler.close()
+        job.step(total, total, 'Saving workbook')
+        wb.save(workbook_tmp)
+        os.replace(workbook_tmp, workbook)
+        if bundle_tmp is not None:
+            os.replace(bundle_tmp, bundle_path)
+    except Exception:
+        # Cancelled or failed: remove this export's partial files. Receipts already in
+        # the shared folder are complete copies (or links) and stay for the next export.
+        bundler.close(cancel=True)
+        _remove_outputs([p for p in (workbook_tmp, bundle_tmp) if p])
+        raise
+    return workbook, bundle_path
+
+
+def export_pdf(data_manager, start, end, fname, job=NO_JOB, render_cache=None):
+    """Write a PDF report for [start, end] with totals, expenses by category and the first
+    receipt of each expense.
+
+    Totals come from the data manager's rollups, and the expenses with receipts are read
+    from the date index CHUNK_SIZE at a time, so nothing is copied up front. Receipts
+    are embedded as print-size renders (see receipt_renderer) cached in render_cache,
+    by default a receipt_renders folder next to the PDF. Every page of a PDF receipt
+    is included when the optional pypdfium2 package is installed; otherwise the report
+    notes that the receipt was left out.
+    """
+    from receipt_renderer import render_receipts
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.platypus import Image as RLImage
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    summary = {
+        'total_income': data_manager.rollup_total('income', start, end),
+        'total_expenses': data_manager.rollup_total('expenses', start, end),
+        'expenses_by_category': data_manager.rollup_totals('expenses', start, end),
+    }
+    total = data_manager.count_range('expenses', start, end)
+    with_receipts = []
+    done = 0
+    job.step(done, total, 'Reading expenses')
+    for chunk in data_manager.iter_range('expenses', start, end, chunk_size=CHUNK_SIZE):
+        with_receipts.extend(e for e in chunk if e.get('receipts'))
+        done += len(chunk)
+        job.step(min(done, total), total, 'Reading expenses')
+
+    doc = SimpleDocTemplate(fname, pagesize=letter)
+    styles = getSampleStyleSheet()
+    elems = []
+
+    elems.append(Paragraph("MoneyMind Report", styles['Title']))
+    elems.append(Spacer(1, 12))
+
+    # Summary
+    elems.append(Paragraph(f"Total Income: ${summary['total_income']:,.2f}", styles['Normal']))
+    elems.append(Paragraph(f"Total Expenses: ${summary['total_expenses']:,.2f}", styles['Normal']))
+    elems.append(Spacer(1, 12))
+
+    # Expenses by category table
+    table_data = [["Category", "Amount"]]
+    for k, v in summary['expenses_by_category'].items():
+        table_data.append([k, f"${v:,.2f}"])
+
+    t = Table(table_data, hAlign='LEFT')
+    t.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.grey), ('TEXTCOLOR',(0,0),(-1,0),colors.whitesmoke),('ALIGN',(1,1),(-1,-1),'RIGHT'),('GRID',(0,0),(-1,-1),0.5,colors.black)]))
+    elems.append(Paragraph("Expenses by Category", styles['Heading2']))
+    elems.append(t)
+
+    try:
+        # After table, include receipts (first receipt per expense) if present
+        if render_cache is None:
+            render_cache = os.path.join(os.path.dirname(os.path.abspath(fname)), 'receipt_renders')
+        job.step(0, len(with_receipts), 'Rendering receipts')
+        renders = render_receipts([e['receipts'][0] for e in with_receipts], render_cache,
+                                  progress=lambda n, of: job.step(n, of, 'Rendering receipts'))
+        for e in with_receipts:
+            elems.append(Spacer(1, 12))
+            elems.append(Paragraph(f"Receipts for Expense ID {e.get('id')}: {e.get('description','')}", styles['Heading3']))
+            pages, message = renders.get(e['receipts'][0], ([], ''))
+            for page in pages:
+                img = RLImage(page)
+                img._restrictSize(400, 300)
+                elems.append(img)
+            if message:
+                elems.append(Paragraph(message, styles['Normal']))
+
+        # doc.build() lays out every flowable in one call; report progress (and allow cancelling) per flowable
+        built = [0]
+
+        def after_flowable(flowable):
+            built[0] += 1
+            job.step(min(built[0], len(elems)), len(elems), 'Building PDF')
+
+        doc.afterFlowable = after_flowable
+        doc.build(elems)
+    except Exception:
+        _remove_outputs([fname])
+        raise
+    return fname
@@ -1,15 +1,32 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, font, filedialog # Import font module and filedialog
 from datetime import datetime, timedelta
-
-# Optional Matplotlib for dashboard visuals
-try:
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    import matplotlib.pyplot as plt
-    HAS_MATPLOTLIB = True
-except Exception:
-    HAS_MATPLOTLIB = False
-from collections import defaultdict
+import importlib.util
+import os
+import time
+
+# Optional Matplotlib for dashboard visuals. Importing it costs several hundred ms,
+# so only its presence is checked here; it is loaded when the first chart is built.
+HAS_MATPLOTLIB = importlib.util.find_spec('matplotlib') is not None
+
+import exporters
+import ira_engine
+from gui_modules.export_jobs import ExportQueue
+from gui_modules.tree_sync import TreeviewSync
+from gui_modules.virtual_tree import VirtualTreeview
+
+# Views that display each data category; a change marks them stale
+VIEWS_BY_CATEGORY = {
+    'income': ('income', 'dashboard', 'analysis'),
+    'expenses': ('expenses', 'taxes', 'dashboard', 'analysis'),
+    'debts': ('debts', 'dashboard', 'analysis'),
+    'assets': ('assets', 'dashboard', 'analysis'),
+    'investments': ('investments', 'analysis'),
+}
+# Updates touching only these fields leave the dashboard and analysis charts as they are
+TEXT_ONLY_FIELDS = frozenset(('description', 'notes', 'receipts'))
+# Refresh passes run at most once per frame (~60 Hz), however fast requests arrive
+REFRESH_INTERVAL_MS = 16
 
 
 class Tooltip:
@@ -37,7 +54,10 @@ class Tooltip:
             self.tipwindow = None
 
 class TMTLabsGUI:
-    def __init__(self, master, data_manager):
+    def __init__(self, master, data_manager, startup_marks=None):
+        """startup_marks: optional list of (label, time.perf_counter()) taken by the caller
+        before the GUI was created; the first entry is the start of the clock."""
+        self._startup_marks = list(startup_marks or [('start', time.perf_counter())])
         self.master = master
         master.title("Financial Advisor- Your Smart Financial Assistant")
         master.geometry("1124x668") # Set a default window size
@@ -109,18 +129,126 @@ class TMTLabsGUI:
         self.notebook.add(self.ira_frame, text="IRA Calculator") # Add new IRA tab
         self.notebook.add(self.retirement_frame, text="Retirement") # Add Retirement tab
 
-        self._setup_dashboard()
-        self._setup_income_tab()
-        self._setup_expenses_tab()
-        self._setup_debts_tab()
-        self._setup_assets_tab()
-        self._setup_investments_tab()
-        self._setup_taxes_tab()
-        self._setup_analysis_tab()
-        self._setup_reports_tab()
-        self._setup_refinance_calculator_tab() # Call new setup method
-        self._setup_ira_tab() # Call new IRA setup method
-        self._setup_retirement_tab()
+        # Tabs are built the first time they are shown; only the frames exist up front
+        self._tab_builders = {
+            self.dashboard_frame: ('dashboard', self._setup_dashboard),
+            self.income_frame: ('income', self._setup_income_tab),
+            self.expenses_frame: ('expenses', self._setup_expenses_tab),
+            self.debts_frame: ('debts', self._setup_debts_tab),
+            self.assets_frame: ('assets', self._setup_assets_tab),
+            self.investments_frame: ('investments', self._setup_investments_tab),
+            self.taxes_frame: ('taxes', self._setup_taxes_tab),
+            self.analysis_frame: ('analysis', self._setup_analysis_tab),
+            self.reports_frame: ('reports', self._setup_reports_tab),
+            self.refinance_frame: ('refinance', self._setup_refinance_calculator_tab),
+            self.ira_frame: ('ira', self._setup_ira_tab),
+            self.retirement_frame: ('retirement', self._setup_retirement_tab),
+        }
+
+        # Data views refresh lazily: a change or a refresh button only requests a view by
+        # name (_request_refresh). Requests are merged and flushed once per idle cycle, and
+        # only for views on the visible tab; the rest wait until their tab is selected.
+        self._views = {
+            'dashboard': (self.dashboard_frame, self._refresh_dashboard),
+            'income': (self.income_frame, self._refresh_income_display),
+            'expenses': (self.expenses_frame, self._refresh_expense_display),
+            'debts': (self.debts_frame, self._refresh_debt_display),
+            'assets': (self.assets_frame, self._refresh_asset_display),
+            'investments': (self.investments_frame, self._refresh_investment_display),
+            'taxes': (self.taxes_frame, self._refresh_taxes_display),
+            'analysis': (self.analysis_frame, lambda changed_ids=None: self._refresh_analysis_display()),
+        }
+        # view -> ids changed since it was last drawn (None: redraw everything)
+        self._stale_views = {}
+        self._refresh_pending = False
+        self._last_flush = 0.0
+        # view -> {'runs', 'total_ms', 'last_ms', 'max_ms'} for every refresh that ran
+        self.refresh_timings = {}
+        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self._flush_refreshes())
+        self.data_manager.subscribe(self._on_data_change)
+
+        # Let the empty window appear first, then build the selected tab
+        self._mark_startup('window')
+        self.master.after_idle(self._finish_startup)
+
+    def _mark_startup(self, label):
+        self._startup_marks.append((label, time.perf_counter()))
+
+    @property
+    def startup_timings(self):
+        """(label, ms since start) for each startup milestone so far."""
+        start = self._startup_marks[0][1]
+        return [(label, (t - start) * 1000.0) for label, t in self._startup_marks[1:]]
+
+    def _finish_startup(self):
+        self._flush_refreshes()
+        # The next idle pass runs once the first tab has been drawn and input is being handled
+        self.master.after_idle(self._report_startup)
+
+    def _report_startup(self):
+        self._mark_startup('interactive')
+        print("Startup: " + ", ".join(f"{label} {ms:.0f} ms" for label, ms in self.startup_timings))
+
+    def _ensure_tab_built(self, frame):
+        entry = self._tab_builders.pop(frame, None)
+        if entry is None:
+            return
+        name, setup = entry
+        setup()
+        self._mark_startup(f'{name} tab')
+        # Views on a freshly built tab were just drawn from current data
+        for view in [v for v, (f, _) in self._views.items() if f is frame]:
+            self._stale_views.pop(view, None)
+
+    def _on_data_change(self, event):
+        views = VIEWS_BY_CATEGORY.get(event.category, ())
+        if event.op == 'update' and event.fields <= TEXT_ONLY_FIELDS:
+            views = [v for v in views if v not in ('dashboard', 'analysis')]
+        for view in views:
+            self._request_refresh(view, event.ids)
+
+    def _request_refresh(self, view, changed_ids=None):
+        """Ask for a view to be redrawn; changed_ids narrows it to those records (None: everything).
+
+        Requests are merged per view and served by one pass on the next idle cycle,
+        spaced at least REFRESH_INTERVAL_MS apart.
+        """
+        if changed_ids is None:
+            self._stale_views[view] = None
+        elif view not in self._stale_views:
+            self._stale_views[view] = set(changed_ids)
+        elif self._stale_views[view] is not None:
+            self._stale_views[view].update(changed_ids)
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        wait_ms = int(REFRESH_INTERVAL_MS - (time.perf_counter() - self._last_flush) * 1000)
+        if wait_ms > 0:
+            self.master.after(wait_ms, lambda: self.master.after_idle(self._flush_refreshes))
+        else:
+            self.master.after_idle(self._flush_refreshes)
+
+    def _flush_refreshes(self):
+        self._refresh_pending = False
+        self._last_flush = time.perf_counter()
+        try:
+            current = self.notebook.nametowidget(self.notebook.select())
+        except Exception:
+            return
+        self._ensure_tab_built(current)
+        for name in [n for n in self._stale_views if self._views[n][0] is current]:
+            changed_ids = self._stale_views.pop(name)
+            started = time.perf_counter()
+            try:
+                self._views[name][1](changed_ids=changed_ids)
+            except Exception as e:
+                print(f"Error refreshing {name} view: {e}")
+            ms = (time.perf_counter() - started) * 1000.0
+            stats = self.refresh_timings.setdefault(name, {'runs': 0, 'total_ms': 0.0, 'last_ms': 0.0, 'max_ms': 0.0})
+            stats['runs'] += 1
+            stats['total_ms'] += ms
+            stats['last_ms'] = ms
+            stats['max_ms'] = max(stats['max_ms'], ms)
 
     def _setup_income_tab(self):
         # Input Frame for adding new income
@@ -167,8 +295,17 @@ class TMTLabsGUI:
         display_frame = ttk.LabelFrame(self.income_frame, text="All Income Entries", padding="10")
         display_frame.pack(pady=10, padx=10, fill="both", expand=True)
 
+        # Filter box: narrows the list as you type (click a column heading to sort)
+        filter_frame = ttk.Frame(display_frame)
+        filter_frame.pack(side="top", fill="x", pady=(0, 5))
+        ttk.Label(filter_frame, text="Filter:").pack(side="left")
+        self.income_filter_entry = ttk.Entry(filter_frame)
+        self.income_filter_entry.pack(side="left", fill="x", expand=True, padx=5)
+        self.income_filter_entry.bind('<KeyRelease>', lambda e: self.income_tree.set_filter(self.income_filter_entry.get()))
+
         columns = ("ID", "Date", "Source", "Amount", "Notes", "Recurring")
-        self.income_tree = ttk.Treeview(display_frame, columns=columns, show="headings")
+        # Virtualized: only the rows in view exist as Treeview items
+        self.income_tree = VirtualTreeview(display_frame, row_values=self._income_row_values, columns=columns, show="headings")
         self.income_tree.pack(side="left", fill="both", expand=True)
 
         # Tooltip for recurring column cells
@@ -224,13 +361,6 @@ class TMTLabsGUI:
         # Add income to data manager (include recurring flag)
         recurring_flag = getattr(self, 'income_recurring_var', tk.BooleanVar(value=False)).get()
         self.data_manager.add_income(date, source, amount, notes, recurring=recurring_flag)
-        self._refresh_income_display()
-        # update dashboard and analysis after income change
-        try:
-            self._refresh_dashboard()
-            self._refresh_analysis_display()
-        except Exception:
-            pass
 
         # Clear input fields
         self.income_source_entry.delete(0, tk.END)
@@ -243,21 +373,14 @@ class TMTLabsGUI:
         self.income_date_entry.delete(0, tk.END)
         self.income_date_entry.insert(0, datetime.now().strftime('%Y-%m-%d')) # Reset date to current
 
-    def _refresh_income_display(self):
-        # Clear existing entries in the treeview
-        for item in self.income_tree.get_children():
-            self.income_tree.delete(item)
-
-        # Get fresh data
-        income_data = self.data_manager.get_income()
+    def _refresh_income_display(self, changed_ids=None):
+        # Newest first, straight from the date index; the tree only materializes the visible page
+        self.income_tree.set_rows(self.data_manager.range_view('income', newest_first=True), changed_ids)
 
-        # Sort by date, newest first (assuming date is YYYY-MM-DD for correct string comparison)
-        income_data_sorted = sorted(income_data, key=lambda x: x['date'], reverse=True)
-
-        # Insert new data
-        for entry in income_data_sorted:
-            recurring_text = "Yes" if entry.get('recurring') else "No"
-            self.income_tree.insert("", "end", iid=entry['id'], values=(entry['id'], entry['date'], entry['source'], f"{entry['amount']:.2f}", entry.get('notes',''), recurring_text))
+    @staticmethod
+    def _income_row_values(entry):
+        recurring_text = "Yes" if entry.get('recurring') else "No"
+        return (entry['id'], entry['date'], entry['source'], f"{entry['amount']:.2f}", entry.get('notes',''), recurring_text)
 
     def _on_income_right_click(self, event): # This method is now only called from context menu, which is removed
         item_id = self.income_tree.identify_row(event.y)
@@ -344,9 +467,9 @@ class TMTLabsGUI:
         mapping = [
             (getattr(self, 'income_tree', None), lambda i: self._delete_income_entry(i)),
             (getattr(self, 'expense_tree', None), lambda i: self._delete_expense_entry(i)),
-            (getattr(self, 'debt_tree', None), lambda i: self.data_manager.delete_item('debts', i) and self._refresh_debt_display()),
-            (getattr(self, 'asset_tree', None), lambda i: self.data_manager.delete_item('assets', i) and self._refresh_asset_display()),
-            (getattr(self, 'inv_tree', None), lambda i: self.data_manager.delete_item('investments', i) and self._refresh_investment_display()),
+            (getattr(self, 'debt_tree', None), lambda i: self.data_manager.delete_item('debts', i)),
+            (getattr(self, 'asset_tree', None), lambda i: self.data_manager.delete_item('assets', i)),
+            (getattr(self, 'inv_tree', None), lambda i: self.data_manager.delete_item('investments', i)),
         ]
         for tree, deleter in mapping:
             if tree is None:
@@ -388,7 +511,7 @@ class TMTLabsGUI:
             self.master.bind('<Delete>', self._on_delete_key)
             self.master.bind('<Control-e>', self._on_edit_key)
             # Refresh with F5
-            self.master.bind('<F5>', lambda e: (self._refresh_dashboard(), self._refresh_analysis_display()))
+            self.master.bind('<F5>', lambda e: (self._request_refresh('dashboard'), self._request_refresh('analysis')))
         except Exception:
             pass
         # Double click on rows to edit
@@ -408,7 +531,7 @@ class TMTLabsGUI:
 
     def _edit_income_entry(self, income_id):
         # Retrieve the income entry data
-        income_entry = next((item for item in self.data_manager.get_income() if item["id"] == income_id), None)
+        income_entry = self.data_manager.get_item("income", income_id)
         if not income_entry:
             messagebox.showerror("Error", "Income entry not found.")
             return
@@ -416,12 +539,6 @@ class TMTLabsGUI:
         # Open a new dialog window for editing
         edit_dialog = EditIncomeDialog(self.master, income_entry, self.data_manager, self.large_font)
         self.master.wait_window(edit_dialog.top)
-        self._refresh_income_display() # Refresh after dialog closes
-        try:
-            self._refresh_dashboard()
-            self._refresh_analysis_display()
-        except Exception:
-            pass
 
     def _edit_income_entry_from_button(self):
         income_id = self._get_selected_item_id(self.income_tree)
@@ -430,14 +547,7 @@ class TMTLabsGUI:
 
     def _delete_income_entry(self, income_id):
         if messagebox.askyesno("Delete Income", f"Are you sure you want to delete income entry with ID {income_id}?"):
-            if self.data_manager.delete_item("income", income_id):
-                self._refresh_income_display()
-                try:
-                    self._refresh_dashboard()
-                    self._refresh_analysis_display()
-                except Exception:
-                    pass
-            else:
+            if not self.data_manager.delete_item("income", income_id):
                 messagebox.showerror("Error", "Could not delete income entry.")
 
     def _delete_income_entry_from_button(self):
@@ -495,8 +605,15 @@ class TMTLabsGUI:
         display_frame = ttk.LabelFrame(self.expenses_frame, text="All Expense Entries", padding="10")
         display_frame.pack(pady=10, padx=10, fill="both", expand=True)
 
+        filter_frame = ttk.Frame(display_frame)
+        filter_frame.pack(side="top", fill="x", pady=(0, 5))
+        ttk.Label(filter_frame, text="Filter:").pack(side="left")
+        self.expense_filter_entry = ttk.Entry(filter_frame)
+        self.expense_filter_entry.pack(side="left", fill="x", expand=True, padx=5)
+        self.expense_filter_entry.bind('<KeyRelease>', lambda e: self.expense_tree.set_filter(self.expense_filter_entry.get()))
+
         columns = ("ID", "Date", "Category", "Amount", "Description", "Tax Deductible", "Recurring")
-        self.expense_tree = ttk.Treeview(display_frame, columns=columns, show="headings")
+        self.expense_tree = VirtualTreeview(display_frame, row_values=self._expense_row_values, columns=columns, show="headings")
         self.expense_tree.pack(side="left", fill="both", expand=True)
 
         # Tooltip for recurring column cells
@@ -571,6 +688,7 @@ class TMTLabsGUI:
 
         columns = ("ID", "Name", "Type", "Current", "Interest", "Minimum", "Due", "Notes")
         self.debt_tree = ttk.Treeview(display_frame, columns=columns, show="headings")
+        self._debt_sync = TreeviewSync(self.debt_tree, lambda d: (d['id'], d['name'], d['type'], f"{d['current_amount']:.2f}", f"{d['interest_rate']:.2f}", f"{d['minimum_payment']:.2f}", d['due_date'], d.get('notes', '')))
         self.debt_tree.pack(side="left", fill="both", expand=True)
         for col in columns:
             self.debt_tree.heading(col, text=col)
@@ -600,7 +718,6 @@ class TMTLabsGUI:
                 messagebox.showerror("Input Error", "Amounts and rates must be non-negative.")
                 return
             self.data_manager.add_debt(name, debt_type, 0.0, current_amount, interest, minimum, due)
-            self._refresh_debt_display()
             self.debt_name_entry.delete(0, tk.END)
             self.debt_type_entry.delete(0, tk.END)
             self.debt_current_amount_entry.delete(0, tk.END)
@@ -610,19 +727,14 @@ class TMTLabsGUI:
         except ValueError:
             messagebox.showerror("Input Error", "Please enter valid numbers for amounts.")
 
-    def _refresh_debt_display(self):
-        for item in self.debt_tree.get_children():
-            self.debt_tree.delete(item)
-        for d in sorted(self.data_manager.get_debts(), key=lambda x: x.get('id', 0)):
-            self.debt_tree.insert("", "end", iid=d['id'], values=(d['id'], d['name'], d['type'], f"{d['current_amount']:.2f}", f"{d['interest_rate']:.2f}", f"{d['minimum_payment']:.2f}", d['due_date'], d.get('notes', '')))
+    def _refresh_debt_display(self, changed_ids=None):
+        self._debt_sync.sync(sorted(self.data_manager.get_debts(), key=lambda x: x.get('id', 0)), changed_ids)
 
     def _delete_debt_from_button(self):
         debt_id = self._get_selected_item_id(self.debt_tree)
         if debt_id is not None:
             if messagebox.askyesno("Delete Debt", f"Delete debt ID {debt_id}?"):
-                if self.data_manager.delete_item('debts', debt_id):
-                    self._refresh_debt_display()
-                else:
+                if not self.data_manager.delete_item('debts', debt_id):
                     messagebox.showerror("Error", "Could not delete debt.")
 
     def _edit_debt_from_button(self):
@@ -631,13 +743,12 @@ class TMTLabsGUI:
             self._edit_debt(debt_id)
 
     def _edit_debt(self, debt_id):
-        debt_entry = next((d for d in self.data_manager.get_debts() if d['id'] == debt_id), None)
+        debt_entry = self.data_manager.get_item('debts', debt_id)
         if not debt_entry:
             messagebox.showerror("Error", "Debt entry not found.")
             return
         dlg = EditDebtDialog(self.master, debt_entry, self.data_manager, self.large_font)
         self.master.wait_window(dlg.top)
-        self._refresh_debt_display()
 
     def _setup_assets_tab(self):
         input_frame = ttk.LabelFrame(self.assets_frame, text="Asset Details", padding="10")
@@ -672,6 +783,7 @@ class TMTLabsGUI:
 
         columns = ("ID", "Name", "Type", "Value", "Updated", "Notes")
         self.asset_tree = ttk.Treeview(display_frame, columns=columns, show="headings")
+        self._asset_sync = TreeviewSync(self.asset_tree, lambda a: (a['id'], a['name'], a['type'], f"{a['value']:.2f}", a['date_updated'], a.get('notes', '')))
         self.asset_tree.pack(side="left", fill="both", expand=True)
         for col in columns:
             self.asset_tree.heading(col, text=col)
@@ -699,7 +811,6 @@ class TMTLabsGUI:
                 messagebox.showerror("Input Error", "Value must be non-negative.")
                 return
             self.data_manager.add_asset(name, asset_type, value, date_updated)
-            self._refresh_asset_display()
             self.asset_name_entry.delete(0, tk.END)
             self.asset_type_entry.delete(0, tk.END)
             self.asset_value_entry.delete(0, tk.END)
@@ -707,19 +818,14 @@ class TMTLabsGUI:
         except ValueError:
             messagebox.showerror("Input Error", "Please enter valid numbers for value.")
 
-    def _refresh_asset_display(self):
-        for item in self.asset_tree.get_children():
-            self.asset_tree.delete(item)
-        for a in sorted(self.data_manager.get_assets(), key=lambda x: x.get('id', 0)):
-            self.asset_tree.insert("", "end", iid=a['id'], values=(a['id'], a['name'], a['type'], f"{a['value']:.2f}", a['date_updated'], a.get('notes', '')))
+    def _refresh_asset_display(self, changed_ids=None):
+        self._asset_sync.sync(sorted(self.data_manager.get_assets(), key=lambda x: x.get('id', 0)), changed_ids)
 
     def _delete_asset_from_button(self):
         asset_id = self._get_selected_item_id(self.asset_tree)
         if asset_id is not None:
             if messagebox.askyesno("Delete Asset", f"Delete asset ID {asset_id}?"):
-                if self.data_manager.delete_item('assets', asset_id):
-                    self._refresh_asset_display()
-                else:
+                if not self.data_manager.delete_item('assets', asset_id):
                     messagebox.showerror("Error", "Could not delete asset.")
 
     def _edit_asset_from_button(self):
@@ -728,13 +834,12 @@ class TMTLabsGUI:
             self._edit_asset(asset_id)
 
     def _edit_asset(self, asset_id):
-        asset_entry = next((a for a in self.data_manager.get_assets() if a['id'] == asset_id), None)
+        asset_entry = self.data_manager.get_item('assets', asset_id)
         if not asset_entry:
             messagebox.showerror("Error", "Asset entry not found.")
             return
         dlg = EditAssetDialog(self.master, asset_entry, self.data_manager, self.large_font)
         self.master.wait_window(dlg.top)
-        self._refresh_asset_display()
 
     def _setup_investments_tab(self):
         input_frame = ttk.LabelFrame(self.investments_frame, text="Investment Details", padding="10")
@@ -773,6 +878,7 @@ class TMTLabsGUI:
 
         columns = ("ID", "Name", "Type", "Quantity", "Purchase", "Current", "Notes")
         self.inv_tree = ttk.Treeview(display_frame, columns=columns, show="headings")
+        self._inv_sync = TreeviewSync(self.inv_tree, lambda inv: (inv['id'], inv['name'], inv['type'], f"{inv['quantity']:.2f}", f"{inv['purchase_price']:.2f}", f"{inv['current_price']:.2f}", inv.get('notes', '')))
         self.inv_tree.pack(side="left", fill="both", expand=True)
         for col in columns:
             self.inv_tree.heading(col, text=col)
@@ -801,9 +907,10 @@ class TMTLabsGUI:
         self.taxes_date_entry.insert(0, datetime.now().strftime('%Y-%m-%d'))
 
         ttk.Label(form_frame, text="Tax Type:").grid(row=0, column=2, padx=4, pady=2, sticky='w')
-        self.taxes_type_cb = ttk.Combobox(form_frame, values=['Income Tax','State Tax','Property Tax'], state='readonly', width=18)
+        tax_categories = list(self.data_manager.tax_engine.tax_categories)
+        self.taxes_type_cb = ttk.Combobox(form_frame, values=tax_categories, state='readonly', width=18)
         self.taxes_type_cb.grid(row=0, column=3, padx=4, pady=2, sticky='w')
-        self.taxes_type_cb.set('Income Tax')
+        self.taxes_type_cb.set(tax_categories[0] if tax_categories else '')
         # boolean var for deductible flag — create before using in handler
         self.taxes_deductible_var = tk.BooleanVar(value=False)
         # set default deductible flag depending on selected tax type
@@ -842,6 +949,7 @@ class TMTLabsGUI:
         self.taxpayments_total_label = ttk.Label(left, text='Total: $0.00', font=self.large_font)
         self.taxpayments_total_label.pack(anchor='ne')
         self.taxpayments_tree = ttk.Treeview(left, columns=cols_pay, show='headings')
+        self._taxpayments_sync = TreeviewSync(self.taxpayments_tree, self._tax_row_values)
         self.taxpayments_tree.pack(side='left', fill='both', expand=True)
         for c in cols_pay:
             self.taxpayments_tree.heading(c, text=c)
@@ -869,7 +977,7 @@ class TMTLabsGUI:
         
         
         self.deductible_tree = ttk.Treeview(right, columns=cols_ded, show='headings')
-        self.deductible_tree = ttk.Treeview(right, columns=cols_ded, show='headings')
+        self._deductible_sync = TreeviewSync(self.deductible_tree, self._tax_row_values)
         self.deductible_tree.pack(side='left', fill='both', expand=True)
         for c in cols_ded:
             self.deductible_tree.heading(c, text=c)
@@ -890,42 +998,30 @@ class TMTLabsGUI:
         # Global refresh button
         btn_frame = ttk.Frame(self.taxes_frame, padding="4")
         btn_frame.pack(fill='x')
-        ttk.Button(btn_frame, text='Refresh Taxes View', command=self._refresh_taxes_display).pack(side='left', padx=6)
+        ttk.Button(btn_frame, text='Refresh Taxes View', command=lambda: self._request_refresh('taxes')).pack(side='left', padx=6)
 
         self._refresh_taxes_display()
 
-    def _refresh_taxes_display(self):
-        # Populate the taxes_expense_tree with current expenses
-        # Refresh both Tax Payments and Deductible lists
-        for tree in (getattr(self, 'taxpayments_tree', None), getattr(self, 'deductible_tree', None)):
-            if tree is None:
-                continue
-            for item in tree.get_children():
-                tree.delete(item)
+    @staticmethod
+    def _tax_row_values(entry):
+        return (entry['id'], entry.get('date',''), entry.get('category',''), f"{entry.get('amount',0.0):.2f}", entry.get('description',''))
 
-        tax_payments = [e for e in self.data_manager.get_expenses() if e.get('category') in ('Income Tax', 'State Tax', 'Property Tax')]
-        deductibles = [e for e in self.data_manager.get_expenses() if e.get('is_tax_deductible')]
+    def _refresh_taxes_display(self, changed_ids=None):
+        # Refresh both Tax Payments and Deductible lists (newest first), touching only rows that differ
+        tax = self.data_manager.tax_engine
+        partition = tax.expenses()
+        totals = tax.totals()
 
-        for entry in sorted(tax_payments, key=lambda x: x.get('date',''), reverse=True):
-            try:
-                self.taxpayments_tree.insert('', 'end', iid=entry['id'], values=(entry['id'], entry.get('date',''), entry.get('category',''), f"{entry.get('amount',0.0):.2f}", entry.get('description','')))
-            except Exception:
-                continue
+        self._taxpayments_sync.sync(reversed(partition.tax_payments), changed_ids)
         # update tax payments total
         try:
-            total_tp = sum(float(e.get('amount', 0.0)) for e in tax_payments)
-            self.taxpayments_total_label.config(text=f"Total: ${total_tp:,.2f}")
+            self.taxpayments_total_label.config(text=f"Total: ${totals['tax_payments']:,.2f}")
         except Exception:
             pass
-        for entry in sorted(deductibles, key=lambda x: x.get('date',''), reverse=True):
-            try:
-                self.deductible_tree.insert('', 'end', iid=entry['id'], values=(entry['id'], entry.get('date',''), entry.get('category',''), f"{entry.get('amount',0.0):.2f}", entry.get('description','')))
-            except Exception:
-                continue
+        self._deductible_sync.sync(reversed(partition.deductibles), changed_ids)
         # update deductible total
         try:
-            total_d = sum(float(e.get('amount', 0.0)) for e in deductibles)
-            self.deductible_total_label.config(text=f"Total: ${total_d:,.2f}")
+            self.deductible_total_label.config(text=f"Total: ${totals['deductibles']:,.2f}")
         except Exception:
             pass
 
@@ -944,9 +1040,7 @@ class TMTLabsGUI:
         except Exception:
             messagebox.showerror("Error", "Invalid selection.")
             return
-        self.expense_tree.selection_set(eid)
-        self.expense_tree.focus(eid)
-        self._attach_receipt_to_selected_expense()
+        self._attach_receipt_to_selected_expense(eid)
 
     def _attach_receipt_to_taxpayment(self):
         cur = self.taxpayments_tree.focus()
@@ -958,9 +1052,7 @@ class TMTLabsGUI:
         except Exception:
             messagebox.showerror("Error", "Invalid selection.")
             return
-        self.expense_tree.selection_set(eid)
-        self.expense_tree.focus(eid)
-        self._attach_receipt_to_selected_expense()
+        self._attach_receipt_to_selected_expense(eid)
 
     def _attach_receipt_to_deductible(self):
         cur = self.deductible_tree.focus()
@@ -972,9 +1064,7 @@ class TMTLabsGUI:
         except Exception:
             messagebox.showerror("Error", "Invalid selection.")
             return
-        self.expense_tree.selection_set(eid)
-        self.expense_tree.focus(eid)
-        self._attach_receipt_to_selected_expense()
+        self._attach_receipt_to_selected_expense(eid)
 
     def _add_tax_expense_from_taxes(self):
         date = self.taxes_date_entry.get()
@@ -998,8 +1088,6 @@ class TMTLabsGUI:
 
         # Add expense to data manager with the selected category
         self.data_manager.add_expense(date, ttype, amount, desc, is_deduct)
-        self._refresh_taxes_display()
-        self._refresh_expense_display()
         # Clear small form
         self.taxes_amount_entry.delete(0, tk.END)
         self.taxes_desc_entry.delete(0, tk.END)
@@ -1017,13 +1105,6 @@ class TMTLabsGUI:
         # Mark the expense as deductible
         if self.data_manager.update_expense(eid, is_tax_deductible=True):
             messagebox.showinfo('Updated', 'Marked as deductible.')
-            self._refresh_taxes_display()
-            self._refresh_expense_display()
-            try:
-                self._refresh_dashboard()
-                self._refresh_analysis_display()
-            except Exception:
-                pass
         else:
             messagebox.showerror('Error', 'Failed to update entry.')
 
@@ -1039,13 +1120,6 @@ class TMTLabsGUI:
             return
         if self.data_manager.update_expense(eid, is_tax_deductible=False):
             messagebox.showinfo('Updated', 'Unmarked as deductible.')
-            self._refresh_taxes_display()
-            self._refresh_expense_display()
-            try:
-                self._refresh_dashboard()
-                self._refresh_analysis_display()
-            except Exception:
-                pass
         else:
             messagebox.showerror('Error', 'Failed to update entry.')
 
@@ -1064,9 +1138,7 @@ class TMTLabsGUI:
         except Exception:
             messagebox.showerror("Error", "Invalid selection.")
             return
-        self.expense_tree.selection_set(eid)
-        self.expense_tree.focus(eid)
-        self._view_receipts_for_selected_expense()
+        self._view_receipts_for_selected_expense(eid)
 
     def _view_receipts_for_taxpayment(self):
         cur = self.taxpayments_tree.focus()
@@ -1078,9 +1150,7 @@ class TMTLabsGUI:
         except Exception:
             messagebox.showerror("Error", "Invalid selection.")
             return
-        self.expense_tree.selection_set(eid)
-        self.expense_tree.focus(eid)
-        self._view_receipts_for_selected_expense()
+        self._view_receipts_for_selected_expense(eid)
 
     def _view_receipts_for_deductible(self):
         cur = self.deductible_tree.focus()
@@ -1092,9 +1162,7 @@ class TMTLabsGUI:
         except Exception:
             messagebox.showerror("Error", "Invalid selection.")
             return
-        self.expense_tree.selection_set(eid)
-        self.expense_tree.focus(eid)
-        self._view_receipts_for_selected_expense()
+        self._view_receipts_for_selected_expense(eid)
 
     def _add_investment(self):
         try:
@@ -1110,7 +1178,6 @@ class TMTLabsGUI:
                 messagebox.showerror("Input Error", "Quantity and prices must be non-negative.")
                 return
             self.data_manager.add_investment(name, inv_type, qty, purchase, current, '', '')
-            self._refresh_investment_display()
             self.inv_name_entry.delete(0, tk.END)
             self.inv_type_entry.delete(0, tk.END)
             self.inv_qty_entry.delete(0, tk.END)
@@ -1119,19 +1186,14 @@ class TMTLabsGUI:
         except ValueError:
             messagebox.showerror("Input Error", "Please enter valid numbers for amounts.")
 
-    def _refresh_investment_display(self):
-        for item in self.inv_tree.get_children():
-            self.inv_tree.delete(item)
-        for inv in sorted(self.data_manager.get_investments(), key=lambda x: x.get('id', 0)):
-            self.inv_tree.insert("", "end", iid=inv['id'], values=(inv['id'], inv['name'], inv['type'], f"{inv['quantity']:.2f}", f"{inv['purchase_price']:.2f}", f"{inv['current_price']:.2f}", inv.get('notes', '')))
+    def _refresh_investment_display(self, changed_ids=None):
+        self._inv_sync.sync(sorted(self.data_manager.get_investments(), key=lambda x: x.get('id', 0)), changed_ids)
 
     def _delete_investment_from_button(self):
         inv_id = self._get_selected_item_id(self.inv_tree)
         if inv_id is not None:
             if messagebox.askyesno("Delete Investment", f"Delete investment ID {inv_id}?"):
-                if self.data_manager.delete_item('investments', inv_id):
-                    self._refresh_investment_display()
-                else:
+                if not self.data_manager.delete_item('investments', inv_id):
                     messagebox.showerror("Error", "Could not delete investment.")
 
     def _edit_investment_from_button(self):
@@ -1140,13 +1202,12 @@ class TMTLabsGUI:
             self._edit_investment(inv_id)
 
     def _edit_investment(self, inv_id):
-        inv_entry = next((i for i in self.data_manager.get_investments() if i['id'] == inv_id), None)
+        inv_entry = self.data_manager.get_item('investments', inv_id)
         if not inv_entry:
             messagebox.showerror("Error", "Investment entry not found.")
             return
         dlg = EditInvestmentDialog(self.master, inv_entry, self.data_manager, self.large_font)
         self.master.wait_window(dlg.top)
-        self._refresh_investment_display()
 
     def _setup_analysis_tab(self):
         # Analysis summary and charts
@@ -1174,15 +1235,16 @@ class TMTLabsGUI:
         chart_frame.pack(fill="both", expand=True, padx=10, pady=10)
         if HAS_MATPLOTLIB:
             # three panels: expense distribution, investment chart, annual projection
-            self.analysis_fig = plt.Figure(figsize=(9, 4), dpi=100)
-            self.analysis_ax1 = self.analysis_fig.add_subplot(131)
-            self.analysis_ax2 = self.analysis_fig.add_subplot(132)
-            self.analysis_ax3 = self.analysis_fig.add_subplot(133)
-
-            self.analysis_canvas = FigureCanvasTkAgg(self.analysis_fig, master=chart_frame)
-            self.analysis_canvas.get_tk_widget().pack(fill="both", expand=True)
-
-            ttk.Button(self.analysis_frame, text="Refresh Analysis", command=self._refresh_analysis_display).pack(pady=5)
+            from gui_modules.charts import ChartFigure
+            self.analysis_chart = ChartFigure(chart_frame, figsize=(9, 4))
+            self.analysis_fig = self.analysis_chart.figure
+            self.analysis_canvas = self.analysis_chart.canvas
+            self.analysis_pie = self.analysis_chart.pie_chart(131, title='Expense Distribution', empty_text='No expense data')
+            self.analysis_inv_bars = self.analysis_chart.bar_chart(132, title='Investments Current Value', empty_text='No investments')
+            self.analysis_projection = self.analysis_chart.line_chart(133, empty_text='Click "Project Annual Trajectory"')
+            self.analysis_chart.widget.pack(fill="both", expand=True)
+
+            ttk.Button(self.analysis_frame, text="Refresh Analysis", command=lambda: self._request_refresh('analysis')).pack(pady=5)
             self._refresh_analysis_display()
         else:
             ttk.Label(chart_frame, text="Install matplotlib (pip install -r requirements.txt) to view analysis charts.").pack(padx=10, pady=10)
@@ -1216,11 +1278,24 @@ class TMTLabsGUI:
         ttk.Button(btn_frame, text="Export Excel", command=self._export_excel).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="Export PDF", command=self._export_pdf).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="Generate Tax Summary", command=self._generate_tax_summary).pack(side="left", padx=5)
+        self.zip_receipts_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(btn_frame, text="Zip receipts (Excel)", variable=self.zip_receipts_var).pack(side="left", padx=5)
 
         self.report_status_label = ttk.Label(self.reports_frame, text="")
         self.report_status_label.pack(fill="x", padx=10, pady=5)
 
+        # Exports run on a worker thread; progress and cancellation for the running one
+        progress_frame = ttk.Frame(self.reports_frame, padding=(10, 0))
+        progress_frame.pack(fill="x")
+        self.export_progress = ttk.Progressbar(progress_frame, mode='determinate', maximum=1.0)
+        self.export_progress.pack(side="left", fill="x", expand=True, padx=5)
+        self.export_cancel_button = ttk.Button(progress_frame, text="Cancel Export", command=self._cancel_export, state='disabled')
+        self.export_cancel_button.pack(side="left", padx=5)
+
     def _parse_date_range(self):
+        if not hasattr(self, 'report_start_entry'):
+            # Reports tab not built yet, so no range has been entered
+            return None, None
         start = self.report_start_entry.get().strip()
         end = self.report_end_entry.get().strip()
         start_dt = None
@@ -1236,29 +1311,15 @@ class TMTLabsGUI:
         return start_dt, end_dt
 
     def _gather_report_data(self, start_dt=None, end_dt=None):
-        # Returns dict of lists for income and expenses and other items
-        incomes = self.data_manager.get_income()
-        expenses = self.data_manager.get_expenses()
+        # Returns dict of lists for income and expenses and other items.
+        # Income/expenses come from the data manager's date index (oldest first);
+        # undated entries are always included, as before.
+        inc_filtered = self.data_manager.query_range('income', start_dt, end_dt)
+        exp_filtered = self.data_manager.query_range('expenses', start_dt, end_dt)
         debts = self.data_manager.get_debts()
         assets = self.data_manager.get_assets()
         investments = self.data_manager.get_investments()
 
-        def in_range(item_date_str):
-            if not item_date_str:
-                return True
-            try:
-                d = datetime.strptime(item_date_str, '%Y-%m-%d')
-            except Exception:
-                return True
-            if start_dt and d < start_dt:
-                return False
-            if end_dt and d > end_dt:
-                return False
-            return True
-
-        inc_filtered = [i for i in incomes if in_range(i.get('date'))]
-        exp_filtered = [e for e in expenses if in_range(e.get('date'))]
-
         return {
             'income': inc_filtered,
             'expenses': exp_filtered,
@@ -1267,171 +1328,115 @@ class TMTLabsGUI:
             'investments': investments
         }
 
-    def _export_csv(self):
-        try:
-            import pandas as pd
-        except Exception:
-            messagebox.showerror("Missing Dependency", "Install pandas (pip install -r requirements.txt) to export reports.")
-            return
-
+    def _report_range_or_none(self):
+        """(start_dt, end_dt) for an export, or None when the entered dates are invalid."""
         start_dt, end_dt = self._parse_date_range()
         if start_dt is None and end_dt is None and (self.report_start_entry.get().strip() or self.report_end_entry.get().strip()):
-            return
-
-        data = self._gather_report_data(start_dt, end_dt)
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        # Income
-        df_inc = pd.DataFrame(data['income'])
-        df_exp = pd.DataFrame(data['expenses'])
-        base = f"moneymind_report_{timestamp}"
-        inc_file = base + "_income.csv"
-        exp_file = base + "_expenses.csv"
-        df_inc.to_csv(inc_file, index=False)
-        df_exp.to_csv(exp_file, index=False)
-        self.report_status_label.config(text=f"Exported CSV: {inc_file}, {exp_file}")
-        messagebox.showinfo("Export Complete", f"Exported CSV files:\n{inc_file}\n{exp_file}")
+            return None
+        return start_dt, end_dt
 
-    def _export_excel(self):
-        try:
-            import pandas as pd
-        except Exception:
-            messagebox.showerror("Missing Dependency", "Install pandas and openpyxl (pip install -r requirements.txt) to export Excel.")
+    def _queue_export(self, name, run, requires, install_hint):
+        missing = [m for m in requires if importlib.util.find_spec(m) is None]
+        if missing:
+            messagebox.showerror("Missing Dependency", install_hint)
+            return None
+        if getattr(self, '_exports', None) is None:
+            self._exports = ExportQueue(self.master, self._on_export_progress, self._on_export_finished)
+        job = self._exports.submit(name, run)
+        self.export_cancel_button.config(state='normal')
+        self._show_export_status()
+        return job
+
+    def _show_export_status(self, message=None):
+        pending = self._exports.pending
+        if not pending:
+            self.export_progress['value'] = 0
+            self.export_cancel_button.config(state='disabled')
+            if message:
+                self.report_status_label.config(text=message)
             return
+        text = message or f"{pending[0].name}: starting"
+        if len(pending) > 1:
+            text += f" ({len(pending) - 1} more queued)"
+        self.report_status_label.config(text=text)
 
-        start_dt, end_dt = self._parse_date_range()
-        if start_dt is None and end_dt is None and (self.report_start_entry.get().strip() or self.report_end_entry.get().strip()):
+    def _on_export_progress(self, job, done, total, message):
+        if job is not self._exports.current:
             return
+        self.export_progress['value'] = done / total if total else 0
+        self._show_export_status(f"{job.name}: {message} ({done}/{total})" if total else f"{job.name}: {message}")
+
+    def _on_export_finished(self, job, outcome, result):
+        self.export_progress['value'] = 0
+        if outcome == 'cancelled':
+            self._show_export_status(f"{job.name} cancelled")
+        elif outcome == 'failed':
+            self._show_export_status(f"{job.name} failed")
+            messagebox.showerror("Export Failed", f"{job.name} failed:\n{result}")
+        else:
+            status, details = result
+            self._show_export_status(status)
+            messagebox.showinfo("Export Complete", details)
 
-        data = self._gather_report_data(start_dt, end_dt)
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        base = f"moneymind_report_{timestamp}.xlsx"
-
-        # Create a report folder to hold receipts and other assets
-        import os, shutil
-        report_folder = f"moneymind_report_{timestamp}_files"
-        receipts_folder = os.path.join(report_folder, 'receipts')
-        os.makedirs(receipts_folder, exist_ok=True)
-
-
-        # Copy all receipt files referenced in expenses into the report receipts folder
-        def copy_receipts_for_list(exp_list, prefix):
-            out = []
-            for e in exp_list:
-                exp_copy = e.copy()
-                receipts = e.get('receipts', []) or []
-                rel_paths = []
-                for r in receipts:
-                    try:
-                        if os.path.exists(r):
-                            dest_name = f"{prefix}_{e.get('id')}_{os.path.basename(r)}"
-                            dest_path = os.path.join(receipts_folder, dest_name)
-                            shutil.copy2(r, dest_path)
-                            rel_paths.append(os.path.join('receipts', dest_name))
-                    except Exception:
-                        continue
-                exp_copy['receipt_files'] = ';'.join(rel_paths)
-                out.append(exp_copy)
-            return out
-
-        tax_payments = [e for e in data['expenses'] if e.get('category') in ('Income Tax', 'State Tax', 'Property Tax')]
-        deductibles = [e for e in data['expenses'] if e.get('is_tax_deductible')]
-        other_expenses = [e for e in data['expenses'] if e not in tax_payments and e not in deductibles]
-
-        taxpayments_copy = copy_receipts_for_list(tax_payments, 'taxpay')
-        deductibles_copy = copy_receipts_for_list(deductibles, 'ded')
-        others_copy = copy_receipts_for_list(other_expenses, 'oth')
-
-        with pd.ExcelWriter(base, engine='openpyxl') as writer:
-            pd.DataFrame(data['income']).to_excel(writer, sheet_name='Income', index=False)
-            pd.DataFrame(taxpayments_copy).to_excel(writer, sheet_name='TaxPayments', index=False)
-            pd.DataFrame(deductibles_copy).to_excel(writer, sheet_name='DeductibleExpenses', index=False)
-            pd.DataFrame(others_copy).to_excel(writer, sheet_name='OtherExpenses', index=False)
-            pd.DataFrame(data['assets']).to_excel(writer, sheet_name='Assets', index=False)
-            pd.DataFrame(data['debts']).to_excel(writer, sheet_name='Debts', index=False)
-            pd.DataFrame(data['investments']).to_excel(writer, sheet_name='Investments', index=False)
-
-        self.report_status_label.config(text=f"Exported Excel: {base} (+files in {report_folder})")
-        messagebox.showinfo("Export Complete", f"Exported Excel file:\n{base}\nAdditional files copied to folder:\n{report_folder}")
-
-    def _export_pdf(self):
-        try:
-            from reportlab.lib.pagesizes import letter
-            from reportlab.lib import colors
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet
-        except Exception:
-            messagebox.showerror("Missing Dependency", "Install reportlab (pip install -r requirements.txt) to export PDF.")
-            return
+    def _cancel_export(self):
+        if getattr(self, '_exports', None) is not None:
+            self._exports.cancel_current()
 
-        start_dt, end_dt = self._parse_date_range()
-        if start_dt is None and end_dt is None and (self.report_start_entry.get().strip() or self.report_end_entry.get().strip()):
+    def _export_csv(self):
+        report_range = self._report_range_or_none()
+        if report_range is None:
             return
+        start_dt, end_dt = report_range
+        base = exporters.report_basename()
 
-        data = self._gather_report_data(start_dt, end_dt)
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        fname = f"moneymind_report_{timestamp}.pdf"
+        def run(job):
+            # Streams straight from the data manager's date index; no snapshot needed
+            inc_file, exp_file = exporters.export_csv(self.data_manager, start_dt, end_dt, base, job)
+            return f"Exported CSV: {inc_file}, {exp_file}", f"Exported CSV files:\n{inc_file}\n{exp_file}"
 
-        doc = SimpleDocTemplate(fname, pagesize=letter)
-        styles = getSampleStyleSheet()
-        elems = []
+        self._queue_export("CSV export", run, (), "")
 
-        elems.append(Paragraph("MoneyMind Report", styles['Title']))
-        elems.append(Spacer(1, 12))
+    def _export_excel(self):
+        report_range = self._report_range_or_none()
+        if report_range is None:
+            return
+        start_dt, end_dt = report_range
+        base = exporters.report_basename()
 
-        # Summary
-        total_income = sum(float(i.get('amount', 0)) for i in data['income'])
-        total_expenses = sum(float(e.get('amount', 0)) for e in data['expenses'])
-        elems.append(Paragraph(f"Total Income: ${total_income:,.2f}", styles['Normal']))
-        elems.append(Paragraph(f"Total Expenses: ${total_expenses:,.2f}", styles['Normal']))
-        elems.append(Spacer(1, 12))
+        zip_receipts = self.zip_receipts_var.get()
 
-        # Expenses by category table
-        exp_by_cat = {}
-        for e in data['expenses']:
-            cat = e.get('category', 'Uncategorized')
-            exp_by_cat[cat] = exp_by_cat.get(cat, 0.0) + float(e.get('amount', 0))
+        def run(job):
+            workbook, receipts = exporters.export_excel(self.data_manager, start_dt, end_dt, base, job, zip_receipts=zip_receipts)
+            return (f"Exported Excel: {workbook} (+receipts in {receipts})",
+                    f"Exported Excel file:\n{workbook}\nReceipts bundled in:\n{receipts}")
 
-        table_data = [["Category", "Amount"]]
-        for k, v in exp_by_cat.items():
-            table_data.append([k, f"${v:,.2f}"])
+        self._queue_export("Excel export", run, ('openpyxl',), "Install openpyxl (pip install -r requirements.txt) to export Excel.")
 
-        t = Table(table_data, hAlign='LEFT')
-        t.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.grey), ('TEXTCOLOR',(0,0),(-1,0),colors.whitesmoke),('ALIGN',(1,1),(-1,-1),'RIGHT'),('GRID',(0,0),(-1,-1),0.5,colors.black)]))
-        elems.append(Paragraph("Expenses by Category", styles['Heading2']))
-        elems.append(t)
+    def _export_pdf(self):
+        report_range = self._report_range_or_none()
+        if report_range is None:
+            return
+        start_dt, end_dt = report_range
+        fname = exporters.report_basename() + ".pdf"
 
-        # Optionally include receipt images for expenses
-        from reportlab.platypus import Image as RLImage
+        # Print-size receipt renders are cached beside the data file and reused by later exports
+        render_cache = os.path.join(os.path.dirname(os.path.abspath(self.data_manager.data_file)), 'receipt_renders')
 
-        # After table, include receipts (first image per expense) if present
-        for e in data['expenses']:
-            receipts = e.get('receipts', [])
-            if receipts:
-                elems.append(Spacer(1, 12))
-                elems.append(Paragraph(f"Receipts for Expense ID {e.get('id')}: {e.get('description','')}", styles['Heading3']))
-                # add first receipt image
-                first = receipts[0]
-                try:
-                    img = RLImage(first)
-                    img._restrictSize(400, 300)
-                    elems.append(img)
-                except Exception as ex:
-                    elems.append(Paragraph(f"Could not embed image: {ex}", styles['Normal']))
+        def run(job):
+            # Reads the range from the data manager's date index in chunks, like the CSV export
+            exporters.export_pdf(self.data_manager, start_dt, end_dt, fname, job, render_cache=render_cache)
+            return f"Exported PDF: {fname}", f"Exported PDF file:\n{fname}"
 
-        doc.build(elems)
-        self.report_status_label.config(text=f"Exported PDF: {fname}")
-        messagebox.showinfo("Export Complete", f"Exported PDF file:\n{fname}")
+        self._queue_export("PDF export", run, ('reportlab',), "Install reportlab (pip install -r requirements.txt) to export PDF.")
 
     def _generate_tax_summary(self):
         # Simple tax summary: total income, deductible expenses, estimated taxable income
         start_dt, end_dt = self._parse_date_range()
         if start_dt is None and end_dt is None and (self.report_start_entry.get().strip() or self.report_end_entry.get().strip()):
             return
-        data = self._gather_report_data(start_dt, end_dt)
-        total_income = sum(float(i.get('amount', 0)) for i in data['income'])
-        deductible = sum(float(e.get('amount', 0)) for e in data['expenses'] if e.get('is_tax_deductible'))
-        taxable = total_income - deductible
-        txt = f"Total Income: ${total_income:,.2f}\nDeductible Expenses: ${deductible:,.2f}\nEstimated Taxable Income: ${taxable:,.2f}"
+        summary = self.data_manager.tax_engine.summary(start_dt, end_dt)
+        txt = (f"Total Income: ${summary['total_income']:,.2f}\nDeductible Expenses: ${summary['deductible']:,.2f}\n"
+               f"Estimated Taxable Income: ${summary['taxable_income']:,.2f}")
         self.report_status_label.config(text="Tax summary generated")
         messagebox.showinfo("Tax Summary", txt)
 
@@ -1448,9 +1453,9 @@ class TMTLabsGUI:
         # Summary area
         summary_frame = ttk.Frame(top, padding=10)
         summary_frame.pack(fill='x')
-        total_income = sum(float(i.get('amount', 0)) for i in data['income'])
-        total_expenses = sum(float(e.get('amount', 0)) for e in data['expenses'])
-        deductible = sum(float(e.get('amount', 0)) for e in data['expenses'] if e.get('is_tax_deductible'))
+        total_income = self.data_manager.rollup_total('income', start_dt, end_dt)
+        total_expenses = self.data_manager.rollup_total('expenses', start_dt, end_dt)
+        deductible = self.data_manager.tax_engine.totals(start_dt, end_dt)['deductibles']
         ttk.Label(summary_frame, text=f"Total Income: ${total_income:,.2f}").pack(anchor='w')
         ttk.Label(summary_frame, text=f"Total Expenses: ${total_expenses:,.2f}").pack(anchor='w')
         ttk.Label(summary_frame, text=f"Deductible Expenses: ${deductible:,.2f}").pack(anchor='w')
@@ -1505,7 +1510,6 @@ class TMTLabsGUI:
             # show first image if possible
             try:
                 from PIL import Image, ImageTk
-                import os
                 first = receipts[0]
                 if first.lower().endswith('.pdf'):
                     preview_label.config(text=f'PDF file: {os.path.basename(first)}')
@@ -1566,13 +1570,6 @@ class TMTLabsGUI:
         # Add expense to data manager (include recurring flag)
         rec_flag = getattr(self, 'expense_recurring_var', tk.BooleanVar(value=False)).get()
         self.data_manager.add_expense(date, category, amount, description, is_tax_deductible, recurring=rec_flag)
-        self._refresh_expense_display()
-        # update dashboard and analysis after expense change
-        try:
-            self._refresh_dashboard()
-            self._refresh_analysis_display()
-        except Exception:
-            pass
 
         # Clear input fields
         self.expense_category_entry.delete(0, tk.END)
@@ -1586,21 +1583,14 @@ class TMTLabsGUI:
         self.expense_date_entry.delete(0, tk.END)
         self.expense_date_entry.insert(0, datetime.now().strftime('%Y-%m-%d')) # Reset date to current
 
-    def _refresh_expense_display(self):
-        # Clear existing entries in the treeview
-        for item in self.expense_tree.get_children():
-            self.expense_tree.delete(item)
-
-        # Get fresh data
-        expense_data = self.data_manager.get_expenses()
-
-        # Sort by date, newest first (assuming date is YYYY-MM-DD for correct string comparison)
-        expense_data_sorted = sorted(expense_data, key=lambda x: x['date'], reverse=True)
+    def _refresh_expense_display(self, changed_ids=None):
+        # Newest first, straight from the date index; the tree only materializes the visible page
+        self.expense_tree.set_rows(self.data_manager.range_view('expenses', newest_first=True), changed_ids)
 
-        # Insert new data
-        for entry in expense_data_sorted:
-            recurring_text = "Yes" if entry.get('recurring') else "No"
-            self.expense_tree.insert("", "end", iid=entry['id'], values=(entry['id'], entry['date'], entry['category'], f"{entry['amount']:.2f}", entry.get('description',''), "Yes" if entry.get('is_tax_deductible') else "No", recurring_text))
+    @staticmethod
+    def _expense_row_values(entry):
+        recurring_text = "Yes" if entry.get('recurring') else "No"
+        return (entry['id'], entry['date'], entry['category'], f"{entry['amount']:.2f}", entry.get('description',''), "Yes" if entry.get('is_tax_deductible') else "No", recurring_text)
 
     def _on_expense_right_click(self, event):
         item_id = self.expense_tree.identify_row(event.y)
@@ -1615,19 +1605,13 @@ class TMTLabsGUI:
         menu.post(event.x_root, event.y_root)
 
     def _edit_expense_entry(self, expense_id):
-        expense_entry = next((item for item in self.data_manager.get_expenses() if item["id"] == expense_id), None)
+        expense_entry = self.data_manager.get_item("expenses", expense_id)
         if not expense_entry:
             messagebox.showerror("Error", "Expense entry not found.")
             return
 
         edit_dialog = EditExpenseDialog(self.master, expense_entry, self.data_manager, self.large_font)
         self.master.wait_window(edit_dialog.top)
-        self._refresh_expense_display()
-        try:
-            self._refresh_dashboard()
-            self._refresh_analysis_display()
-        except Exception:
-            pass
 
     def _edit_expense_entry_from_button(self):
         expense_id = self._get_selected_item_id(self.expense_tree)
@@ -1636,36 +1620,31 @@ class TMTLabsGUI:
 
     def _delete_expense_entry(self, expense_id):
         if messagebox.askyesno("Delete Expense", f"Are you sure you want to delete expense entry with ID {expense_id}?"):
-            if self.data_manager.delete_item("expenses", expense_id):
-                self._refresh_expense_display()
-                try:
-                    self._refresh_dashboard()
-                    self._refresh_analysis_display()
-                except Exception:
-                    pass
-            else:
+            if not self.data_manager.delete_item("expenses", expense_id):
                 messagebox.showerror("Error", "Could not delete expense entry.")
 
-    def _attach_receipt_to_selected_expense(self):
-        expense_id = self._get_selected_item_id(self.expense_tree)
+    def _attach_receipt_to_selected_expense(self, expense_id=None):
+        if expense_id is None:
+            expense_id = self._get_selected_item_id(self.expense_tree)
         if expense_id is None:
             return
         filepaths = filedialog.askopenfilenames(title="Select receipt files", filetypes=[("Images/PDF","*.png;*.jpg;*.jpeg;*.gif;*.pdf"), ("All files","*.*")])
         if not filepaths:
             return
         successes = 0
-        for fp in filepaths:
-            if self.data_manager.add_receipt_to_expense(expense_id, fp):
-                successes += 1
-        self._refresh_expense_display()
+        # One save for all selected files instead of one per file
+        with self.data_manager.batch():
+            for fp in filepaths:
+                if self.data_manager.add_receipt_to_expense(expense_id, fp):
+                    successes += 1
         messagebox.showinfo("Attach Receipts", f"Attached {successes} files to expense ID {expense_id}.")
 
-    def _view_receipts_for_selected_expense(self):
-        expense_id = self._get_selected_item_id(self.expense_tree)
+    def _view_receipts_for_selected_expense(self, expense_id=None):
+        if expense_id is None:
+            expense_id = self._get_selected_item_id(self.expense_tree)
         if expense_id is None:
             return
         receipts = self.data_manager.get_receipts_for_expense(expense_id)
-        import os
         if not receipts:
             messagebox.showinfo("Receipts", "No receipts attached to this expense.")
             return
@@ -1734,7 +1713,6 @@ class TMTLabsGUI:
                 return
             path = listbox.get(sel[0])
             try:
-                import os
                 os.startfile(path)
             except Exception as e:
                 messagebox.showerror("Open Error", f"Could not open file: {e}")
@@ -1753,7 +1731,6 @@ class TMTLabsGUI:
                     listbox.delete(idx)
                     preview_label.config(image='', text='Preview will appear here')
                     messagebox.showinfo("Removed", "Receipt detached from expense.")
-                    self._refresh_expense_display()
                 else:
                     messagebox.showerror("Error", "Could not remove receipt.")
             except Exception as e:
@@ -1957,6 +1934,108 @@ class TMTLabsGUI:
         self.ira_total_interest_label = ttk.Label(results_frame, text="Total Interest Earned: ")
         self.ira_total_interest_label.pack(anchor="w", pady=2)
 
+        # Monte Carlo range for the same inputs, run in worker processes
+        sim_frame = ttk.LabelFrame(calc_frame, text="Simulated Returns", padding="10")
+        sim_frame.pack(pady=10, padx=10, fill="x")
+        sim_inputs = ttk.Frame(sim_frame)
+        sim_inputs.pack(fill="x")
+        ttk.Label(sim_inputs, text="Return Volatility (%):").pack(side="left", padx=5)
+        self.ira_return_stdev_entry = ttk.Entry(sim_inputs, width=8)
+        self.ira_return_stdev_entry.insert(0, "15")
+        self.ira_return_stdev_entry.pack(side="left", padx=5)
+        ttk.Label(sim_inputs, text="Simulations:").pack(side="left", padx=5)
+        self.ira_paths_entry = ttk.Entry(sim_inputs, width=10)
+        self.ira_paths_entry.insert(0, "100000")
+        self.ira_paths_entry.pack(side="left", padx=5)
+        ttk.Button(sim_inputs, text="Simulate Returns", command=self._run_ira_simulation).pack(side="left", padx=5)
+        self.ira_sim_cancel_button = ttk.Button(sim_inputs, text="Cancel", state="disabled",
+                                                command=lambda: self._cancel_simulation(self.ira_sim_progress))
+        self.ira_sim_cancel_button.pack(side="left", padx=5)
+        self.ira_sim_progress = ttk.Progressbar(sim_frame, mode="determinate", maximum=1.0)
+        self.ira_sim_progress.pack(fill="x", padx=5, pady=4)
+        self.ira_sim_status_label = ttk.Label(sim_frame, text="")
+        self.ira_sim_status_label.pack(anchor="w", pady=2)
+
+        # What-if grid: projected balance over ranges of contribution, rate and retirement age
+        grid_frame = ttk.LabelFrame(calc_frame, text="What-if Grid", padding="10")
+        grid_frame.pack(pady=10, padx=10, fill="both", expand=True)
+        grid_inputs = ttk.Frame(grid_frame)
+        grid_inputs.pack(fill="x")
+        self.ira_grid_entries = {}
+        for row, (key, label, low, high) in enumerate((
+                ('contribution', "Annual Contribution from/to:", "0", "14000"),
+                ('rate', "Annual Rate (%) from/to:", "2", "10"),
+                ('age', "Retirement Age from/to:", "60", "70"))):
+            ttk.Label(grid_inputs, text=label).grid(row=row, column=0, padx=5, pady=2, sticky="w")
+            low_entry, high_entry = ttk.Entry(grid_inputs, width=10), ttk.Entry(grid_inputs, width=10)
+            low_entry.insert(0, low)
+            high_entry.insert(0, high)
+            low_entry.grid(row=row, column=1, padx=5, pady=2)
+            high_entry.grid(row=row, column=2, padx=5, pady=2)
+            self.ira_grid_entries[key] = (low_entry, high_entry)
+        ttk.Button(grid_inputs, text="Compute Grid", command=self._calculate_ira_grid).grid(row=0, column=3, padx=10)
+        ttk.Label(grid_inputs, text="Show Retirement Age:").grid(row=1, column=3, padx=10, sticky="w")
+        self.ira_grid_age = ttk.Spinbox(grid_inputs, from_=60, to=70, width=6, state="readonly",
+                                        command=self._show_ira_grid_age)
+        self.ira_grid_age.set(60)
+        self.ira_grid_age.grid(row=2, column=3, padx=10, sticky="w")
+        self.ira_grid_label = ttk.Label(grid_frame, text="")
+        self.ira_grid_label.pack(anchor="w", pady=2)
+        self.ira_grid = None
+        if HAS_MATPLOTLIB:
+            from gui_modules.charts import ChartFigure
+            self.ira_chart = ChartFigure(grid_frame, figsize=(6, 3))
+            self.ira_heatmap = self.ira_chart.heatmap_chart(111, empty_text="Compute a grid to compare what-ifs",
+                                                            value_label="Projected balance ($)")
+            self.ira_chart.widget.pack(fill="both", expand=True)
+            self.ira_chart.commit(self.ira_heatmap.update([], [], None))
+        else:
+            ttk.Label(grid_frame, text="Install matplotlib to view the what-if heatmap.").pack()
+
+    def _calculate_ira_grid(self):
+        if importlib.util.find_spec('numpy') is None:
+            messagebox.showerror("Missing Dependency", "The what-if grid needs numpy. Install it with: pip install numpy")
+            return
+        import numpy as np
+        try:
+            current_age = int(self.ira_current_age_entry.get())
+            current_balance = float(self.ira_current_balance_entry.get() or 0)
+            (c_low, c_high), (r_low, r_high), (a_low, a_high) = (
+                (float(low.get()), float(high.get())) for low, high in self.ira_grid_entries.values())
+            if c_low > c_high or r_low > r_high or a_low > a_high:
+                raise ValueError("Each 'from' must not exceed its 'to'.")
+            self.ira_grid = ira_engine.sweep(
+                current_balance, current_age,
+                np.linspace(c_low, c_high, 29),
+                np.linspace(r_low, r_high, 33) / 100,
+                np.arange(int(a_low), int(a_high) + 1))
+        except ValueError as e:
+            messagebox.showerror("Input Error", f"Please enter valid numbers for the IRA inputs and grid ranges.\n{e}")
+            return
+        ages = self.ira_grid.retirement_ages
+        self.ira_grid_age.config(from_=int(ages[0]), to=int(ages[-1]))
+        if not ages[0] <= int(self.ira_grid_age.get() or 0) <= ages[-1]:
+            self.ira_grid_age.set(int(ages[0]))
+        self._show_ira_grid_age()
+
+    def _show_ira_grid_age(self):
+        # Switching the age only re-slices the computed grid
+        grid = self.ira_grid
+        if grid is None:
+            return
+        age = int(self.ira_grid_age.get())
+        index = int(age - grid.retirement_ages[0])
+        balances = grid.balances[:, :, index]
+        self.ira_grid_label.config(
+            text=f"Retiring at {age}: ${balances.min():,.0f} to ${balances.max():,.0f} "
+                 f"across {balances.size:,} contribution/rate combinations")
+        if HAS_MATPLOTLIB:
+            self.ira_chart.commit(
+                self.ira_heatmap.set_labels(f"Projected Balance at {age}", "Annual Contribution ($)", "Annual Rate (%)"),
+                # One colour scale for the whole grid, so ages compare directly
+                self.ira_heatmap.update(grid.contributions, grid.rates * 100, balances.T,
+                                        limits=(grid.balances.min(), grid.balances.max())))
+
     def _setup_retirement_tab(self):
         frame = ttk.Frame(self.retirement_frame, padding=10)
         frame.pack(fill='both', expand=True)
@@ -1994,6 +2073,60 @@ class TMTLabsGUI:
         self.ret_inflation = ttk.Entry(inputs)
         self.ret_inflation.grid(row=2, column=3, padx=5, pady=2, sticky='ew')
 
+        # Monte Carlo: volatility of returns and inflation, target and simulation settings
+        ttk.Label(inputs, text='Return Volatility (%):').grid(row=3, column=0, padx=5, pady=2, sticky='w')
+        self.ret_return_stdev = ttk.Entry(inputs)
+        self.ret_return_stdev.insert(0, '15')
+        self.ret_return_stdev.grid(row=3, column=1, padx=5, pady=2, sticky='ew')
+
+        ttk.Label(inputs, text='Inflation Volatility (%):').grid(row=3, column=2, padx=5, pady=2, sticky='w')
+        self.ret_inflation_stdev = ttk.Entry(inputs)
+        self.ret_inflation_stdev.insert(0, '1')
+        self.ret_inflation_stdev.grid(row=3, column=3, padx=5, pady=2, sticky='ew')
+
+        ttk.Label(inputs, text="Target (today's $):").grid(row=4, column=0, padx=5, pady=2, sticky='w')
+        self.ret_target = ttk.Entry(inputs)
+        self.ret_target.grid(row=4, column=1, padx=5, pady=2, sticky='ew')
+
+        ttk.Label(inputs, text='Return Distribution:').grid(row=4, column=2, padx=5, pady=2, sticky='w')
+        self.ret_distribution = ttk.Combobox(inputs, values=('normal', 'lognormal', 'student-t'), state='readonly')
+        self.ret_distribution.set('normal')
+        self.ret_distribution.grid(row=4, column=3, padx=5, pady=2, sticky='ew')
+
+        ttk.Label(inputs, text='Simulations:').grid(row=5, column=0, padx=5, pady=2, sticky='w')
+        self.ret_paths = ttk.Entry(inputs)
+        self.ret_paths.insert(0, '20000')
+        self.ret_paths.grid(row=5, column=1, padx=5, pady=2, sticky='ew')
+
+        ttk.Label(inputs, text='Seed (optional):').grid(row=5, column=2, padx=5, pady=2, sticky='w')
+        self.ret_seed = ttk.Entry(inputs)
+        self.ret_seed.grid(row=5, column=3, padx=5, pady=2, sticky='ew')
+
+        # Withdrawal phase: balance at retirement, horizon, target success and RMDs
+        ttk.Label(inputs, text="Retirement Balance (today's $):").grid(row=6, column=0, padx=5, pady=2, sticky='w')
+        self.ret_withdraw_balance = ttk.Entry(inputs)
+        self.ret_withdraw_balance.grid(row=6, column=1, padx=5, pady=2, sticky='ew')
+
+        ttk.Label(inputs, text='Plan Until Age:').grid(row=6, column=2, padx=5, pady=2, sticky='w')
+        self.ret_end_age = ttk.Entry(inputs)
+        self.ret_end_age.insert(0, '95')
+        self.ret_end_age.grid(row=6, column=3, padx=5, pady=2, sticky='ew')
+
+        ttk.Label(inputs, text='Target Success (%):').grid(row=7, column=0, padx=5, pady=2, sticky='w')
+        self.ret_success_target = ttk.Entry(inputs)
+        self.ret_success_target.insert(0, '90')
+        self.ret_success_target.grid(row=7, column=1, padx=5, pady=2, sticky='ew')
+
+        self.ret_rmd_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(inputs, text='Take required minimum distributions (from 73)',
+                        variable=self.ret_rmd_var).grid(row=7, column=2, columnspan=2, padx=5, pady=2, sticky='w')
+
+        # Historical backtest: stock/bond mix replayed over past returns
+        ttk.Label(inputs, text='Stock Allocation (%):').grid(row=8, column=0, padx=5, pady=2, sticky='w')
+        self.ret_stock_share = ttk.Entry(inputs)
+        self.ret_stock_share.insert(0, '60')
+        self.ret_stock_share.grid(row=8, column=1, padx=5, pady=2, sticky='ew')
+
         inputs.grid_columnconfigure(1, weight=1)
         inputs.grid_columnconfigure(3, weight=1)
 
@@ -2003,6 +2136,20 @@ class TMTLabsGUI:
         ttk.Button(btns, text='Auto-fill from Data', command=self._ret_fill_from_data).pack(side='left', padx=5)
         ttk.Button(btns, text='Run Projection', command=self._run_retirement_projection).pack(side='left', padx=5)
         ttk.Button(btns, text='Run Scenario (+1% / -1%)', command=self._run_retirement_scenarios).pack(side='left', padx=5)
+        ttk.Button(btns, text='Run Monte Carlo', command=self._run_retirement_monte_carlo).pack(side='left', padx=5)
+        ttk.Button(btns, text='Solve Withdrawal Rate', command=self._run_withdrawal_solver).pack(side='left', padx=5)
+        ttk.Button(btns, text='Backtest History', command=self._run_retirement_backtest).pack(side='left', padx=5)
+
+        # Simulations run in worker processes; progress and cancellation
+        sim_frame = ttk.Frame(frame)
+        sim_frame.pack(fill='x')
+        self.ret_sim_progress = ttk.Progressbar(sim_frame, mode='determinate', maximum=1.0)
+        self.ret_sim_progress.pack(side='left', fill='x', expand=True, padx=5)
+        self.ret_sim_cancel_button = ttk.Button(sim_frame, text='Cancel', state='disabled',
+                                                command=lambda: self._cancel_simulation(self.ret_sim_progress))
+        self.ret_sim_cancel_button.pack(side='left', padx=5)
+        self.ret_sim_status_label = ttk.Label(frame, text='')
+        self.ret_sim_status_label.pack(anchor='w', padx=5)
 
         # Output area
         output_frame = ttk.LabelFrame(frame, text='Projection Output', padding=8)
@@ -2015,12 +2162,12 @@ class TMTLabsGUI:
         chart_frame = ttk.Frame(frame)
         chart_frame.pack(fill='both', expand=True)
         if HAS_MATPLOTLIB:
-            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-            import matplotlib.pyplot as plt
-            self.ret_fig = plt.Figure(figsize=(6,3), dpi=100)
-            self.ret_ax = self.ret_fig.add_subplot(111)
-            self.ret_canvas = FigureCanvasTkAgg(self.ret_fig, master=chart_frame)
-            self.ret_canvas.get_tk_widget().pack(fill='both', expand=True)
+            from gui_modules.charts import ChartFigure
+            self.ret_chart = ChartFigure(chart_frame, figsize=(6, 3))
+            self.ret_fig = self.ret_chart.figure
+            self.ret_canvas = self.ret_chart.canvas
+            self.ret_lines = self.ret_chart.line_chart(111, empty_text='')
+            self.ret_chart.widget.pack(fill='both', expand=True)
         else:
             ttk.Label(chart_frame, text='Install matplotlib to view projection charts.').pack()
 
@@ -2079,16 +2226,12 @@ class TMTLabsGUI:
                 self.ret_output_text.insert(tk.END, f'Year {i}: ${val:,.2f}\n')
 
             if HAS_MATPLOTLIB:
-                self.ret_ax.clear()
                 years_x = list(range(current_age+1, retire_age+1))
-                self.ret_ax.plot(years_x, balances, label='Nominal')
-                self.ret_ax.plot(years_x, real_balances, label='Real (inflation-adjusted)')
-                self.ret_ax.set_title('Retirement Projection')
-                self.ret_ax.set_xlabel('Age')
-                self.ret_ax.set_ylabel('Balance')
-                self.ret_ax.legend()
-                self.ret_fig.tight_layout()
-                self.ret_canvas.draw()
+                self.ret_chart.commit(
+                    self.ret_lines.set_labels('Retirement Projection', 'Age', 'Balance'),
+                    self.ret_lines.set_bands([], []),
+                    self.ret_lines.update([('Nominal', years_x, balances),
+                                           ('Real (inflation-adjusted)', years_x, real_balances)], legend=True))
 
         except ValueError:
             messagebox.showerror('Input Error', 'Please enter valid numeric inputs for projection.')
@@ -2123,19 +2266,283 @@ class TMTLabsGUI:
                 self.ret_output_text.insert(tk.END, f'{lab}: ${rl[-1]:,.2f}\n')
 
             if HAS_MATPLOTLIB:
-                self.ret_ax.clear()
-                for lab, rl in zip(labels, all_real):
-                    self.ret_ax.plot(ages, rl, label=lab)
-                self.ret_ax.set_title('Scenario Comparison (Real Values)')
-                self.ret_ax.set_xlabel('Age')
-                self.ret_ax.set_ylabel('Inflation-adjusted Balance')
-                self.ret_ax.legend()
-                self.ret_fig.tight_layout()
-                self.ret_canvas.draw()
+                self.ret_chart.commit(
+                    self.ret_lines.set_labels('Scenario Comparison (Real Values)', 'Age', 'Inflation-adjusted Balance'),
+                    self.ret_lines.set_bands([], []),
+                    self.ret_lines.update([(lab, ages, rl) for lab, rl in zip(labels, all_real)], legend=True))
 
         except Exception:
             messagebox.showerror('Error', 'Failed to run scenarios. Check inputs.')
 
+    def _ret_sim_params(self):
+        # Monte Carlo inputs from the Retirement tab; raises ValueError on bad input
+        import retirement_sim
+        current_age = int(self.ret_current_age.get())
+        retire_age = int(self.ret_retire_age.get())
+        if retire_age <= current_age:
+            raise ValueError('Retirement age must be greater than current age.')
+        return retirement_sim.SimParams(
+            current_age=current_age,
+            retire_age=retire_age,
+            savings=float(self.ret_current_savings.get() or 0),
+            contribution=float(self.ret_annual_contrib.get() or 0),
+            return_mean=float(self.ret_rate.get() or 5.0) / 100.0,
+            return_stdev=float(self.ret_return_stdev.get() or 15.0) / 100.0,
+            inflation_mean=float(self.ret_inflation.get() or 2.0) / 100.0,
+            inflation_stdev=float(self.ret_inflation_stdev.get() or 1.0) / 100.0,
+            distribution=self.ret_distribution.get() or 'normal',
+            target=float(self.ret_target.get() or 0),
+        )
+
+    def _run_retirement_monte_carlo(self):
+        if importlib.util.find_spec('numpy') is None:
+            messagebox.showerror('Missing Dependency', 'Monte Carlo projections need numpy. Install it with: pip install numpy')
+            return
+        try:
+            params = self._ret_sim_params()
+            n_paths = int(self.ret_paths.get() or 20000)
+            seed = int(self.ret_seed.get()) if self.ret_seed.get().strip() else None
+            if n_paths <= 0:
+                raise ValueError('Simulations must be a positive whole number.')
+        except ValueError as e:
+            messagebox.showerror('Input Error', f'Please enter valid numeric inputs for the simulation.\n{e}')
+            return
+
+        def run(job):
+            import sim_runner
+            return sim_runner.simulate(params, n_paths, seed, progress=lambda done, total: job.step(done, total, 'batches'))
+
+        self._queue_simulation('Monte Carlo', run, self.ret_sim_progress, self.ret_sim_status_label,
+                               self.ret_sim_cancel_button, lambda result: self._show_monte_carlo_result(params, result))
+
+    def _show_monte_carlo_result(self, params, result):
+        import retirement_sim
+        pct = result.percentiles
+        self.ret_output_text.delete('1.0', tk.END)
+        self.ret_output_text.insert(tk.END, f'Monte Carlo: {result.n_paths:,} paths, {params.distribution} returns '
+                                            f'(seed {result.seed}; enter it to repeat this run)\n')
+        self.ret_output_text.insert(tk.END, f"Balance at age {params.retire_age} (real, today's $):\n")
+        for p in retirement_sim.PERCENTILES:
+            self.ret_output_text.insert(tk.END, f'  {p}th percentile: ${pct[p][-1]:,.2f}\n')
+        self.ret_output_text.insert(tk.END, f'Nominal median: ${result.final_nominal[50]:,.2f} '
+                                            f'(5th-95th: ${result.final_nominal[5]:,.2f} - ${result.final_nominal[95]:,.2f})\n')
+        if result.success_probability is not None:
+            self.ret_output_text.insert(tk.END, f"Chance of reaching ${params.target:,.2f} (today's $): "
+                                                f'{result.success_probability:.1%}\n')
+
+        if HAS_MATPLOTLIB:
+            ages = result.ages
+            series = [('Median', ages, pct[50], {'color': 'tab:blue', 'linestyle': '-'})]
+            if params.target:
+                series.append(('Target', [ages[0], ages[-1]], [params.target] * 2, {'color': 'tab:red', 'linestyle': '--'}))
+            self.ret_chart.commit(
+                self.ret_lines.set_labels('Monte Carlo Projection (Real Values)', 'Age', 'Inflation-adjusted Balance'),
+                self.ret_lines.set_bands(ages, [('5th-95th percentile', pct[5], pct[95], {'color': 'tab:blue', 'alpha': 0.15}),
+                                                ('25th-75th percentile', pct[25], pct[75], {'color': 'tab:blue', 'alpha': 0.3})]),
+                self.ret_lines.update(series, legend=True))
+
+    def _run_withdrawal_solver(self):
+        if importlib.util.find_spec('numpy') is None:
+            messagebox.showerror('Missing Dependency', 'Withdrawal planning needs numpy. Install it with: pip install numpy')
+            return
+        import withdrawal_sim
+        try:
+            sim = self._ret_sim_params()
+            if self.ret_withdraw_balance.get().strip():
+                balance = float(self.ret_withdraw_balance.get())
+            else:
+                # Default to the fixed-rate projection's final balance in today's money
+                years = sim.retire_age - sim.current_age
+                balance = sim.savings
+                for _ in range(years):
+                    balance = balance * (1 + sim.return_mean) + sim.contribution
+                balance /= (1 + sim.inflation_mean) ** years
+            params = withdrawal_sim.WithdrawalParams(
+                balance=balance,
+                retire_age=sim.retire_age,
+                end_age=int(self.ret_end_age.get() or 95),
+                return_mean=sim.return_mean,
+                return_stdev=sim.return_stdev,
+                inflation_mean=sim.inflation_mean,
+                inflation_stdev=sim.inflation_stdev,
+                distribution=sim.distribution,
+                rmd=self.ret_rmd_var.get(),
+            )
+            target = float(self.ret_success_target.get() or 90) / 100.0
+            n_paths = int(self.ret_paths.get() or 20000)
+            seed = int(self.ret_seed.get()) if self.ret_seed.get().strip() else None
+            if params.end_age <= params.retire_age:
+                raise ValueError('Plan Until Age must be greater than retirement age.')
+            if not 0 < target < 1 or n_paths <= 0 or balance <= 0:
+                raise ValueError('Target success must be between 0 and 100, and balance and simulations positive.')
+        except ValueError as e:
+            messagebox.showerror('Input Error', f'Please enter valid numeric inputs for the withdrawal plan.\n{e}')
+            return
+
+        def run(job):
+            return withdrawal_sim.analyse(params, n_paths, target, seed,
+                                          progress=lambda done, total: job.step(done, total, 'bisection steps'))
+
+        self._queue_simulation('Withdrawal solver', run, self.ret_sim_progress, self.ret_sim_status_label,
+                               self.ret_sim_cancel_button, lambda result: self._show_withdrawal_result(params, result))
+
+    def _show_withdrawal_result(self, params, result):
+        pct = result.percentiles
+        worst, best = result.sequence_risk
+        self.ret_output_text.delete('1.0', tk.END)
+        self.ret_output_text.insert(tk.END, f'Withdrawals from age {params.retire_age} to {params.end_age}, '
+                                            f'{result.n_paths:,} paths (seed {result.seed})\n')
+        self.ret_output_text.insert(tk.END, f'Sustainable withdrawal rate at {result.target_probability:.0%} success: '
+                                            f'{result.rate:.2%}\n')
+        self.ret_output_text.insert(tk.END, f"  = ${params.balance * result.rate:,.2f} a year in today's $ from "
+                                            f'${params.balance:,.2f}, raised with inflation\n')
+        if params.rmd:
+            self.ret_output_text.insert(tk.END, 'Required minimum distributions are taken when larger.\n')
+        self.ret_output_text.insert(tk.END, f'Sequence risk: success is {worst:.1%} when the first 10 years\' returns are '
+                                            f'in the worst quarter, {best:.1%} in the best quarter\n')
+        self.ret_output_text.insert(tk.END, f"Balance at age {params.end_age} (real, today's $): "
+                                            f'median ${pct[50][-1]:,.2f}, 5th percentile ${pct[5][-1]:,.2f}\n')
+
+        if HAS_MATPLOTLIB:
+            ages = result.ages
+            self.ret_chart.commit(
+                self.ret_lines.set_labels(f'Withdrawing {result.rate:.2%} a Year (Real Values)', 'Age',
+                                          'Inflation-adjusted Balance'),
+                self.ret_lines.set_bands(ages, [('5th-95th percentile', pct[5], pct[95], {'color': 'tab:green', 'alpha': 0.15}),
+                                                ('25th-75th percentile', pct[25], pct[75], {'color': 'tab:green', 'alpha': 0.3})]),
+                self.ret_lines.update([('Median', ages, pct[50], {'color': 'tab:green', 'linestyle': '-'})], legend=True))
+
+    def _run_retirement_backtest(self):
+        if importlib.util.find_spec('numpy') is None:
+            messagebox.showerror('Missing Dependency', 'Backtests need numpy. Install it with: pip install numpy')
+            return
+        import backtest
+        try:
+            current_age = int(self.ret_current_age.get())
+            retire_age = int(self.ret_retire_age.get())
+            stock_share = float(self.ret_stock_share.get() or 60) / 100.0
+            if not 0 <= stock_share <= 1:
+                raise ValueError('Stock allocation must be between 0 and 100.')
+            params = backtest.BacktestParams(
+                savings=float(self.ret_current_savings.get() or 0),
+                contribution=float(self.ret_annual_contrib.get() or 0),
+                years=retire_age - current_age,
+                stock_share=stock_share,
+            )
+            result = backtest.run_backtest(params)
+        except ValueError as e:
+            messagebox.showerror('Input Error', f'Please enter valid inputs for the backtest.\n{e}')
+            return
+        except OSError as e:
+            messagebox.showerror('Error', f'Could not read the historical returns data: {e}')
+            return
+
+        def span(i):
+            return f'{result.start_years[i]}-{result.start_years[i] + params.years - 1}'
+
+        pct = result.percentiles
+        self.ret_output_text.delete('1.0', tk.END)
+        self.ret_output_text.insert(tk.END, f'Backtest: {len(result.start_years)} historical {params.years}-year windows '
+                                            f'({span(0)} to {span(-1)}), {stock_share:.0%} stocks / {1 - stock_share:.0%} bonds\n')
+        self.ret_output_text.insert(tk.END, "Ending balance (real, in each window's starting-year dollars):\n")
+        for p in pct:
+            self.ret_output_text.insert(tk.END, f'  {p}th percentile: ${pct[p]:,.2f}\n')
+        self.ret_output_text.insert(tk.END, 'Worst windows:\n')
+        for i in result.worst:
+            self.ret_output_text.insert(tk.END, f'  {span(i)}: ${result.ending[i]:,.2f}\n')
+
+        if HAS_MATPLOTLIB:
+            import numpy as np
+            ages = list(range(current_age + 1, retire_age + 1))
+            by_year = np.percentile(result.real_paths, (5, 25, 50, 75, 95), axis=0)
+            series = [('Median window', ages, by_year[2], {'color': 'tab:purple', 'linestyle': '-'})]
+            series += [(f'Worst: {span(i)}', ages, result.real_paths[i], {'color': 'tab:red', 'linestyle': style})
+                       for i, style in zip(result.worst[:3], ('-', '--', ':'))]
+            self.ret_chart.commit(
+                self.ret_lines.set_labels('Historical Backtest (Real Values)', 'Age', 'Inflation-adjusted Balance'),
+                self.ret_lines.set_bands(ages, [('5th-95th percentile', by_year[0], by_year[4], {'color': 'tab:purple', 'alpha': 0.15}),
+                                                ('25th-75th percentile', by_year[1], by_year[3], {'color': 'tab:purple', 'alpha': 0.3})]),
+                self.ret_lines.update(series, legend=True))
+
+    def _run_ira_simulation(self):
+        if importlib.util.find_spec('numpy') is None:
+            messagebox.showerror("Missing Dependency", "Simulations need numpy. Install it with: pip install numpy")
+            return
+        import retirement_sim
+        try:
+            current_age = int(self.ira_current_age_entry.get())
+            retirement_age = int(self.ira_retirement_age_entry.get())
+            n_paths = int(self.ira_paths_entry.get() or 100000)
+            # Nominal balances: no inflation, contributions at the end of each year
+            params = retirement_sim.SimParams(
+                current_age=current_age,
+                retire_age=retirement_age,
+                savings=float(self.ira_current_balance_entry.get()),
+                contribution=float(self.ira_annual_contribution_entry.get()),
+                return_mean=float(self.ira_annual_rate_entry.get()) / 100,
+                return_stdev=float(self.ira_return_stdev_entry.get() or 15.0) / 100,
+                inflation_mean=0.0,
+                inflation_stdev=0.0,
+                index_contributions=False,
+            )
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter valid numbers for all fields.")
+            return
+        if current_age >= retirement_age or n_paths <= 0:
+            messagebox.showwarning("Input Error", "Retirement Age must be greater than Current Age and Simulations positive.")
+            return
+
+        def run(job):
+            import sim_runner
+            return sim_runner.simulate(params, n_paths, progress=lambda done, total: job.step(done, total, 'batches'))
+
+        def show(result):
+            final = result.final_nominal
+            self.ira_sim_status_label.config(
+                text=f"Balance at retirement: 5th percentile ${final[5]:,.2f}, median ${final[50]:,.2f}, "
+                     f"95th percentile ${final[95]:,.2f} ({result.n_paths:,} simulations)")
+
+        self._queue_simulation("IRA simulation", run, self.ira_sim_progress, self.ira_sim_status_label,
+                               self.ira_sim_cancel_button, show)
+
+    def _queue_simulation(self, name, run, progress, status_label, cancel_button, on_done):
+        # Simulations share one background queue (separate from exports); each job reports
+        # to the progress bar, label and cancel button of the tab that started it
+        if getattr(self, '_simulations', None) is None:
+            self._simulations = ExportQueue(self.master, self._on_simulation_progress, self._on_simulation_finished)
+            self._simulation_views = {}
+        job = self._simulations.submit(name, run)
+        self._simulation_views[job] = (progress, status_label, cancel_button, on_done)
+        cancel_button.config(state='normal')
+        status_label.config(text=f"{name}: starting" if self._simulations.current is job else f"{name}: queued")
+        return job
+
+    def _on_simulation_progress(self, job, done, total, message):
+        progress, status_label = self._simulation_views[job][:2]
+        progress['value'] = done / total if total else 0
+        status_label.config(text=f"{job.name}: {done}/{total} {message}")
+
+    def _on_simulation_finished(self, job, outcome, result):
+        progress, status_label, cancel_button, on_done = self._simulation_views.pop(job)
+        progress['value'] = 0
+        if not any(view[0] is progress for view in self._simulation_views.values()):
+            cancel_button.config(state='disabled')
+        if outcome == 'cancelled':
+            status_label.config(text=f"{job.name} cancelled")
+        elif outcome == 'failed':
+            status_label.config(text=f"{job.name} failed")
+            messagebox.showerror("Simulation Failed", f"{job.name} failed:\n{result}")
+        else:
+            status_label.config(text="")
+            on_done(result)
+
+    def _cancel_simulation(self, progress):
+        if getattr(self, '_simulations', None) is None:
+            return
+        for job in self._simulations.pending:
+            if self._simulation_views.get(job, (None,))[0] is progress:
+                job.cancel()
+
     def _calculate_ira_projection(self):
         try:
             current_age = int(self.ira_current_age_entry.get())
@@ -2152,23 +2559,9 @@ class TMTLabsGUI:
                 messagebox.showwarning("Input Error", "Annual Rate of Return cannot be negative.")
                 return
 
-            years_to_retirement = retirement_age - current_age
-            monthly_rate = (annual_rate_percent / 100) / 12
-            monthly_contribution = annual_contribution / 12
-            
-            projected_balance = current_balance
-            total_contributions = 0
-
-            for year in range(years_to_retirement):
-                # Account for existing balance growth
-                projected_balance *= (1 + (annual_rate_percent / 100))
-                # Account for annual contributions (simplified as lump sum at year end)
-                # More accurately: monthly contributions compounding
-                future_value_of_contributions = monthly_contribution * (((1 + monthly_rate)**12 - 1) / monthly_rate)
-                projected_balance += future_value_of_contributions
-                total_contributions += annual_contribution
-
-            total_interest_earned = projected_balance - current_balance - total_contributions
+            # Closed form of growing the balance yearly and adding monthly contributions
+            projected_balance, total_contributions, total_interest_earned = ira_engine.project(
+                current_balance, annual_contribution, annual_rate_percent / 100, retirement_age - current_age)
 
             self.ira_projected_balance_label.config(text=f"Projected Balance at Retirement: ${projected_balance:,.2f}")
             self.ira_total_contributions_label.config(text=f"Total Contributions: ${total_contributions:,.2f}")
@@ -2197,6 +2590,7 @@ class TMTLabsGUI:
         self.dashboard_income_total_label.pack(anchor='w')
         cols_inc = ('ID','Date','Source','Amount')
         self.income_report_tree = ttk.Treeview(left_rf, columns=cols_inc, show='headings', height=5)
+        self._income_report_sync = TreeviewSync(self.income_report_tree, lambda inc: (inc.get('id'), inc.get('date',''), inc.get('source',''), f"{float(inc.get('amount',0.0)):.2f}"))
         for c in cols_inc:
             self.income_report_tree.heading(c, text=c)
         # set sensible column widths and anchors
@@ -2216,6 +2610,7 @@ class TMTLabsGUI:
         self.dashboard_expense_total_label.pack(anchor='w')
         cols_exp = ('ID','Date','Category','Amount')
         self.expense_report_tree = ttk.Treeview(right_rf, columns=cols_exp, show='headings', height=5)
+        self._expense_report_sync = TreeviewSync(self.expense_report_tree, lambda ex: (ex.get('id'), ex.get('date',''), ex.get('category',''), f"{float(ex.get('amount',0.0)):.2f}"))
         for c in cols_exp:
             self.expense_report_tree.heading(c, text=c)
         self.expense_report_tree.column('ID', width=50, anchor='center', stretch=False)
@@ -2234,19 +2629,22 @@ class TMTLabsGUI:
         chart_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
         if HAS_MATPLOTLIB:
-            self.dashboard_fig = plt.Figure(figsize=(8, 4), dpi=100)
-            self.db_ax1 = self.dashboard_fig.add_subplot(121)
-            self.db_ax2 = self.dashboard_fig.add_subplot(122)
-
-            self.dashboard_canvas = FigureCanvasTkAgg(self.dashboard_fig, master=chart_frame)
-            self.dashboard_canvas.get_tk_widget().pack(fill="both", expand=True)
-
-            ttk.Button(self.dashboard_frame, text="Refresh Dashboard", command=self._refresh_dashboard).pack(pady=5)
+            # Charts keep their artists; refreshes update them in place (see gui_modules/charts.py)
+            from gui_modules.charts import ChartFigure
+            self.dashboard_chart = ChartFigure(chart_frame, figsize=(8, 4))
+            self.dashboard_fig = self.dashboard_chart.figure
+            self.dashboard_canvas = self.dashboard_chart.canvas
+            self.db_expense_bars = self.dashboard_chart.bar_chart(121, title='Expenses by Category', empty_text='No expense data')
+            self.db_income_line = self.dashboard_chart.line_chart(122, title='Income by Date', empty_text='No income data',
+                                                                  dates=True, rotation=45)
+            self.dashboard_chart.widget.pack(fill="both", expand=True)
+
+            ttk.Button(self.dashboard_frame, text="Refresh Dashboard", command=lambda: self._request_refresh('dashboard')).pack(pady=5)
             self._refresh_dashboard()
         else:
             ttk.Label(chart_frame, text="Install matplotlib (pip install -r requirements.txt) to view dashboard charts.").pack(padx=10, pady=10)
 
-    def _refresh_dashboard(self):
+    def _refresh_dashboard(self, changed_ids=None):
         if not HAS_MATPLOTLIB:
             return
         # Respect optional report date range so dashboard charts match reports
@@ -2262,50 +2660,23 @@ class TMTLabsGUI:
         networth = assets - debts
         self.dashboard_networth_label.config(text=f"Net Worth: ${networth:,.2f}")
         # Expenses by category (filtered by date range if provided)
-        if start_dt is not None or end_dt is not None:
-            report_data = self._gather_report_data(start_dt, end_dt)
-            expenses = report_data.get('expenses', [])
-            incomes = report_data.get('income', [])
-        else:
-            expenses = self.data_manager.get_expenses()
-            incomes = self.data_manager.get_income()
-        cat_totals = defaultdict(float)
-        for e in expenses:
-            cat_totals[e.get('category', 'Uncategorized')] += float(e.get('amount', 0.0))
-
-        self.db_ax1.clear()
-        if cat_totals:
-            cats = list(cat_totals.keys())
-            vals = [cat_totals[c] for c in cats]
-            self.db_ax1.bar(cats, vals)
-            self.db_ax1.set_title('Expenses by Category')
-            self.db_ax1.tick_params(axis='x', rotation=45)
-        else:
-            self.db_ax1.text(0.5, 0.5, 'No expense data', ha='center')
-
-        # Income over time (by date) — uses same date range as expenses when provided
-        self.db_ax2.clear()
-        incomes_sorted = sorted(incomes, key=lambda x: x.get('date', ''))
-        if incomes_sorted:
-            dates = [i['date'] for i in incomes_sorted]
-            amounts = [float(i['amount']) for i in incomes_sorted]
-            # aggregate by date
-            date_totals = defaultdict(float)
-            for d, a in zip(dates, amounts):
-                date_totals[d] += a
-            sorted_dates = sorted(date_totals.keys())
-            vals = [date_totals[d] for d in sorted_dates]
-            self.db_ax2.plot(sorted_dates, vals, marker='o')
-            self.db_ax2.set_title('Income by Date')
-            self.db_ax2.tick_params(axis='x', rotation=45)
-        else:
-            self.db_ax2.text(0.5, 0.5, 'No income data', ha='center')
+        cat_totals = self.data_manager.rollup_totals('expenses', start_dt, end_dt)
+
+        cats = list(cat_totals.keys())
+        chart_status = [self.db_expense_bars.update(cats, [cat_totals[c] for c in cats])]
+
+        # Income over time (by date) — uses same date range as expenses when provided;
+        # per-day totals come from the date index's ordinals, so nothing is parsed here
+        daily = self.data_manager.daily_totals('income', start_dt, end_dt)
+        series = [('income', [datetime.fromordinal(day) for day, _ in daily], [total for _, total in daily],
+                   {'marker': 'o'})] if daily else []
+        chart_status.append(self.db_income_line.update(series))
 
         # Update dashboard income/expense totals and recent items
         try:
             # totals for displayed range
-            total_income = sum(float(i.get('amount', 0.0)) for i in incomes)
-            total_expenses = sum(float(e.get('amount', 0.0)) for e in expenses)
+            total_income = self.data_manager.rollup_total('income', start_dt, end_dt)
+            total_expenses = sum(cat_totals.values())
             self.dashboard_income_total_label.config(text=f"Total Income: ${total_income:,.2f}")
             self.dashboard_expense_total_label.config(text=f"Total Expenses: ${total_expenses:,.2f}")
             # balance display with sign and color
@@ -2322,30 +2693,15 @@ class TMTLabsGUI:
                 except Exception:
                     pass
 
-            # refresh recent incomes (most recent first)
-            for iid in list(self.income_report_tree.get_children()):
-                self.income_report_tree.delete(iid)
-            inc_recent = sorted(incomes, key=lambda x: x.get('date',''), reverse=True)[:5]
-            for inc in inc_recent:
-                try:
-                    self.income_report_tree.insert('', 'end', iid=inc.get('id'), values=(inc.get('id'), inc.get('date',''), inc.get('source',''), f"{float(inc.get('amount',0.0)):.2f}"))
-                except Exception:
-                    continue
-
-            # refresh recent expenses (most recent first)
-            for iid in list(self.expense_report_tree.get_children()):
-                self.expense_report_tree.delete(iid)
-            exp_recent = sorted(expenses, key=lambda x: x.get('date',''), reverse=True)[:5]
-            for ex in exp_recent:
-                try:
-                    self.expense_report_tree.insert('', 'end', iid=ex.get('id'), values=(ex.get('id'), ex.get('date',''), ex.get('category',''), f"{float(ex.get('amount',0.0)):.2f}"))
-                except Exception:
-                    continue
+            # refresh recent incomes and expenses (most recent first), read straight from the date index
+            recent_incomes = self.data_manager.range_view('income', start_dt, end_dt, newest_first=True)[:5]
+            recent_expenses = self.data_manager.range_view('expenses', start_dt, end_dt, newest_first=True)[:5]
+            self._income_report_sync.sync(recent_incomes, changed_ids)
+            self._expense_report_sync.sync(recent_expenses, changed_ids)
         except Exception:
             pass
 
-        self.dashboard_fig.tight_layout()
-        self.dashboard_canvas.draw()
+        self.dashboard_chart.commit(*chart_status)
 
     def _refresh_analysis_display(self):
         if not HAS_MATPLOTLIB:
@@ -2357,40 +2713,24 @@ class TMTLabsGUI:
         self.analysis_networth_label.config(text=f"Net Worth: ${networth:,.2f}")
 
         # Expenses by category pie
-        expenses = self.data_manager.get_expenses()
-        cat_totals = defaultdict(float)
-        for e in expenses:
-            cat_totals[e.get('category', 'Uncategorized')] += float(e.get('amount', 0.0))
-
-        self.analysis_ax1.clear()
-        if cat_totals:
-            cats = list(cat_totals.keys())
-            vals = [cat_totals[c] for c in cats]
-            self.analysis_ax1.pie(vals, labels=cats, autopct='%1.1f%%')
-            self.analysis_ax1.set_title('Expense Distribution')
-        else:
-            self.analysis_ax1.text(0.5, 0.5, 'No expense data', ha='center')
+        cat_totals = self.data_manager.rollup_totals('expenses')
+
+        cats = list(cat_totals.keys())
+        chart_status = [self.analysis_pie.update(cats, [cat_totals[c] for c in cats])]
 
         # Investment value chart (simple current vs purchase)
         investments = self.data_manager.get_investments()
-        self.analysis_ax2.clear()
-        if investments:
-            names = [inv['name'] for inv in investments]
-            current_vals = [inv.get('quantity', 0.0) * inv.get('current_price', 0.0) for inv in investments]
-            self.analysis_ax2.bar(names, current_vals)
-            self.analysis_ax2.set_title('Investments Current Value')
-            self.analysis_ax2.tick_params(axis='x', rotation=45)
-        else:
-            self.analysis_ax2.text(0.5, 0.5, 'No investments', ha='center')
+        names = [inv['name'] for inv in investments]
+        current_vals = [inv.get('quantity', 0.0) * inv.get('current_price', 0.0) for inv in investments]
+        chart_status.append(self.analysis_inv_bars.update(names, current_vals))
 
         # Update income/expense totals shown in the summary (respecting report date range if set)
         try:
             start_dt, end_dt = self._parse_date_range()
         except Exception:
             start_dt, end_dt = None, None
-        report = self._gather_report_data(start_dt, end_dt) if (start_dt or end_dt) else self._gather_report_data()
-        inc_total = sum(float(i.get('amount', 0.0)) for i in report.get('income', []))
-        exp_total = sum(float(e.get('amount', 0.0)) for e in report.get('expenses', []))
+        inc_total = self.data_manager.rollup_total('income', start_dt, end_dt)
+        exp_total = self.data_manager.rollup_total('expenses', start_dt, end_dt)
         balance = inc_total - exp_total
         try:
             self.analysis_income_total_label.config(text=f"Total Income (range): ${inc_total:,.2f}")
@@ -2407,15 +2747,10 @@ class TMTLabsGUI:
                 pass
 
         # Clear projection axis (projection drawn on-demand)
-        try:
-            if hasattr(self, 'analysis_ax3'):
-                self.analysis_ax3.clear()
-                self.analysis_ax3.text(0.5, 0.5, 'Click "Project Annual Trajectory"', ha='center')
-        except Exception:
-            pass
+        projection = self.analysis_projection
+        chart_status += [projection.set_labels(), projection.update([]), projection.set_note(None), projection.set_axis_color(None)]
+        self.analysis_chart.commit(*chart_status)
 
-        self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
     def _project_annual_trajectory(self):
         # Compute simple annual projection using recent income/expense averages
         try:
@@ -2426,46 +2761,19 @@ class TMTLabsGUI:
         incomes = data.get('income', [])
         expenses = data.get('expenses', [])
 
-        # Helper: determine months span
-        def months_span(items):
-            dates = [d.get('date') for d in items if d.get('date')]
-            parsed = []
-            for ds in dates:
-                try:
-                    parsed.append(datetime.strptime(ds, '%Y-%m-%d'))
-                except Exception:
-                    continue
-            if not parsed:
-                return 1
-            earliest = min(parsed)
-            latest = max(parsed)
-            span = (latest.year - earliest.year) * 12 + (latest.month - earliest.month) + 1
-            return max(1, span)
-
-        # Apply rolling 12-month window (exclude future entries) and optional exclusion of non-recurring items
+        # Apply rolling 12-month window (exclude future entries) and optional exclusion of non-recurring items.
+        # The window is intersected with the report range and read straight from the date index.
         now = datetime.now()
         window_start = now - timedelta(days=365)
-
-        def _parse_date(item):
-            ds = item.get('date')
-            if not ds:
-                return None
-            try:
-                return datetime.strptime(ds, '%Y-%m-%d')
-            except Exception:
-                return None
-
-        incomes_window = []
-        for i in incomes:
-            d = _parse_date(i)
-            if d and window_start <= d <= now:
-                incomes_window.append(i)
-
-        expenses_window = []
-        for e in expenses:
-            d = _parse_date(e)
-            if d and window_start <= d <= now:
-                expenses_window.append(e)
+        if start_dt and start_dt > window_start:
+            window_start = start_dt
+        window_end = min(now, end_dt) if end_dt else now
+        if window_start <= window_end:
+            incomes_window = self.data_manager.query_range('income', window_start, window_end, include_undated=False)
+            expenses_window = self.data_manager.query_range('expenses', window_start, window_end, include_undated=False)
+        else:
+            incomes_window = []
+            expenses_window = []
 
         # Optionally exclude non-recurring items based on simple heuristics
         def _is_recurring(item):
@@ -2513,32 +2821,28 @@ class TMTLabsGUI:
             cum += monthly_net
             proj.append(cum)
 
-        # Plot on analysis_ax3
+        # Plot on the analysis projection panel
         if not HAS_MATPLOTLIB:
             messagebox.showerror('Missing Dependency', 'Install matplotlib to view projections.')
             return
         try:
-            if not hasattr(self, 'analysis_ax3'):
+            if not hasattr(self, 'analysis_projection'):
                 return
-            self.analysis_ax3.clear()
+            chart = self.analysis_projection
             # Choose color based on monthly net (green for positive, red for negative, black for neutral)
             line_color = 'green' if monthly_net > 0 else ('red' if monthly_net < 0 else 'black')
-            self.analysis_ax3.plot(months, proj, marker='o', color=line_color, markerfacecolor=line_color)
-            self.analysis_ax3.set_title('Projected Net Worth (12 months)')
-            self.analysis_ax3.set_xlabel('Months Ahead')
-            self.analysis_ax3.set_ylabel('Net Worth ($)')
-            # Tint y-axis and left spine to match projection color for visual cue
-            try:
-                self.analysis_ax3.tick_params(axis='y', colors=line_color)
-                self.analysis_ax3.spines['left'].set_color(line_color)
-            except Exception:
-                pass
+            style = {'marker': 'o', 'color': line_color, 'markerfacecolor': line_color}
+            chart_status = [
+                chart.set_labels('Projected Net Worth (12 months)', 'Months Ahead', 'Net Worth ($)'),
+                chart.update([('projection', months, proj, style)]),
+                # Tint y-axis and left spine to match projection color for visual cue
+                chart.set_axis_color(line_color),
+            ]
             # Annotate expected end-of-year change
             if proj:
                 delta = proj[-1] - proj[0]
-                self.analysis_ax3.annotate(f"Δ ${delta:,.2f}", xy=(12, proj[-1]), xytext=(8, proj[-1]), arrowprops=dict(arrowstyle='->', color=line_color), color=line_color)
-            self.analysis_fig.tight_layout()
-            self.analysis_canvas.draw()
+                chart_status.append(chart.set_note(f"Δ ${delta:,.2f}", xy=(12, proj[-1]), xytext=(8, proj[-1]), color=line_color))
+            self.analysis_chart.commit(*chart_status)
             # Also update summary labels with annualized projections
             annual_inc = avg_monthly_inc * 12
             annual_exp = avg_monthly_exp * 12
@@ -0,0 +1,374 @@
+"""Matplotlib charts that keep their artists between refreshes.
+
+Each chart owns one Axes and updates its bars, lines, wedges or image in place. update()
+reports how much of the figure has to be redrawn:
+
+* BLIT    - only data artists changed; they are redrawn over a cached background
+* REDRAW  - axis limits or ticks changed; the figure is redrawn (no layout pass)
+* LAYOUT  - labels changed; tight_layout() runs before the redraw
+
+ChartFigure.commit() takes the results of a refresh and does the cheapest redraw that
+covers them. This module imports matplotlib, so import it only where a chart is built.
+"""
+import math
+
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+BLIT, REDRAW, LAYOUT = 0, 1, 2
+
+
+class BlitManager:
+    """Draws a figure's animated artists over a background cached after each full draw."""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.artists = []
+        self._background = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add(self, artist):
+        artist.set_animated(True)
+        self.artists.append(artist)
+        return artist
+
+    def discard(self, artists):
+        gone = {id(a) for a in artists}
+        self.artists = [a for a in self.artists if id(a) not in gone]
+
+    @property
+    def ready(self):
+        return self._background is not None
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        figure = self.canvas.figure
+        for artist in self.artists:
+            if artist.get_visible() and artist.axes is not None:
+                figure.draw_artist(artist)
+
+    def update(self):
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+class Chart:
+    def __init__(self, ax, blitter, title='', empty_text='No data'):
+        self.ax = ax
+        self.blitter = blitter
+        self._labels = (None, None, None)
+        self.set_labels(title)
+        self._empty = blitter.add(ax.text(0.5, 0.5, empty_text, ha='center', va='center',
+                                          transform=ax.transAxes, visible=False))
+
+    def set_labels(self, title=None, xlabel=None, ylabel=None):
+        """Set title/axis labels; LAYOUT if any of them changed."""
+        labels = (title, xlabel, ylabel)
+        if labels == self._labels:
+            return BLIT
+        self._labels = labels
+        self.ax.set_title(title or '')
+        self.ax.set_xlabel(xlabel or '')
+        self.ax.set_ylabel(ylabel or '')
+        return LAYOUT
+
+    def _set_empty(self, empty, text=None):
+        if text is not None:
+            self._empty.set_text(text)
+        self._empty.set_visible(empty)
+
+    def _fit_y(self, values):
+        # Only move the y limits when the data leaves them or shrinks below half,
+        # so most updates keep the cached axes and ticks
+        low = min([0.0] + values)
+        high = max([0.0] + values)
+        cur_low, cur_high = self.ax.get_ylim()
+        span = (high - low) or 1.0
+        if low < cur_low or high > cur_high or (high - low) < 0.5 * (cur_high - cur_low):
+            self.ax.set_ylim(low - 0.05 * span if low < 0 else 0.0, high + 0.1 * span)
+            return REDRAW
+        return BLIT
+
+
+class BarChart(Chart):
+    def __init__(self, ax, blitter, title='', empty_text='No data', rotation=45):
+        super().__init__(ax, blitter, title, empty_text)
+        self.rotation = rotation
+        self._bars = []
+        self._categories = None
+
+    def update(self, categories, values):
+        categories = [str(c) for c in categories]
+        values = [float(v) for v in values]
+        status = BLIT
+        if categories != self._categories:
+            for bar in self._bars:
+                bar.remove()
+            self.blitter.discard(self._bars)
+            positions = list(range(len(categories)))
+            self._bars = [self.blitter.add(bar) for bar in self.ax.bar(positions, values)] if categories else []
+            self.ax.set_xticks(positions)
+            self.ax.set_xticklabels(categories, rotation=self.rotation, ha='right' if self.rotation else 'center')
+            self.ax.set_xlim(-0.5, max(len(categories), 1) - 0.5)
+            self._categories = categories
+            status = LAYOUT
+        else:
+            for bar, value in zip(self._bars, values):
+                bar.set_height(value)
+        self._set_empty(not categories)
+        return max(status, self._fit_y(values))
+
+
+class LineChart(Chart):
+    """One or more line series; with dates=True the x values are dates."""
+
+    def __init__(self, ax, blitter, title='', empty_text='No data', dates=False, rotation=0):
+        super().__init__(ax, blitter, title, empty_text)
+        self.dates = dates
+        self.lines = []
+        self._series = None
+        self._legend = None
+        self._note = None
+        self._axis_color = None
+        self._bands = []
+        self._band_ys = []
+        if dates:
+            self.ax.xaxis_date()
+        if rotation:
+            self.ax.tick_params(axis='x', rotation=rotation)
+
+    def update(self, series, legend=False):
+        """series: list of (label, xs, ys, style dict); an empty list shows the empty text."""
+        names = [s[0] for s in series]
+        status = BLIT
+        if names != self._series:
+            for line in self.lines:
+                line.remove()
+            self.blitter.discard(self.lines)
+            self.lines = [self.blitter.add(self.ax.plot([], [], label=name)[0]) for name in names]
+            if self._legend is not None:
+                self._legend.remove()
+                self._legend = None
+            self._series = names
+            status = LAYOUT
+        xs_all, ys_all = [], []
+        for line, (name, xs, ys, *style) in zip(self.lines, series):
+            xs = mdates.date2num(list(xs)) if self.dates and len(xs) else list(xs)
+            ys = [float(y) for y in ys]
+            line.set_data(xs, ys)
+            for key, value in (style[0] if style else {}).items():
+                getattr(line, f'set_{key}')(value)
+            xs_all.extend(xs)
+            ys_all.extend(ys)
+        if status == LAYOUT and legend and names:
+            # After the styles are applied, so the legend shows them
+            self._legend = self.ax.legend()
+        self._set_empty(not xs_all)
+        if xs_all:
+            status = max(status, self._fit_x(min(xs_all), max(xs_all)), self._fit_y(ys_all + self._band_ys))
+        return status
+
+    def set_bands(self, xs, bands):
+        """Shaded ranges behind the lines, such as percentile fans; call before update() so
+        the y limits cover them. bands: list of (label, lows, highs, style dict) over the
+        shared xs; an empty list removes them. The fills are rebuilt each time (REDRAW)."""
+        if not bands and not self._bands:
+            return BLIT
+        for band in self._bands:
+            band.remove()
+        xs = mdates.date2num(list(xs)) if self.dates and len(xs) else list(xs)
+        self._bands, self._band_ys = [], []
+        # fill_between autoscales; keep the limits so _fit_x/_fit_y stay in charge of them
+        limits = self.ax.get_xlim(), self.ax.get_ylim()
+        for label, lows, highs, *style in bands:
+            lows = [float(y) for y in lows]
+            highs = [float(y) for y in highs]
+            self._bands.append(self.ax.fill_between(xs, lows, highs, label=label, linewidth=0,
+                                                    **(style[0] if style else {})))
+            self._band_ys.extend(lows + highs)
+        self.ax.set_xlim(*limits[0])
+        self.ax.set_ylim(*limits[1])
+        # The legend refers to the old fills; have the next update() rebuild it with its lines
+        self._series = None
+        return REDRAW
+
+    def set_note(self, text, xy=None, xytext=None, color=None):
+        """Show an arrow annotation (text=None hides it); the artist is reused."""
+        if text is None:
+            if self._note is not None:
+                self._note.set_visible(False)
+            return BLIT
+        if self._note is None:
+            self._note = self.blitter.add(self.ax.annotate(text, xy=xy, xytext=xytext,
+                                                           arrowprops=dict(arrowstyle='->')))
+        self._note.set_text(text)
+        self._note.xy = xy
+        self._note.set_position(xytext)
+        if color is not None:
+            self._note.set_color(color)
+            self._note.arrow_patch.set_color(color)
+        self._note.set_visible(True)
+        return BLIT
+
+    def set_axis_color(self, color):
+        """Tint the y ticks and left spine; REDRAW when the colour changes."""
+        if color == self._axis_color:
+            return BLIT
+        self._axis_color = color
+        self.ax.tick_params(axis='y', colors=color or 'black')
+        self.ax.spines['left'].set_color(color or 'black')
+        return REDRAW
+
+    def _fit_x(self, low, high):
+        pad = (high - low) * 0.03 or (1.0 if self.dates else 0.5)
+        limits = (low - pad, high + pad)
+        if any(not math.isclose(a, b) for a, b in zip(limits, self.ax.get_xlim())):
+            self.ax.set_xlim(*limits)
+            return REDRAW
+        return BLIT
+
+
+class PieChart(Chart):
+    """Pie with percentage labels; wedges are re-angled in place while the categories stay the same."""
+
+    def __init__(self, ax, blitter, title='', empty_text='No data'):
+        super().__init__(ax, blitter, title, empty_text)
+        self._wedges, self._texts, self._autotexts = [], [], []
+        self._categories = None
+        ax.set_aspect('equal')
+        ax.set_xlim(-1.25, 1.25)
+        ax.set_ylim(-1.25, 1.25)
+        ax.set_axis_off()
+
+    def update(self, categories, values):
+        categories = [str(c) for c in categories]
+        values = [max(0.0, float(v)) for v in values]
+        total = sum(values)
+        if not categories or total <= 0:
+            status = self._clear() if self._categories else BLIT
+            self._categories = None
+            self._set_empty(True)
+            return status
+        self._set_empty(False)
+        if categories != self._categories:
+            self._clear()
+            self._wedges, self._texts, self._autotexts = self.ax.pie(values, labels=categories, autopct='%1.1f%%')
+            for artist in self._wedges + self._texts + self._autotexts:
+                self.blitter.add(artist)
+            self.ax.set_xlim(-1.25, 1.25)
+            self.ax.set_ylim(-1.25, 1.25)
+            self._categories = categories
+            return LAYOUT
+        # Same categories: move the wedges and their labels the way Axes.pie lays them out
+        theta = 0.0
+        for wedge, text, autotext, value in zip(self._wedges, self._texts, self._autotexts, values):
+            frac = value / total
+            wedge.set_theta1(360.0 * theta)
+            wedge.set_theta2(360.0 * (theta + frac))
+            middle = 2 * math.pi * (theta + frac / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            text.set_position((1.1 * x, 1.1 * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_position((0.6 * x, 0.6 * y))
+            autotext.set_text(f'{100.0 * frac:.1f}%')
+            theta += frac
+        return BLIT
+
+    def _clear(self):
+        artists = self._wedges + self._texts + self._autotexts
+        for artist in artists:
+            artist.remove()
+        self.blitter.discard(artists)
+        self._wedges, self._texts, self._autotexts = [], [], []
+        return LAYOUT
+
+
+class HeatmapChart(Chart):
+    """Values over a regular x/y grid as a colour image with a colour bar. The image is
+    reused; only its data, extent and colour scale change."""
+
+    def __init__(self, ax, blitter, title='', empty_text='No data', cmap='viridis', value_label=''):
+        super().__init__(ax, blitter, title, empty_text)
+        self.cmap = cmap
+        self.value_label = value_label
+        self._image = None
+        self._colorbar = None
+        self._extent = None
+
+    def update(self, xs, ys, values, limits=None):
+        """values: rows follow ys and columns xs (both evenly spaced, ascending). limits
+        fixes the colour scale (low, high); by default it spans values."""
+        xs = [float(x) for x in xs]
+        ys = [float(y) for y in ys]
+        if not xs or not ys:
+            if self._image is not None:
+                self._image.set_visible(False)
+            self._set_empty(True)
+            return BLIT
+        self._set_empty(False)
+        extent = (*self._edges(xs), *self._edges(ys))
+        status = BLIT
+        if self._image is None:
+            self._image = self.blitter.add(self.ax.imshow(values, origin='lower', aspect='auto', extent=extent,
+                                                          cmap=self.cmap, interpolation='nearest'))
+            if limits is not None:
+                self._image.set_clim(*limits)
+            self._colorbar = self.ax.figure.colorbar(self._image, ax=self.ax)
+            self._colorbar.set_label(self.value_label)
+            self._extent = extent
+            return LAYOUT
+        self._image.set_visible(True)
+        self._image.set_data(values)
+        if extent != self._extent:
+            self._image.set_extent(extent)
+            self._extent = extent
+            status = REDRAW
+        low, high = limits if limits is not None else (values.min(), values.max())
+        low, high = float(low), float(high)
+        if (low, high) != tuple(self._image.get_clim()):
+            # The colour bar has to be redrawn with the new scale
+            self._image.set_clim(low, high)
+            status = REDRAW
+        return status
+
+    @staticmethod
+    def _edges(centres):
+        step = (centres[-1] - centres[0]) / (len(centres) - 1) if len(centres) > 1 else 1.0
+        return centres[0] - step / 2, centres[-1] + step / 2
+
+
+class ChartFigure:
+    """A Figure on a Tk canvas holding persistent charts."""
+
+    def __init__(self, master, figsize, dpi=100):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self.blitter = BlitManager(self.canvas)
+
+    def bar_chart(self, position, **kw):
+        return BarChart(self.figure.add_subplot(position), self.blitter, **kw)
+
+    def line_chart(self, position, **kw):
+        return LineChart(self.figure.add_subplot(position), self.blitter, **kw)
+
+    def pie_chart(self, position, **kw):
+        return PieChart(self.figure.add_subplot(position), self.blitter, **kw)
+
+    def heatmap_chart(self, position, **kw):
+        return HeatmapChart(self.figure.add_subplot(position), self.blitter, **kw)
+
+    def commit(self, *statuses):
+        """Redraw just enough to show the updates that returned these statuses."""
+        status = max(statuses, default=BLIT)
+        if status >= LAYOUT:
+            self.figure.tight_layout()
+        if status >= REDRAW or not self.blitter.ready:
+            self.canvas.draw_idle()
+        else:
+            self.blitter.update()
@@ -0,0 +1,119 @@
+import queue
+import threading
+import time
+
+from exporters import ExportCancelled
+
+
+class ExportJob:
+    """One queued export. run(job) does the work on the worker thread and calls job.step()."""
+
+    # Progress is posted to the Tk thread at most this often (the last step always goes through)
+    PROGRESS_INTERVAL = 0.05
+
+    def __init__(self, name, run, updates):
+        self.name = name
+        self.run = run
+        self._updates = updates
+        self._cancel = threading.Event()
+        self._last_post = 0.0
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def step(self, done, total, message=''):
+        if self._cancel.is_set():
+            raise ExportCancelled()
+        now = time.monotonic()
+        if done >= total or now - self._last_post >= self.PROGRESS_INTERVAL:
+            self._last_post = now
+            self._updates.put(('progress', self, (done, total, message)))
+
+
+class ExportQueue:
+    """Runs export jobs one at a time on a background thread.
+
+    The worker never touches Tk: it posts progress and results to a queue that the
+    Tk thread drains with after() while jobs are pending. on_progress(job, done, total,
+    message) and on_finish(job, outcome, result) are called on the Tk thread, with outcome
+    'done' (result is run()'s return value), 'cancelled' or 'failed' (result is the exception).
+    """
+
+    def __init__(self, widget, on_progress, on_finish, poll_ms=100):
+        self.widget = widget
+        self.on_progress = on_progress
+        self.on_finish = on_finish
+        self.poll_ms = poll_ms
+        self._jobs = queue.Queue()
+        self._updates = queue.Queue()
+        self._pending = []   # submitted and not yet finished, oldest first
+        self._worker = None
+        self._poll_id = None
+
+    @property
+    def pending(self):
+        return list(self._pending)
+
+    @property
+    def current(self):
+        return self._pending[0] if self._pending else None
+
+    def submit(self, name, run):
+        job = ExportJob(name, run, self._updates)
+        self._pending.append(job)
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._work, name='export-worker', daemon=True)
+            self._worker.start()
+        self._jobs.put(job)
+        self._schedule_poll()
+        return job
+
+    def cancel_current(self):
+        if self._pending:
+            self._pending[0].cancel()
+
+    def cancel_all(self):
+        for job in self._pending:
+            job.cancel()
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job.cancelled:
+                self._updates.put(('cancelled', job, None))
+                continue
+            try:
+                result = job.run(job)
+            except ExportCancelled:
+                self._updates.put(('cancelled', job, None))
+            except Exception as e:
+                self._updates.put(('failed', job, e))
+            else:
+                self._updates.put(('done', job, result))
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        while True:
+            try:
+                kind, job, payload = self._updates.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                self.on_progress(job, *payload)
+                continue
+            if job in self._pending:
+                self._pending.remove(job)
+            try:
+                self.on_finish(job, kind, payload)
+            except Exception as e:
+                print(f"Export result handler failed: {e}")
+        if self._pending:
+            self._schedule_poll()
@@ -0,0 +1,117 @@
+from bisect import bisect_left
+
+
+# Above this many out-of-place rows, placing every row in order is cheaper than
+# locating each moved row's neighbour
+_MAX_TARGETED_MOVES = 32
+
+
+def _stable_positions(positions):
+    """Indexes into positions of a longest increasing run (rows that can stay put)."""
+    tail_index = []
+    tail_value = []
+    previous = []
+    for i, pos in enumerate(positions):
+        k = bisect_left(tail_value, pos)
+        previous.append(tail_index[k - 1] if k else -1)
+        if k == len(tail_value):
+            tail_index.append(i)
+            tail_value.append(pos)
+        else:
+            tail_index[k] = i
+            tail_value[k] = pos
+    keep = set()
+    i = tail_index[-1] if tail_index else -1
+    while i != -1:
+        keep.add(i)
+        i = previous[i]
+    return keep
+
+
+class TreeviewSync:
+    """Keeps a flat ttk.Treeview in step with an ordered list of records, keyed by record id.
+
+    sync() works out the difference from what the tree already shows and applies only
+    that: deletes, inserts, value updates and the fewest moves needed to fix the order.
+    Rows keep their Tk selection, and with keep_scroll the row at the top of the view
+    stays there. Pass changed_ids (e.g. from DataManager change events) to re-format only
+    those rows; with None every row is re-formatted and compared.
+    """
+
+    def __init__(self, tree, row_values, keep_scroll=True):
+        self.tree = tree
+        self.row_values = row_values
+        self.keep_scroll = keep_scroll
+        self._order = []     # iids in tree order
+        self._values = {}    # iid -> values last written
+
+    def sync(self, records, changed_ids=None):
+        tree = self.tree
+        records = list(records)
+        new_order = [str(r['id']) for r in records]
+        new_set = set(new_order)
+
+        anchor = None
+        if self.keep_scroll and self._order:
+            top = int(round(tree.yview()[0] * len(self._order)))
+            if top < len(self._order):
+                anchor = self._order[top]
+
+        gone = [iid for iid in self._order if iid not in new_set]
+        if gone:
+            tree.delete(*gone)
+            for iid in gone:
+                del self._values[iid]
+            current = [iid for iid in self._order if iid in new_set]
+        else:
+            current = list(self._order)
+
+        # Values: new rows are always formatted; existing ones only when they may have changed
+        changed = None if changed_ids is None else {str(i) for i in changed_ids}
+        for iid, record in zip(new_order, records):
+            if iid in self._values and (changed is None or iid in changed):
+                values = tuple(self.row_values(record))
+                if values != self._values[iid]:
+                    tree.item(iid, values=values)
+                    self._values[iid] = values
+
+        # Order: rows on a longest increasing run of old positions stay, the rest move or are inserted
+        old_pos = {iid: i for i, iid in enumerate(current)}
+        survivors = [i for i, iid in enumerate(new_order) if iid in old_pos]
+        stable = {survivors[k] for k in _stable_positions([old_pos[new_order[i]] for i in survivors])}
+        if len(new_order) - len(stable) > _MAX_TARGETED_MOVES:
+            # Walking the new order and placing each row at its index is correct by induction
+            for i, iid in enumerate(new_order):
+                self._place(iid, records[i], i)
+        else:
+            for i, iid in enumerate(new_order):
+                if i in stable:
+                    continue
+                if iid in old_pos:
+                    current.remove(iid)
+                index = current.index(new_order[i - 1]) + 1 if i else 0
+                current.insert(index, iid)
+                self._place(iid, records[i], index)
+        self._order = new_order
+
+        if anchor is not None and new_order:
+            try:
+                top = new_order.index(anchor)
+            except ValueError:
+                top = None
+            if top is not None:
+                tree.yview_moveto(top / len(new_order))
+
+    def _place(self, iid, record, index):
+        if iid in self._values:
+            self.tree.move(iid, '', index)
+        else:
+            values = tuple(self.row_values(record))
+            self.tree.insert('', index, iid=iid, values=values)
+            self._values[iid] = values
+
+    def clear(self):
+        if self._order:
+            self.tree.delete(*self._order)
+        self._order = []
+        self._values = {}
@@ -0,0 +1,263 @@
+import tkinter as tk
+from tkinter import ttk
+
+from gui_modules.tree_sync import TreeviewSync
+
+
+def _sort_key(value):
+    # Numbers (including formatted amounts) sort numerically, everything else as text
+    try:
+        return (0, float(str(value).replace(',', '')), '')
+    except ValueError:
+        return (1, 0.0, str(value).lower())
+
+
+class VirtualTreeview(ttk.Treeview):
+    """Treeview that only creates Tk items for the rows in view.
+
+    Rows are handed over as an ordered sequence of records with set_rows(); row_values(record)
+    formats one row and record['id'] becomes its iid. Only the visible page plus a few
+    overscan rows exist as Tk items; scrolling, sorting (click a heading) and filtering
+    (set_filter) rearrange the record list in Python and re-materialize just that page.
+    A sequence with an index_of(iid) method, such as DataManager.range_view(), is shown
+    without being copied until a sort or filter needs the whole list.
+
+    Used like a plain Treeview: pack/heading/column/bind/identify_row/item behave as usual,
+    yview drives a scrollbar over the whole list and focus() keeps returning the selected
+    record's iid after it scrolls out of the page.
+    """
+
+    def __init__(self, master, row_values, overscan=5, **kw):
+        self._yscrollcommand = kw.pop('yscrollcommand', None)
+        super().__init__(master, **kw)
+        self._row_values = row_values
+        self._overscan = overscan
+        self._page = int(kw.get('height', 10))
+        self._source = []     # records as given to set_rows
+        self._rows = []       # after filter and sort
+        self._position = {}   # iid -> index in self._rows (None: ask self._rows.index_of)
+        self._shown = []      # iids currently materialized, top to bottom
+        self._first = 0
+        self._selected = None
+        self._sort_column = None
+        self._sort_reverse = False
+        self._filter = ''
+        self._search_text = {}
+        self._headings = {}
+        # The visible page is kept in step by id, so a scroll or an edit touches only the rows that differ
+        self._sync = TreeviewSync(self, row_values, keep_scroll=False)
+        self._dirty = ()
+        for column in self['columns']:
+            super().heading(column, command=lambda c=column: self.sort_by(c))
+
+        self.bind('<Configure>', self._on_configure, add='+')
+        self.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        self.bind('<MouseWheel>', lambda e: self._scroll_lines(-1 if e.delta > 0 else 1))
+        self.bind('<Button-4>', lambda e: self._scroll_lines(-1))
+        self.bind('<Button-5>', lambda e: self._scroll_lines(1))
+        self.bind('<Up>', lambda e: self._move_selection(-1))
+        self.bind('<Down>', lambda e: self._move_selection(1))
+        self.bind('<Prior>', lambda e: self._move_selection(-self._page))
+        self.bind('<Next>', lambda e: self._move_selection(self._page))
+        self.bind('<Home>', lambda e: self._move_selection(-len(self._rows)))
+        self.bind('<End>', lambda e: self._move_selection(len(self._rows)))
+
+    # --- data -------------------------------------------------------------
+
+    def set_rows(self, records, changed_ids=None):
+        """Replace the displayed records, keeping sort, filter, scroll position and selection.
+
+        records is any iterable of records; a sequence with index_of(iid) is kept as it
+        is rather than copied. changed_ids limits re-formatting of rows already on the
+        page to those ids (None re-formats the page).
+        """
+        self._source = records if hasattr(records, 'index_of') else list(records)
+        if changed_ids is None:
+            self._search_text = {}
+            self._dirty = None
+        else:
+            for item_id in changed_ids:
+                self._search_text.pop(str(item_id), None)
+            self._dirty = changed_ids
+        self._apply_view()
+
+    def set_filter(self, text):
+        """Show only rows whose formatted values contain text (case-insensitive)."""
+        self._filter = (text or '').strip().lower()
+        self._first = 0
+        self._apply_view()
+
+    def sort_by(self, column, reverse=None):
+        """Sort by a column; clicking the same heading again reverses the order."""
+        if reverse is None:
+            reverse = not self._sort_reverse if column == self._sort_column else False
+        self._sort_column = column
+        self._sort_reverse = reverse
+        for col in self['columns']:
+            text = self._headings.setdefault(col, super().heading(col, 'text'))
+            if col == column:
+                text += ' ▼' if reverse else ' ▲'
+            super().heading(col, text=text)
+        self._apply_view()
+
+    def heading(self, column, option=None, **kw):
+        # Remember the plain heading text so the sort arrow can be added and removed
+        if 'text' in kw:
+            self._headings[column] = kw['text']
+        return super().heading(column, option, **kw)
+
+    def row_count(self):
+        return len(self._rows)
+
+    def _apply_view(self):
+        rows = self._source
+        if self._filter:
+            needle = self._filter
+            rows = [r for r in rows if needle in self._text_of(r)]
+        if self._sort_column is not None:
+            index = list(self['columns']).index(self._sort_column)
+            rows = sorted(rows, key=lambda r: _sort_key(self._row_values(r)[index]), reverse=self._sort_reverse)
+        elif rows is self._source and not hasattr(rows, 'index_of'):
+            rows = list(rows)
+        self._rows = rows
+        self._position = None if hasattr(rows, 'index_of') else {str(r['id']): i for i, r in enumerate(rows)}
+        if self._selected is not None and self._index_of(self._selected) is None:
+            self._selected = None
+        self._render()
+
+    def _index_of(self, iid):
+        if self._position is None:
+            return self._rows.index_of(iid)
+        return self._position.get(iid)
+
+    def _text_of(self, record):
+        key = str(record['id'])
+        text = self._search_text.get(key)
+        if text is None:
+            text = ' '.join(str(v) for v in self._row_values(record)).lower()
+            self._search_text[key] = text
+        return text
+
+    # --- rendering --------------------------------------------------------
+
+    def _render(self):
+        self._first = max(0, min(self._first, len(self._rows) - self._page))
+        window = self._rows[self._first:self._first + self._page + self._overscan]
+        self._sync.sync(window, changed_ids=self._dirty)
+        self._dirty = ()
+        wanted = [str(r['id']) for r in window]
+        wanted_set = set(wanted)
+        self._shown = wanted
+        # Keep Tk's own view pinned to the top: scrolling is done by re-materializing
+        super().yview_moveto(0)
+        if self._selected in wanted_set and self._selected not in super().selection():
+            super().selection_set(self._selected)
+            super().focus(self._selected)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        if self._yscrollcommand is not None:
+            first, last = self.yview()
+            self._yscrollcommand(first, last)
+
+    def _on_configure(self, event):
+        style = ttk.Style(self)
+        try:
+            row_height = int(style.lookup(self.cget('style') or 'Treeview', 'rowheight') or 20)
+        except (tk.TclError, ValueError):
+            row_height = 20
+        heading_height = row_height + 4 if 'headings' in str(self.cget('show')) else 0
+        page = max(1, (event.height - heading_height) // row_height)
+        if page != self._page:
+            self._page = page
+            self._render()
+
+    # --- scrolling and selection -----------------------------------------
+
+    def yview(self, *args):
+        total = len(self._rows)
+        if not args:
+            if not total:
+                return (0.0, 1.0)
+            return (self._first / total, min(1.0, (self._first + self._page) / total))
+        if args[0] == 'moveto':
+            self._first = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = self._page if args[2] == 'pages' else 1
+            self._first += int(args[1]) * step
+        self._render()
+
+    def yview_moveto(self, fraction):
+        self.yview('moveto', fraction)
+
+    def yview_scroll(self, number, what):
+        self.yview('scroll', number, what)
+
+    def configure(self, cnf=None, **kw):
+        if 'yscrollcommand' in kw:
+            # The scrollbar tracks the whole record list, not Tk's page of items
+            self._yscrollcommand = kw.pop('yscrollcommand')
+            self._update_scrollbar()
+            if not kw and not cnf:
+                return None
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def see(self, item):
+        index = self._index_of(str(item))
+        if index is None:
+            return super().see(item)
+        if index < self._first:
+            self._first = index
+        elif index >= self._first + self._page:
+            self._first = index - self._page + 1
+        self._render()
+
+    def focus(self, item=None):
+        if item is None:
+            return super().focus() or (self._selected or '')
+        item = str(item)
+        self._selected = item if self._index_of(item) is not None else self._selected
+        self.see(item)
+        if item in self._shown:
+            super().focus(item)
+        return None
+
+    def selection_set(self, *items):
+        if len(items) == 1 and isinstance(items[0], (list, tuple)):
+            items = items[0]
+        items = [str(i) for i in items]
+        if items and self._index_of(items[0]) is not None:
+            self._selected = items[0]
+            self.see(items[0])
+        shown = [i for i in items if i in self._shown]
+        if shown:
+            super().selection_set(shown)
+
+    def _on_select(self, event=None):
+        selection = super().selection()
+        if selection:
+            self._selected = selection[0]
+        elif self._selected in self._shown:
+            # Deselected while visible; a row that merely scrolled away stays selected
+            self._selected = None
+
+    def _scroll_lines(self, count):
+        self.yview('scroll', count * 3, 'units')
+        return 'break'
+
+    def _move_selection(self, delta):
+        if not self._rows:
+            return 'break'
+        index = None if self._selected is None else self._index_of(self._selected)
+        if index is None:
+            index = self._first if delta > 0 else min(len(self._rows), self._first + self._page)
+            delta = 0 if delta > 0 else -1
+        index = max(0, min(len(self._rows) - 1, index + delta))
+        iid = str(self._rows[index]['id'])
+        self._selected = iid
+        self.see(iid)
+        super().selection_set(iid)
+        super().focus(iid)
+        return 'break'
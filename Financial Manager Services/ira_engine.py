@@ -0,0 +1,60 @@
+"""Closed-form IRA projections and what-if grids.
+
+The IRA tab's model: the balance earns the annual rate R once a year, and each year's
+contribution is paid in twelve monthly instalments that earn R/12 a month until the
+year end. One year's contributions are therefore worth a fixed A at each year end, and
+after n years
+    balance = P (1 + R)^n + A ((1 + R)^n - 1) / R        (P + A n when R = 0)
+so a projection is a handful of arithmetic operations rather than a loop over years,
+and sweep() evaluates it for every contribution x rate x retirement age at once.
+"""
+from collections import namedtuple
+
+# balance at retirement, total contributed and the growth on top of both
+IraProjection = namedtuple("IraProjection", "balance contributions interest")
+
+# The axes of the grid and balances shaped (contributions, rates, retirement_ages)
+SweepGrid = namedtuple("SweepGrid", "contributions rates retirement_ages balances")
+
+
+def year_end_contributions(annual_contribution, annual_rate):
+    """Value at the year end of annual_contribution paid monthly."""
+    monthly_rate = annual_rate / 12
+    if monthly_rate == 0:
+        return annual_contribution
+    return annual_contribution / 12 * ((1 + monthly_rate) ** 12 - 1) / monthly_rate
+
+
+def project(balance, annual_contribution, annual_rate, years) -> IraProjection:
+    """Projection after years whole years; annual_rate is a fraction (0.07 = 7%)."""
+    growth = (1 + annual_rate) ** years
+    annuity = years if annual_rate == 0 else (growth - 1) / annual_rate
+    final = balance * growth + year_end_contributions(annual_contribution, annual_rate) * annuity
+    contributions = annual_contribution * years
+    return IraProjection(final, contributions, final - balance - contributions)
+
+
+def sweep(balance, current_age, contributions, rates, retirement_ages) -> SweepGrid:
+    """Projected balances for every combination of the given annual contributions,
+    annual rates (fractions) and retirement ages, in one broadcast evaluation."""
+    import numpy as np
+
+    contributions = np.asarray(contributions, dtype=float)
+    rates = np.asarray(rates, dtype=float)
+    retirement_ages = np.asarray(retirement_ages)
+    years = (retirement_ages - current_age).astype(float)
+    if np.any(years <= 0):
+        raise ValueError("Retirement ages must be greater than the current age.")
+    if np.any(rates <= -1):
+        raise ValueError("Rates must be greater than -100%.")
+
+    rate = rates[None, :, None]
+    n = years[None, None, :]
+    zero = rate == 0
+    safe_rate = np.where(zero, 1.0, rate)
+    growth = (1 + rate) ** n
+    annuity = np.where(zero, n, (growth - 1) / safe_rate)
+    monthly = safe_rate / 12
+    per_dollar = np.where(zero, 1.0, ((1 + monthly) ** 12 - 1) / (12 * monthly))
+    balances = balance * growth + contributions[:, None, None] * per_dollar * annuity
+    return SweepGrid(contributions, rates, retirement_ages, balances)
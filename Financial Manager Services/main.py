@@ -1,22 +1,41 @@
+import time
+_STARTED = time.perf_counter()
+
+import argparse
 import tkinter as tk
-from data_manager import DataManager
+from data_manager import STORAGE_MODES, DataManager
 from gui import TMTLabsGUI
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="TMTlabs Financial Manager")
+    parser.add_argument("--storage", choices=STORAGE_MODES, default="json",
+                        help="how data is saved: one JSON file (default), JSON plus a change journal, or SQLite")
+    parser.add_argument("--data-file", default="moneymind_data.json",
+                        help="data file; SQLite storage uses a .db file next to it")
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args()
+    # Startup milestones; the GUI adds its own and prints the timing report once interactive
+    startup_marks = [('start', _STARTED), ('imports', time.perf_counter())]
+
     # Initialize the database manager
-    db_manager = DataManager()
+    db_manager = DataManager(args.data_file, storage=args.storage)
+    startup_marks.append(('data loaded', time.perf_counter()))
 
     # Create the main Tkinter window
     root = tk.Tk()
 
     # Initialize the GUI with the main window and data manager
-    app = TMTLabsGUI(root, db_manager)
+    app = TMTLabsGUI(root, db_manager, startup_marks=startup_marks)
 
     # Start the Tkinter event loop
-    root.mainloop()
-
-    # Ensure the database connection is closed when the application exits
-    db_manager.close()
+    try:
+        root.mainloop()
+    finally:
+        # Write anything the background saver has not flushed yet, then close the store
+        db_manager.flush()
+        db_manager.close()
 
 if __name__ == "__main__":
     main()
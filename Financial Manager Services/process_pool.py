@@ -0,0 +1,59 @@
+"""Runs independent tasks across CPU cores for the simulation and receipt rendering code.
+
+Worker processes are spawned rather than forked: the pools are created from the GUI's
+job thread while Tk's own threads are live, and forking a threaded process is unsafe.
+If a pool cannot be started, or a worker dies and breaks it, the tasks that have not
+finished run in this process instead, so callers always get every result.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+
+def imap_unordered(fn, tasks, workers=None, progress=None):
+    """Yield (index, fn(*tasks[index])) for every task, in the order they finish.
+
+    fn must be a module-level function. workers defaults to the number of CPUs; with
+    one worker or one task everything runs in this process. progress(done, total) is
+    called as tasks finish; if it (or the caller, while iterating) raises, outstanding
+    tasks are cancelled and the exception propagates.
+    """
+    tasks = list(tasks)
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    done = 0
+    finished = set()
+    pool = None
+    if workers > 1:
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        except (OSError, NotImplementedError):
+            pool = None
+    if pool is not None:
+        try:
+            futures = {pool.submit(fn, *args): index for index, args in enumerate(tasks)}
+            for future in as_completed(futures):
+                result = future.result()
+                index = futures[future]
+                finished.add(index)
+                done += 1
+                if progress is not None:
+                    progress(done, len(tasks))
+                yield index, result
+        except BrokenProcessPool:
+            # A worker died: keep what finished and run only the rest here
+            pool.shutdown(wait=False, cancel_futures=True)
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        else:
+            pool.shutdown(wait=True)
+            return
+    for index, args in enumerate(tasks):
+        if index in finished:
+            continue
+        result = fn(*args)
+        done += 1
+        if progress is not None:
+            progress(done, len(tasks))
+        yield index, result
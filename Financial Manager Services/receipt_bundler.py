@@ -0,0 +1,151 @@
+"""Collects receipt files into an export, as a folder or as one zip archive.
+
+In a folder each receipt is placed by the cheapest means that works:
+1. a reflink (copy-on-write clone, Linux FICLONE) on filesystems that support it,
+2. a hard link when source and destination share a filesystem,
+3. a copy on a small thread pool otherwise.
+A destination that is already the same file, or has the source's size and mtime
+(copy2 keeps the mtime), is left alone, so exporting into the same folder again only
+touches receipts that changed. Hard-linked receipts share their data with the files in
+the app's receipts folder, which the app never edits in place.
+
+In zip mode entries are streamed into the archive one at a time, stored uncompressed
+(receipt scans are already compressed).
+"""
+import os
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+FICLONE = 0x40049409
+COPY_WORKERS = min(8, os.cpu_count() or 4)
+
+
+def _reflink(src, dst):
+    if fcntl is None:
+        raise OSError("reflinks are not supported here")
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.remove(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def _up_to_date(src_stat, dst):
+    try:
+        st = os.stat(dst)
+    except OSError:
+        return False
+    if (st.st_dev, st.st_ino) == (src_stat.st_dev, src_stat.st_ino):
+        return True
+    return st.st_size == src_stat.st_size and st.st_mtime_ns == src_stat.st_mtime_ns
+
+
+class ReceiptBundler:
+    """Use as a context manager; add() each receipt, and the bundle is complete on exit.
+
+    target is a folder, or a .zip path when as_zip is set. add() returns the receipt's
+    path relative to the bundle root (prefix/name) as soon as it is queued.
+    counts tallies 'reflinked', 'linked', 'copied', 'zipped', 'skipped' and 'missing'.
+    """
+
+    def __init__(self, target, prefix='receipts', as_zip=False, workers=COPY_WORKERS):
+        self.target = target
+        self.prefix = prefix
+        self.as_zip = as_zip
+        self.counts = dict.fromkeys(('reflinked', 'linked', 'copied', 'zipped', 'skipped', 'missing'), 0)
+        self._names = set()
+        self._copies = []
+        self._can_reflink = fcntl is not None
+        self._can_link = True
+        if as_zip:
+            os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+            self._zip = zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_STORED, allowZip64=True)
+            self._pool = None
+        else:
+            self._zip = None
+            os.makedirs(os.path.join(target, prefix), exist_ok=True)
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='receipt-copy')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(cancel=exc_type is not None)
+        return False
+
+    def add(self, src, name):
+        """Queue src under name; returns its relative path, or None if src does not exist."""
+        try:
+            src_stat = os.stat(src)
+        except OSError:
+            self.counts['missing'] += 1
+            return None
+        rel_path = os.path.join(self.prefix, name)
+        if rel_path in self._names:
+            return rel_path
+        self._names.add(rel_path)
+        if self._zip is not None:
+            self._zip.write(src, rel_path.replace(os.sep, '/'))
+            self.counts['zipped'] += 1
+            return rel_path
+        dst = os.path.join(self.target, rel_path)
+        if _up_to_date(src_stat, dst):
+            self.counts['skipped'] += 1
+            return rel_path
+        if os.path.lexists(dst):
+            os.remove(dst)
+        if self._can_reflink:
+            try:
+                _reflink(src, dst)
+                self.counts['reflinked'] += 1
+                return rel_path
+            except OSError:
+                # Not supported on this filesystem; don't try again for every file
+                self._can_reflink = False
+        if self._can_link:
+            try:
+                os.link(src, dst)
+                self.counts['linked'] += 1
+                return rel_path
+            except OSError:
+                self._can_link = False
+        self._copies.append(self._pool.submit(shutil.copy2, src, dst))
+        return rel_path
+
+    @property
+    def pending_copies(self):
+        return len(self._copies)
+
+    def close(self, cancel=False, progress=None):
+        """Finish the bundle. Waits for queued copies, calling progress(done, total) as
+        they complete; with cancel, copies not yet started are dropped."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._pool is None:
+            return
+        if cancel:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        else:
+            total = len(self._copies)
+            for done, future in enumerate(as_completed(self._copies), 1):
+                try:
+                    future.result()
+                    self.counts['copied'] += 1
+                except OSError as e:
+                    self.counts['missing'] += 1
+                    print(f"Could not copy receipt: {e}")
+                if progress is not None:
+                    progress(done, total)
+            self._pool.shutdown(wait=True)
+        self._pool = None
+        self._copies = []
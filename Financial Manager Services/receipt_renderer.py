@@ -0,0 +1,136 @@
+"""Print-size renders of receipts for the PDF report.
+
+Receipts are usually full-resolution camera images; the PDF only shows them at about
+400x300 points. render_receipts() downsamples each one to that box at PRINT_DPI and
+re-encodes it as a JPEG, in a process pool so large batches use every core. Renders are
+cached on disk under a key made of the file's SHA-256 and the target size, so repeated
+exports reuse them and an edited receipt gets a fresh render. The hash of each receipt
+is remembered alongside its size and mtime, so an unchanged file is not read again.
+
+PDF receipts are rendered page by page (up to MAX_PAGES) when the optional pypdfium2
+package is installed; without it they are skipped and reported as such.
+"""
+import hashlib
+import os
+
+import process_pool
+
+PRINT_DPI = 150
+JPEG_QUALITY = 80
+MAX_PAGES = 10
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tif', '.tiff', '.webp')
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cached_hash(src, cache_dir):
+    """SHA-256 of src, reused from the last render while its size and mtime are unchanged."""
+    st = os.stat(src)
+    stamp = f"{st.st_size} {st.st_mtime_ns}"
+    path_key = hashlib.sha256(os.path.abspath(src).encode('utf-8')).hexdigest()
+    stamp_file = os.path.join(cache_dir, path_key + '.stat')
+    try:
+        with open(stamp_file) as f:
+            cached_stamp, _, digest = f.read().rpartition(' ')
+        if cached_stamp == stamp and digest:
+            return digest
+    except OSError:
+        pass
+    digest = _file_hash(src)
+    tmp_stamp = stamp_file + f".{os.getpid()}.tmp"
+    with open(tmp_stamp, 'w') as f:
+        f.write(f"{stamp} {digest}")
+    os.replace(tmp_stamp, stamp_file)
+    return digest
+
+
+def _fit(image, max_px):
+    from PIL import Image
+
+    image.thumbnail(max_px, Image.LANCZOS)
+    if image.mode not in ('RGB', 'L'):
+        background = Image.new('RGB', image.size, 'white')
+        if 'A' in image.getbands():
+            background.paste(image, mask=image.getchannel('A'))
+        else:
+            background.paste(image.convert('RGB'))
+        image = background
+    return image
+
+
+def render_receipt(src, cache_dir, max_size=(400, 300), dpi=PRINT_DPI):
+    """Render one receipt; returns (list of JPEG paths, message). Runs in a worker process.
+
+    An empty list means nothing could be rendered and message says why.
+    """
+    max_px = (max(1, round(max_size[0] * dpi / 72)), max(1, round(max_size[1] * dpi / 72)))
+    os.makedirs(cache_dir, exist_ok=True)
+    key = f"{_cached_hash(src, cache_dir)}_{max_px[0]}x{max_px[1]}"
+    marker = os.path.join(cache_dir, key + '.pages')
+    if os.path.exists(marker):
+        # Cached: the marker lists the page renders, written last so it is only there when complete
+        with open(marker) as f:
+            pages = [os.path.join(cache_dir, name) for name in f.read().split()]
+        if all(os.path.exists(p) for p in pages):
+            return pages, ''
+
+    if src.lower().endswith('.pdf'):
+        try:
+            import pypdfium2 as pdfium
+        except ImportError:
+            return [], 'PDF receipt (install pypdfium2 to include its pages)'
+        images = []
+        pdf = pdfium.PdfDocument(src)
+        try:
+            for index in range(min(len(pdf), MAX_PAGES)):
+                page = pdf[index]
+                width, height = page.get_size()
+                scale = min(max_px[0] / width, max_px[1] / height)
+                images.append(page.render(scale=scale).to_pil())
+        finally:
+            pdf.close()
+    else:
+        from PIL import Image, ImageOps
+
+        with Image.open(src) as image:
+            image = ImageOps.exif_transpose(image)
+            image.load()
+            images = [image]
+
+    names = []
+    for index, image in enumerate(images):
+        name = f"{key}_p{index + 1}.jpg"
+        tmp_path = os.path.join(cache_dir, name + f".{os.getpid()}.tmp")
+        _fit(image, max_px).save(tmp_path, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+        os.replace(tmp_path, os.path.join(cache_dir, name))
+        names.append(name)
+    tmp_marker = marker + f".{os.getpid()}.tmp"
+    with open(tmp_marker, 'w') as f:
+        f.write('\n'.join(names))
+    os.replace(tmp_marker, marker)
+    return [os.path.join(cache_dir, name) for name in names], ''
+
+
+def _render_safely(src, cache_dir, max_size, dpi):
+    try:
+        return render_receipt(src, cache_dir, max_size, dpi)
+    except Exception as e:
+        return [], f"Could not render receipt: {e}"
+
+
+def render_receipts(paths, cache_dir, max_size=(400, 300), dpi=PRINT_DPI, workers=None, progress=None):
+    """Render many receipts; returns {path: (JPEG paths, message)}.
+
+    Renders run through process_pool.imap_unordered, which documents workers and
+    progress.
+    """
+    paths = list(dict.fromkeys(p for p in paths if p))
+    tasks = [(path, cache_dir, max_size, dpi) for path in paths]
+    return {paths[index]: result
+            for index, result in process_pool.imap_unordered(_render_safely, tasks, workers, progress)}
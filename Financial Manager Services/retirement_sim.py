@@ -0,0 +1,91 @@
+"""Monte Carlo retirement projections.
+
+Annual returns and inflation are drawn for many paths at once, and the balance follows
+the same recursion as the Retirement tab's fixed-rate projection (grow the balance by
+the year's return, then add the year's contribution), evaluated over whole arrays of
+paths one year at a time. Results are percentile bands per year in inflation-adjusted
+(today's) money, the nominal percentiles at retirement, and the share of paths that
+reach a target.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+PERCENTILES = (5, 25, 50, 75, 95)
+DISTRIBUTIONS = ('normal', 'lognormal', 'student-t')
+
+# Rates are fractions (0.05 = 5%). return_mean/return_stdev are the arithmetic mean and
+# standard deviation of the annual return whatever the distribution; student-t uses t_df
+# degrees of freedom for fatter tails. With index_contributions the contribution grows
+# with each path's inflation. target is in today's money, compared at retirement.
+SimParams = namedtuple(
+    "SimParams",
+    "current_age retire_age savings contribution return_mean return_stdev "
+    "inflation_mean inflation_stdev distribution t_df index_contributions target",
+    defaults=(0.15, 0.02, 0.01, 'normal', 5, True, 0.0),
+)
+
+# ages: one per simulated year (age at the end of it). percentiles maps each of PERCENTILES
+# to an array of real balances per year; final_nominal maps them to the nominal balance at
+# retirement. success_probability is None without a target.
+SimResult = namedtuple("SimResult", "ages percentiles final_nominal success_probability n_paths seed")
+
+
+def draw_returns(rng, params, shape):
+    """Simple annual returns (fractions) with the mean and stdev of params, floored at -100%."""
+    mean, stdev = params.return_mean, params.return_stdev
+    if params.distribution == 'normal':
+        returns = mean + stdev * rng.standard_normal(shape)
+    elif params.distribution == 'lognormal':
+        # Growth factor 1 + r is lognormal with the requested arithmetic mean and stdev
+        sigma2 = np.log1p((stdev / (1.0 + mean)) ** 2)
+        mu = np.log1p(mean) - sigma2 / 2.0
+        returns = np.expm1(mu + np.sqrt(sigma2) * rng.standard_normal(shape))
+    elif params.distribution == 'student-t':
+        df = float(params.t_df)
+        if df <= 2:
+            raise ValueError("student-t needs more than 2 degrees of freedom")
+        returns = mean + stdev * np.sqrt((df - 2.0) / df) * rng.standard_t(df, shape)
+    else:
+        raise ValueError(f"Unknown distribution {params.distribution!r}; expected one of {DISTRIBUTIONS}")
+    return np.maximum(returns, -1.0)
+
+
+def simulate_paths(params, n_paths, rng):
+    """(real balances shaped (years, n_paths), nominal balances at retirement)."""
+    years = int(params.retire_age) - int(params.current_age)
+    if years <= 0:
+        raise ValueError("Retirement age must be greater than current age.")
+    returns = draw_returns(rng, params, (years, n_paths))
+    inflation = params.inflation_mean + params.inflation_stdev * rng.standard_normal((years, n_paths))
+
+    real = np.empty((years, n_paths))
+    balance = np.full(n_paths, float(params.savings))
+    contribution = np.full(n_paths, float(params.contribution))
+    deflator = np.ones(n_paths)
+    for year in range(years):
+        balance *= 1.0 + returns[year]
+        balance += contribution
+        deflator *= 1.0 + inflation[year]
+        np.divide(balance, deflator, out=real[year])
+        if params.index_contributions:
+            contribution *= 1.0 + inflation[year]
+    return real, balance
+
+
+def simulate(params, n_paths=20000, seed=None):
+    """Run n_paths paths and summarise them; the same seed gives the same result."""
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    rng = np.random.default_rng(seed)
+    real, final_nominal = simulate_paths(params, int(n_paths), rng)
+    ages = np.arange(int(params.current_age) + 1, int(params.retire_age) + 1)
+    success = float(np.mean(real[-1] >= params.target)) if params.target else None
+    return SimResult(
+        ages,
+        dict(zip(PERCENTILES, np.percentile(real, PERCENTILES, axis=1))),
+        dict(zip(PERCENTILES, np.percentile(final_nominal, PERCENTILES))),
+        success,
+        int(n_paths),
+        seed,
+    )
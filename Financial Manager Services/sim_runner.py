@@ -0,0 +1,105 @@
+"""Runs Monte Carlo simulations across CPU cores with reproducible results.
+
+Paths are split into fixed-size batches. Batch i always draws from the i-th child of
+SeedSequence(seed), so it produces the same paths whichever process runs it. Each batch
+returns integer histograms ("sketches") of its balances over fixed log-spaced bins
+instead of the paths themselves, and sketches merge by adding counts. Integer addition
+does not depend on order, so a seed gives bit-identical results for any worker count or
+completion order. Percentiles are read back from the merged histogram, interpolated
+within a bin (bins are about 0.6% wide).
+"""
+import numpy as np
+
+import process_pool
+import retirement_sim
+
+BATCH_SIZE = 10000
+
+# Bin edges run from SKETCH_MIN to SKETCH_MAX at BINS_PER_DECADE per decade; bin 0 holds
+# values below SKETCH_MIN (read back as 0) and the last bin values from SKETCH_MAX up.
+SKETCH_MIN = 1.0
+SKETCH_MAX = 1e12
+BINS_PER_DECADE = 400
+_LOG_BINS = int(round(np.log10(SKETCH_MAX / SKETCH_MIN) * BINS_PER_DECADE))
+SKETCH_BINS = _LOG_BINS + 2
+
+
+def sketch(values):
+    """Histogram counts (int64) of each row of a 2-D array: shape (rows, SKETCH_BINS)."""
+    values = np.atleast_2d(values)
+    rows = values.shape[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaled = np.log10(np.maximum(values, SKETCH_MIN) / SKETCH_MIN) * BINS_PER_DECADE
+    bins = np.where(values < SKETCH_MIN, 0, np.minimum(scaled.astype(np.int64) + 1, SKETCH_BINS - 1))
+    bins += np.arange(rows, dtype=np.int64)[:, None] * SKETCH_BINS
+    return np.bincount(bins.ravel(), minlength=rows * SKETCH_BINS).reshape(rows, SKETCH_BINS)
+
+
+def sketch_percentiles(counts, percentiles):
+    """Estimated percentiles of each row of sketch counts: shape (len(percentiles), rows)."""
+    counts = np.atleast_2d(counts)
+    total = counts.sum(axis=1)
+    cumulative = np.cumsum(counts, axis=1)
+    rows = np.arange(counts.shape[0])
+    out = np.empty((len(percentiles), counts.shape[0]))
+    for i, q in enumerate(percentiles):
+        rank = q / 100.0 * (total - 1)
+        b = np.argmax(cumulative > rank[:, None], axis=1)
+        in_bin = counts[rows, b]
+        fraction = (rank - (cumulative[rows, b] - in_bin) + 0.5) / np.maximum(in_bin, 1)
+        value = SKETCH_MIN * 10.0 ** ((b - 1 + fraction) / BINS_PER_DECADE)
+        value = np.where(b == 0, 0.0, value)
+        out[i] = np.where(b == SKETCH_BINS - 1, SKETCH_MAX, value)
+    return out
+
+
+def retirement_batch(params, size, seed_seq):
+    """One batch of retirement_sim paths, summarised as sketches. Runs in a worker process."""
+    real, final_nominal = retirement_sim.simulate_paths(params, size, np.random.default_rng(seed_seq))
+    return {
+        'real': sketch(real),
+        'final_nominal': sketch(final_nominal)[0],
+        'successes': int(np.count_nonzero(real[-1] >= params.target)) if params.target else 0,
+    }
+
+
+def _merge(total, part):
+    if total is None:
+        return part
+    return {key: total[key] + value for key, value in part.items()}
+
+
+def run_batches(task, params, n_paths, seed, workers=None, progress=None, batch_size=BATCH_SIZE):
+    """Run task(params, size, seed_seq) over n_paths in batches and merge the results.
+
+    task must be a module-level function returning a dict of integer arrays or ints.
+    Batches run through process_pool.imap_unordered, which documents workers and
+    progress; batch i always gets the i-th child seed, wherever it runs.
+    """
+    n_batches = -(-int(n_paths) // batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_batches)
+    tasks = [(params, min(batch_size, n_paths - i * batch_size), seeds[i]) for i in range(n_batches)]
+    merged = None
+    for _, part in process_pool.imap_unordered(task, tasks, workers, progress):
+        merged = _merge(merged, part)
+    return merged
+
+
+def simulate(params, n_paths=100000, seed=None, workers=None, progress=None):
+    """retirement_sim.simulate spread over processes; returns a retirement_sim.SimResult
+    with percentiles read from the merged sketches."""
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    merged = run_batches(retirement_batch, params, int(n_paths), seed, workers, progress)
+    percentiles = retirement_sim.PERCENTILES
+    ages = np.arange(int(params.current_age) + 1, int(params.retire_age) + 1)
+    real = sketch_percentiles(merged['real'], percentiles)
+    final_nominal = sketch_percentiles(merged['final_nominal'], percentiles)[:, 0]
+    return retirement_sim.SimResult(
+        ages,
+        dict(zip(percentiles, real)),
+        dict(zip(percentiles, final_nominal)),
+        merged['successes'] / int(n_paths) if params.target else None,
+        int(n_paths),
+        seed,
+    )
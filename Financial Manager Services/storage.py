@@ -0,0 +1,463 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+CATEGORIES = ("income", "expenses", "debts", "assets", "investments")
+
+# Columns pulled out of each record so SQLite can index them
+DATE_FIELDS = {"income": "date", "expenses": "date", "debts": "due_date", "assets": "date_updated", "investments": "date_purchased"}
+KIND_FIELDS = {"income": "source", "expenses": "category", "debts": "type", "assets": "type", "investments": "type"}
+
+
+def empty_data():
+    return {category: [] for category in CATEGORIES}
+
+
+def iter_changes(changes):
+    """Yield single changes, expanding batch records written by DataManager.batch()."""
+    for change in changes:
+        if change.get("op") == "batch":
+            yield from change["changes"]
+        else:
+            yield change
+
+
+def apply_changes(data, changes):
+    """Replay journal records onto a data dict in one pass, looking records up by id.
+
+    Replaying is idempotent, so a journal that outlived a crash between writing the
+    snapshot and removing the journal can be replayed onto a snapshot that already
+    holds its changes: ids are never reused, so an "add" whose id is present is
+    skipped, and updates and deletes give the same result when applied again.
+    """
+    index = {}
+    deleted = set()
+    for change in iter_changes(changes):
+        category = change["category"]
+        if category not in index:
+            index[category] = {item["id"]: item for item in data.setdefault(category, [])}
+        by_id = index[category]
+        op = change.get("op")
+        if op == "add":
+            record = change["record"]
+            if record["id"] not in by_id:
+                data[category].append(record)
+                by_id[record["id"]] = record
+            next_ids = data.setdefault("next_ids", {})
+            next_ids[category] = max(next_ids.get(category, 1), record["id"] + 1)
+        elif op == "update":
+            entry = by_id.get(change["id"])
+            if entry is not None:
+                entry.update(change["fields"])
+        elif op == "delete":
+            entry = by_id.pop(change["id"], None)
+            if entry is not None:
+                deleted.add(id(entry))
+        elif op == "next_id":
+            next_ids = data.setdefault("next_ids", {})
+            next_ids[category] = max(next_ids.get(category, 1), change["next_id"])
+    if deleted:
+        for category in index:
+            data[category] = [item for item in data[category] if id(item) not in deleted]
+
+
+# Records encoded per json.dumps call by encode_json
+ENCODE_CHUNK = 1000
+
+
+def encode_json(data):
+    """Compact JSON text for the data dict.
+
+    Without indent, json uses its C encoder. That encoder holds the GIL for a whole
+    call, so long record lists are encoded ENCODE_CHUNK records at a time to let the
+    Tk thread run between slices.
+    """
+    parts = []
+    for key, value in data.items():
+        if isinstance(value, list) and len(value) > ENCODE_CHUNK:
+            slices = (json.dumps(value[pos:pos + ENCODE_CHUNK], separators=(',', ':'))[1:-1]
+                      for pos in range(0, len(value), ENCODE_CHUNK))
+            text = "[" + ",".join(slices) + "]"
+        else:
+            text = json.dumps(value, separators=(',', ':'))
+        parts.append(json.dumps(key) + ":" + text)
+    return "{" + ",".join(parts) + "}"
+
+
+def atomic_write(path, text):
+    """Write text to a temp file, fsync it and rename it over path, so readers never see a torn file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    # Make the rename itself durable where the platform allows opening directories
+    if hasattr(os, "O_DIRECTORY"):
+        try:
+            dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
+class JsonStore:
+    """Stores the whole data dict as a single JSON file that is rewritten on every save."""
+    incremental = False
+    save_on_close = False
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def serialize(self, data):
+        return encode_json(data)
+
+    def write(self, text):
+        atomic_write(self.path, text)
+
+    def save(self, data):
+        self.write(self.serialize(data))
+
+    def close(self):
+        pass
+
+
+class JournalStore(JsonStore):
+    """Snapshot file plus an append-only journal of compact change records.
+
+    Each mutation costs one short line appended to ``<data_file>.journal``.  Once the
+    journal grows past ``compact_threshold`` bytes it is rotated aside and folded into
+    the snapshot by a background thread, so the GUI never waits on a full rewrite.
+    """
+    incremental = True
+    save_on_close = True
+
+    def __init__(self, path, compact_threshold=1024 * 1024):
+        super().__init__(path)
+        self.journal_path = path + ".journal"
+        self.compacting_path = self.journal_path + ".compacting"
+        self.compact_threshold = compact_threshold
+        self._journal = None
+        self._compactor = None
+
+    def exists(self):
+        return any(os.path.exists(p) for p in (self.path, self.journal_path, self.compacting_path))
+
+    def load(self):
+        data = super().load() if os.path.exists(self.path) else empty_data()
+        # A journal left over from an interrupted compaction is older than the live one
+        for path in (self.compacting_path, self.journal_path):
+            if os.path.exists(path):
+                apply_changes(data, self._read_journal(path))
+        self._repair_journal()
+        return data
+
+    def _read_journal(self, path):
+        with open(path, 'rb') as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    change = json.loads(line)
+                except ValueError:
+                    # Only the final line can be torn by a crash mid-append
+                    print(f"Ignoring incomplete journal record at {path}:{line_no}")
+                    break
+                yield change
+
+    def _repair_journal(self):
+        # Cut a torn final record (and complete a missing newline) so that appends
+        # after a crash start on a line of their own instead of being read as part of it
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'rb+') as f:
+            good_end = 0
+            for line in f:
+                if line.strip():
+                    try:
+                        json.loads(line)
+                    except ValueError:
+                        break
+                good_end += len(line)
+            f.seek(0, os.SEEK_END)
+            if f.tell() > good_end:
+                f.truncate(good_end)
+            if good_end:
+                f.seek(good_end - 1)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+    def append(self, change):
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a')
+        self._journal.write(json.dumps(change, separators=(',', ':')) + "\n")
+        self._journal.flush()
+        if self._journal.tell() >= self.compact_threshold:
+            self._start_compaction()
+
+    def _start_compaction(self):
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        if not os.path.exists(self.compacting_path):
+            self._close_journal()
+            os.replace(self.journal_path, self.compacting_path)
+        self._compactor = threading.Thread(target=self._compact, name="journal-compactor", daemon=True)
+        self._compactor.start()
+
+    def _compact(self):
+        # Works only on files, never on the live in-memory data, so no locking is needed
+        try:
+            data = super().load() if os.path.exists(self.path) else empty_data()
+            apply_changes(data, self._read_journal(self.compacting_path))
+            self._write_snapshot(data)
+            os.remove(self.compacting_path)
+            print("Journal compacted into snapshot.")
+        except Exception as e:
+            print(f"Journal compaction failed: {e}")
+
+    def _write_snapshot(self, data):
+        self.write(self.serialize(data))
+
+    def _wait_for_compaction(self):
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def save(self, data):
+        # A full snapshot supersedes every journal record written so far
+        self._wait_for_compaction()
+        self._close_journal()
+        self._write_snapshot(data)
+        for path in (self.journal_path, self.compacting_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close(self):
+        self._wait_for_compaction()
+        self._close_journal()
+
+
+class SaveScheduler:
+    """Runs save_fn on a background thread, coalescing bursts of save requests.
+
+    mark_dirty() only sets a flag and wakes the saver thread, which waits ``delay``
+    seconds for further changes before writing once.  flush() writes any pending
+    changes on the calling thread and waits for an in-progress write to finish.
+    """
+
+    def __init__(self, save_fn, delay=0.5):
+        self._save_fn = save_fn
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def mark_dirty(self):
+        with self._lock:
+            self._dirty = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="save-scheduler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            # Let the rest of a burst of edits arrive before writing once
+            if self._stop.wait(self.delay):
+                return
+            self._wake.clear()
+            self._save_if_dirty()
+
+    def _save_if_dirty(self):
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+            started = time.perf_counter()
+            try:
+                self._save_fn()
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                print(f"Background save failed: {e}")
+                return
+            print(f"Data saved in background ({(time.perf_counter() - started) * 1000:.0f} ms).")
+
+    def flush(self):
+        self._save_if_dirty()
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+class SqliteStore:
+    """Stores one row per record in a SQLite file, indexed by id, date and category.
+
+    Every change is written as its own small transaction, so nothing is ever
+    rewritten in bulk.  Receipts live in their own table keyed by expense id.
+    """
+    incremental = True
+    save_on_close = False
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS records (
+            category TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            date TEXT,
+            kind TEXT,
+            amount REAL,
+            body TEXT NOT NULL,
+            PRIMARY KEY (category, id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_records_date ON records (category, date);
+        CREATE INDEX IF NOT EXISTS idx_records_kind ON records (category, kind, date);
+        CREATE TABLE IF NOT EXISTS counters (
+            category TEXT PRIMARY KEY,
+            next_id INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS receipts (
+            expense_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            path TEXT NOT NULL,
+            PRIMARY KEY (expense_id, position)
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        conn = self._connect()
+        receipts = defaultdict(list)
+        for expense_id, path in conn.execute("SELECT expense_id, path FROM receipts ORDER BY expense_id, position"):
+            receipts[expense_id].append(path)
+        data = empty_data()
+        for category, body in conn.execute("SELECT category, body FROM records ORDER BY category, id"):
+            record = json.loads(body)
+            if category == "expenses" and record["id"] in receipts:
+                record["receipts"] = receipts[record["id"]]
+            data.setdefault(category, []).append(record)
+        data["next_ids"] = dict(conn.execute("SELECT category, next_id FROM counters"))
+        return data
+
+    def _write_record(self, conn, category, record):
+        body = {k: v for k, v in record.items() if k != "receipts"}
+        amount = record.get("amount") if category in ("income", "expenses") else None
+        conn.execute(
+            "INSERT OR REPLACE INTO records (category, id, date, kind, amount, body) VALUES (?, ?, ?, ?, ?, ?)",
+            (category, record["id"], record.get(DATE_FIELDS.get(category)), record.get(KIND_FIELDS.get(category)), amount, json.dumps(body)),
+        )
+        if category == "expenses" and "receipts" in record:
+            self._write_receipts(conn, record["id"], record["receipts"])
+
+    def _write_receipts(self, conn, expense_id, paths):
+        conn.execute("DELETE FROM receipts WHERE expense_id = ?", (expense_id,))
+        conn.executemany(
+            "INSERT INTO receipts (expense_id, position, path) VALUES (?, ?, ?)",
+            [(expense_id, pos, path) for pos, path in enumerate(paths or [])],
+        )
+
+    def _bump_counter(self, conn, category, next_id):
+        conn.execute(
+            "INSERT INTO counters (category, next_id) VALUES (?, ?) "
+            "ON CONFLICT (category) DO UPDATE SET next_id = MAX(next_id, excluded.next_id)",
+            (category, next_id),
+        )
+
+    def append(self, change):
+        conn = self._connect()
+        # A batch record is written in one transaction, so it lands all or nothing
+        with conn:
+            for single in iter_changes([change]):
+                self._apply(conn, single)
+
+    def _apply(self, conn, change):
+        category = change["category"]
+        if change["op"] == "add":
+            self._write_record(conn, category, change["record"])
+            self._bump_counter(conn, category, change["record"]["id"] + 1)
+        elif change["op"] == "update":
+            row = conn.execute("SELECT body FROM records WHERE category = ? AND id = ?", (category, change["id"])).fetchone()
+            if row is None:
+                return
+            record = json.loads(row[0])
+            record.update(change["fields"])
+            self._write_record(conn, category, record)
+        elif change["op"] == "delete":
+            conn.execute("DELETE FROM records WHERE category = ? AND id = ?", (category, change["id"]))
+            if category == "expenses":
+                conn.execute("DELETE FROM receipts WHERE expense_id = ?", (change["id"],))
+        elif change["op"] == "next_id":
+            self._bump_counter(conn, category, change["next_id"])
+
+    def save(self, data):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM records")
+            conn.execute("DELETE FROM receipts")
+            conn.execute("DELETE FROM counters")
+            for category in CATEGORIES:
+                for record in data.get(category, []):
+                    self._write_record(conn, category, record)
+            for category, next_id in data.get("next_ids", {}).items():
+                self._bump_counter(conn, category, next_id)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def migrate_json_to_sqlite(json_path, db_path):
+    """One-shot copy of a moneymind JSON file into a SQLite store. Returns the number of records copied."""
+    data = JsonStore(json_path).load()
+    store = SqliteStore(db_path)
+    try:
+        store.save(data)
+    finally:
+        store.close()
+    return sum(len(data.get(category, [])) for category in CATEGORIES)
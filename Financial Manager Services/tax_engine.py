@@ -0,0 +1,90 @@
+"""Tax classification of expenses.
+
+An expense is a tax payment when its category is one of the tax categories, and a
+deductible when it is flagged is_tax_deductible; it can be both. Everything else is
+"other". Every tab, report and export classifies through one TaxEngine, which the
+DataManager owns so its rollups use the same rules.
+"""
+from collections import namedtuple
+
+DEFAULT_TAX_PAYMENT_CATEGORIES = ('Income Tax', 'State Tax', 'Property Tax')
+
+# Lists of expense records in the order they were given (an expense can be in the first two)
+TaxPartition = namedtuple("TaxPartition", "tax_payments deductibles others")
+
+# Partitions kept per data version (one per date range asked for)
+_CACHE_SIZE = 8
+
+
+class TaxEngine:
+    def __init__(self, data_manager, tax_categories=DEFAULT_TAX_PAYMENT_CATEGORIES):
+        self.data_manager = data_manager
+        self._cache = {}
+        self._cache_version = None
+        self._set_categories(tax_categories)
+
+    def _set_categories(self, tax_categories):
+        self.tax_categories = tuple(tax_categories)
+        self._category_set = frozenset(self.tax_categories)
+        self._cache = {}
+
+    def set_tax_categories(self, tax_categories):
+        """Change which expense categories count as tax payments (DataManager.set_tax_categories
+        also rebuilds the rollups that depend on them)."""
+        self._set_categories(tax_categories)
+
+    def is_tax_payment(self, record) -> bool:
+        return record.get('category') in self._category_set
+
+    @staticmethod
+    def is_deductible(record) -> bool:
+        return bool(record.get('is_tax_deductible'))
+
+    def classify(self, record):
+        """(is tax payment, is deductible) for one expense."""
+        return record.get('category') in self._category_set, bool(record.get('is_tax_deductible'))
+
+    def partition(self, expenses) -> TaxPartition:
+        """Split expenses into tax payments, deductibles and others in one pass."""
+        classify = self.classify
+        tax_payments, deductibles, others = [], [], []
+        for record in expenses:
+            is_tax, is_deductible = classify(record)
+            if is_tax:
+                tax_payments.append(record)
+            if is_deductible:
+                deductibles.append(record)
+            elif not is_tax:
+                others.append(record)
+        return TaxPartition(tax_payments, deductibles, others)
+
+    def expenses(self, start=None, end=None) -> TaxPartition:
+        """Partition of the expenses dated in [start, end] (undated included), oldest first.
+
+        Cached until the data changes (DataManager.version), so tabs and reports asking
+        for the same range share one pass. Treat the lists as read-only.
+        """
+        version = self.data_manager.version
+        if version != self._cache_version:
+            self._cache = {}
+            self._cache_version = version
+        key = (start, end)
+        result = self._cache.get(key)
+        if result is None:
+            if len(self._cache) >= _CACHE_SIZE:
+                self._cache.clear()
+            result = self._cache[key] = self.partition(self.data_manager.query_range('expenses', start, end))
+        return result
+
+    def totals(self, start=None, end=None) -> dict:
+        """Total tax payments and deductible expenses over [start, end], read from the monthly rollups."""
+        return {
+            'tax_payments': self.data_manager.rollup_total('tax_payments', start, end),
+            'deductibles': self.data_manager.rollup_total('deductible', start, end),
+        }
+
+    def summary(self, start=None, end=None) -> dict:
+        """Total income, deductible expenses and the estimated taxable income over [start, end]."""
+        total_income = self.data_manager.rollup_total('income', start, end)
+        deductible = self.data_manager.rollup_total('deductible', start, end)
+        return {'total_income': total_income, 'deductible': deductible, 'taxable_income': total_income - deductible}
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+import backtest
+from backtest import BacktestParams
+
+
+def test_thirty_year_windows_cover_history():
+    history = backtest.load_history()
+    result = backtest.run_backtest(BacktestParams(100000, 10000, 30))
+    assert history.years[0] == 1928 and history.years[-1] == 2023
+    assert result.start_years[0] == 1928 and result.start_years[-1] == 1994
+    assert result.real_paths.shape == (67, 30)
+    np.testing.assert_array_equal(result.ending, result.real_paths[:, -1])
+
+
+def test_first_window_matches_year_by_year_replay():
+    history = backtest.load_history()
+    params = BacktestParams(100000, 10000, 30, stock_share=0.6)
+    result = backtest.run_backtest(params)
+
+    balance, prices, contribution, real = 100000.0, 1.0, 10000.0, []
+    for year in range(30):
+        balance *= 1 + 0.6 * history.stocks[year] + 0.4 * history.bonds[year]
+        balance += contribution
+        prices *= 1 + history.inflation[year]
+        contribution *= 1 + history.inflation[year]
+        real.append(balance / prices)
+    np.testing.assert_allclose(result.real_paths[0], real, rtol=1e-10)
+
+
+def test_worst_windows_sorted_by_ending():
+    result = backtest.run_backtest(BacktestParams(50000, 5000, 20, stock_share=1.0), n_worst=3)
+    worst = result.ending[result.worst]
+    assert list(worst) == sorted(worst)
+    assert worst[0] == result.ending.min()
+    assert result.percentiles[5] <= result.percentiles[50] <= result.percentiles[95]
+
+
+def test_plan_longer_than_history_raises():
+    with pytest.raises(ValueError):
+        backtest.run_backtest(BacktestParams(1000, 0, 97))
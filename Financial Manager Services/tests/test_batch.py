@@ -0,0 +1,67 @@
+import json
+import threading
+
+import pytest
+
+from data_manager import DataManager
+
+STORAGE_MODES = ("json", "journal", "sqlite")
+
+
+def reopen(path, storage, dm):
+    # Reload from disk without closing first, as after a crash
+    dm.flush()
+    return DataManager(path, storage=storage)
+
+
+@pytest.mark.parametrize("storage", STORAGE_MODES)
+def test_rolled_back_batch_is_not_written(tmp_path, storage):
+    path = str(tmp_path / "data.json")
+    dm = DataManager(path, storage=storage)
+    dm.add_income("2024-01-01", "a", 1)
+    with pytest.raises(RuntimeError):
+        with dm.batch():
+            dm.add_income("2024-01-02", "b", 2)
+            dm.update_income(1, amount=10)
+            dm.delete_item("income", 1)
+            raise RuntimeError("abort")
+    assert [(r["source"], r["amount"]) for r in dm.get_income()] == [("a", 1)]
+
+    reloaded = reopen(path, storage, dm)
+    assert [(r["id"], r["source"], r["amount"]) for r in reloaded.get_income()] == [(1, "a", 1)]
+    # The id handed out inside the rolled-back batch is not reused
+    assert reloaded.add_income("2024-01-03", "c", 3) == 3
+
+
+@pytest.mark.parametrize("storage", STORAGE_MODES)
+def test_committed_batch_is_written(tmp_path, storage):
+    path = str(tmp_path / "data.json")
+    dm = DataManager(path, storage=storage)
+    with dm.batch():
+        first = dm.add_expense("2024-02-01", "Food", 5)
+        with dm.batch():
+            dm.add_expense("2024-02-02", "Rent", 500)
+        dm.update_expense(first, amount=6)
+    reloaded = reopen(path, storage, dm)
+    assert [(r["category"], r["amount"]) for r in reloaded.get_expenses()] == [("Food", 6), ("Rent", 500)]
+
+
+def test_saver_waits_for_open_batch(tmp_path):
+    path = str(tmp_path / "data.json")
+    dm = DataManager(path)
+    dm.add_income("2024-01-01", "a", 1)
+    saver = threading.Thread(target=dm._saver.flush)
+    with pytest.raises(RuntimeError):
+        with dm.batch():
+            dm.add_income("2024-01-02", "b", 2)
+            # The save pending from the add above must wait for the batch to end
+            saver.start()
+            saver.join(0.2)
+            assert saver.is_alive()
+            raise RuntimeError("abort")
+    saver.join()
+    dm.flush()
+    with open(path) as f:
+        on_disk = json.load(f)
+    assert [r["source"] for r in on_disk["income"]] == ["a"]
+    assert on_disk["next_ids"]["income"] == 3
@@ -0,0 +1,45 @@
+import csv
+import os
+
+import pytest
+
+import exporters
+from data_manager import DataManager
+
+
+class FailingJob:
+    """Raises the given error once the expenses file has started."""
+
+    def __init__(self, error):
+        self.error = error
+
+    def step(self, done, total, message):
+        if message == "Writing expenses" and done:
+            raise self.error
+
+
+def make_data(tmp_path):
+    dm = DataManager(str(tmp_path / "data.json"))
+    for i in range(20):
+        dm.add_income("2024-01-01", "Salary", i)
+        dm.add_expense("2024-01-02", "Food", i)
+    return dm
+
+
+def test_export_csv_writes_both_files(tmp_path):
+    dm = make_data(tmp_path)
+    base = str(tmp_path / "report")
+    income, expenses = exporters.export_csv(dm, None, None, base)
+    with open(expenses, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:3] == ["id", "date", "category"]
+    assert len(rows) == 21
+    assert os.path.exists(income)
+
+
+@pytest.mark.parametrize("error", [OSError("disk full"), exporters.ExportCancelled()])
+def test_export_csv_leaves_nothing_behind_on_failure(tmp_path, error):
+    dm = make_data(tmp_path)
+    with pytest.raises(type(error)):
+        exporters.export_csv(dm, None, None, str(tmp_path / "report"), FailingJob(error))
+    assert [name for name in os.listdir(tmp_path) if name.startswith("report")] == []
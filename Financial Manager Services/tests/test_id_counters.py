@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from data_manager import DataManager
+
+STORAGE_MODES = ("json", "journal", "sqlite")
+
+
+@pytest.mark.parametrize("storage", STORAGE_MODES)
+def test_ids_are_not_reused_after_delete_and_reload(tmp_path, storage):
+    path = str(tmp_path / "data.json")
+    dm = DataManager(path, storage=storage)
+    ids = [dm.add_income(f"2024-01-0{day}", "job", day) for day in range(1, 4)]
+    assert ids == [1, 2, 3]
+    dm.delete_item("income", 3)
+    dm.flush()
+    dm.close()
+
+    reloaded = DataManager(path, storage=storage)
+    assert reloaded.add_income("2024-01-05", "job", 5) == 4
+    # Counters are kept per category
+    assert reloaded.add_expense("2024-01-05", "Food", 5) == 1
+
+
+def test_file_without_counters_resumes_after_highest_id(tmp_path):
+    path = str(tmp_path / "data.json")
+    with open(path, "w") as f:
+        json.dump({"income": [{"id": 4, "date": "2024-01-01", "amount": 1}, {"id": 9, "date": None, "amount": 2}],
+                   "expenses": [], "debts": [], "assets": [], "investments": []}, f)
+    dm = DataManager(path)
+    assert dm.add_income("2024-01-02", "job", 3) == 10
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import ira_engine
+
+
+def loop_projection(balance, annual_contribution, annual_rate, years):
+    # The IRA tab's original year-by-year projection
+    monthly_rate = annual_rate / 12
+    for _ in range(years):
+        balance *= 1 + annual_rate
+        balance += annual_contribution / 12 * ((1 + monthly_rate) ** 12 - 1) / monthly_rate
+    return balance
+
+
+def test_closed_form_matches_loop():
+    projection = ira_engine.project(10000, 6000, 0.07, 30)
+    assert projection.balance == pytest.approx(661429.2259, abs=1e-4)
+    assert projection.balance == pytest.approx(loop_projection(10000, 6000, 0.07, 30), rel=1e-12)
+    assert projection.contributions == 180000
+    assert projection.interest == pytest.approx(projection.balance - 10000 - 180000)
+
+
+@pytest.mark.parametrize("rate", [-0.05, 0.01, 0.12])
+def test_closed_form_matches_loop_for_other_rates(rate):
+    assert ira_engine.project(25000, 7000, rate, 22).balance == pytest.approx(loop_projection(25000, 7000, rate, 22), rel=1e-12)
+
+
+def test_zero_rate():
+    assert ira_engine.project(1000, 1200, 0.0, 10).balance == 13000
+
+
+def test_sweep_matches_project():
+    grid = ira_engine.sweep(10000, 35, [3000, 6000], [0.0, 0.05, 0.07], [60, 65])
+    assert grid.balances.shape == (2, 3, 2)
+    for i, contribution in enumerate(grid.contributions):
+        for j, rate in enumerate(grid.rates):
+            for k, age in enumerate(grid.retirement_ages):
+                expected = ira_engine.project(10000, contribution, rate, age - 35).balance
+                assert grid.balances[i, j, k] == pytest.approx(expected, rel=1e-12)
+
+
+def test_sweep_rejects_past_retirement_ages():
+    with pytest.raises(ValueError):
+        ira_engine.sweep(0, 65, [1000], [0.05], np.array([60, 70]))
@@ -0,0 +1,99 @@
+import json
+import os
+import shutil
+
+from data_manager import DataManager
+from storage import JournalStore, apply_changes, empty_data
+
+
+def incomes(dm):
+    return [(r["id"], r["source"], r["amount"]) for r in dm.get_income()]
+
+
+def test_replay_onto_snapshot_that_already_holds_the_journal(tmp_path):
+    path = str(tmp_path / "data.json")
+    dm = DataManager(path, storage="journal")
+    dm.add_income("2024-01-01", "a", 1)
+    dm.add_income("2024-01-02", "b", 2)
+    dm.update_income(1, amount=10)
+    dm.delete_item("income", 2)
+    expected = incomes(dm)
+    # Crash between writing the snapshot and removing the journal
+    shutil.copy(path + ".journal", str(tmp_path / "journal.bak"))
+    dm.save_data()
+    shutil.copy(str(tmp_path / "journal.bak"), path + ".journal")
+
+    reloaded = DataManager(path, storage="journal")
+    assert incomes(reloaded) == expected == [(1, "a", 10)]
+    assert reloaded.add_income("2024-01-03", "c", 3) == 3
+
+
+def test_apply_changes_twice_is_idempotent():
+    changes = [
+        {"op": "add", "category": "income", "id": 1, "record": {"id": 1, "amount": 1}},
+        {"op": "batch", "changes": [
+            {"op": "add", "category": "income", "id": 2, "record": {"id": 2, "amount": 2}},
+            {"op": "update", "category": "income", "id": 1, "fields": {"amount": 5}},
+        ]},
+        {"op": "delete", "category": "income", "id": 2},
+    ]
+    once = empty_data()
+    apply_changes(once, changes)
+    twice = empty_data()
+    apply_changes(twice, changes)
+    apply_changes(twice, changes)
+    assert once == twice
+    assert once["income"] == [{"id": 1, "amount": 5}]
+    assert once["next_ids"]["income"] == 3
+
+
+def test_round_trip_after_unclean_shutdown(tmp_path):
+    path = str(tmp_path / "data.json")
+    dm = DataManager(path, storage="journal")
+    dm.add_income("2024-01-01", "a", 1)
+    # The process dies halfway through appending a record, without close()
+    with open(path + ".journal", "a") as f:
+        f.write('{"op":"add","category":"inc')
+
+    restarted = DataManager(path, storage="journal")
+    assert incomes(restarted) == [(1, "a", 1)]
+    restarted.add_income("2024-01-02", "b", 2)
+    restarted.update_income(1, source="a2")
+
+    reloaded = DataManager(path, storage="journal")
+    assert incomes(reloaded) == [(1, "a2", 1), (2, "b", 2)]
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    path = str(tmp_path / "data.json")
+    dm = DataManager(path, storage="journal")
+    dm._store.compact_threshold = 2000
+    for day in range(1, 29):
+        dm.add_expense(f"2024-03-{day:02d}", "Food", day)
+    dm.delete_item("expenses", 5)
+    dm._store._wait_for_compaction()
+    assert not os.path.exists(path + ".journal.compacting")
+    with open(path) as f:
+        assert len(json.load(f)["expenses"]) > 10
+
+    reloaded = DataManager(path, storage="journal")
+    assert [r["id"] for r in reloaded.get_expenses()] == [i for i in range(1, 29) if i != 5]
+    dm.close()
+    closed = DataManager(path, storage="journal")
+    assert not os.path.exists(path + ".journal")
+    assert len(closed.get_expenses()) == 27
+
+
+def test_interrupted_compaction_replays_both_journals(tmp_path):
+    path = str(tmp_path / "data.json")
+    dm = DataManager(path, storage="journal")
+    dm.add_income("2024-01-01", "a", 1)
+    # Rotated aside for compaction, but the compactor never ran
+    dm._store._close_journal()
+    os.replace(path + ".journal", path + ".journal.compacting")
+    dm.add_income("2024-01-02", "b", 2)
+    dm.update_income(1, amount=7)
+
+    store = JournalStore(path)
+    data = store.load()
+    assert [(r["source"], r["amount"]) for r in data["income"]] == [("a", 7), ("b", 2)]
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+import process_pool
+
+PARENT = os.getpid()
+
+
+def square(i):
+    return i * i
+
+
+def square_or_die(i):
+    # Kills its worker process (breaking the pool) but succeeds when rerun here
+    if i == 3 and os.getpid() != PARENT:
+        os._exit(1)
+    return i * i, os.getpid() == PARENT
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_every_task_runs_once(workers):
+    results = dict(process_pool.imap_unordered(square, [(i,) for i in range(7)], workers))
+    assert results == {i: i * i for i in range(7)}
+
+
+def test_broken_pool_reruns_only_unfinished_tasks():
+    seen = []
+    progress = []
+    for index, (value, ran_here) in process_pool.imap_unordered(
+            square_or_die, [(i,) for i in range(6)], 2, lambda done, total: progress.append((done, total))):
+        seen.append(index)
+        assert value == index * index
+        if index == 3:
+            assert ran_here
+    assert sorted(seen) == list(range(6))
+    assert progress == [(done, 6) for done in range(1, 7)]
+
+
+def test_progress_error_propagates():
+    def stop(done, total):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        list(process_pool.imap_unordered(square, [(i,) for i in range(4)], 2, stop))
@@ -0,0 +1,75 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from data_manager import DataManager
+
+
+@pytest.fixture
+def dm(tmp_path):
+    rng = random.Random(7)
+    manager = DataManager(str(tmp_path / "data.json"))
+    with manager.batch():
+        for _ in range(300):
+            day = None if rng.random() < 0.1 else (date(2024, 1, 1) + timedelta(days=rng.randrange(90))).isoformat()
+            manager.add_income(day, "job", rng.randint(1, 100))
+    return manager
+
+
+@pytest.mark.parametrize("newest_first", [False, True])
+@pytest.mark.parametrize("bounds", [(None, None), (date(2024, 2, 1), date(2024, 2, 29)), ("2024-03-15", None)])
+@pytest.mark.parametrize("include_undated", [True, False])
+def test_view_matches_query_range(dm, newest_first, bounds, include_undated):
+    expected = dm.query_range("income", *bounds, include_undated=include_undated)
+    if newest_first:
+        expected = expected[::-1]
+    view = dm.range_view("income", *bounds, include_undated=include_undated, newest_first=newest_first)
+    assert len(view) == len(expected)
+    assert list(view) == expected
+    rng = random.Random(1)
+    for _ in range(200):
+        i, j = sorted(rng.randrange(-5, len(expected) + 5) for _ in range(2))
+        assert view[i:j] == expected[i:j]
+    assert view[::7] == expected[::7]
+    assert view[-1] is expected[-1]
+    for pos, record in enumerate(expected):
+        assert view.index_of(str(record["id"])) == pos
+    with pytest.raises(IndexError):
+        view[len(expected)]
+
+
+def test_view_is_live_and_skips_missing_ids(dm):
+    view = dm.range_view("income", newest_first=True)
+    before = len(view)
+    new_id = dm.add_income("2030-01-01", "bonus", 1)
+    assert len(view) == before + 1
+    assert view[0]["id"] == new_id
+    dm.delete_item("income", new_id)
+    assert view.index_of(new_id) is None
+    assert view.index_of("not an id") is None
+    assert dm.range_view("income", "2024-02-01", "2024-01-01", include_undated=False)[:] == []
+
+
+@pytest.mark.parametrize("bounds", [("garbage", None), (None, "2024-13-01"), ("", None)])
+def test_unparsable_bound_raises_value_error(dm, bounds):
+    calls = [
+        lambda: dm.query_range("income", *bounds),
+        lambda: dm.count_range("income", *bounds),
+        lambda: dm.iter_range("income", *bounds),
+        lambda: dm.daily_totals("income", *bounds),
+        lambda: dm.rollup_totals("income", *bounds),
+        lambda: dm.range_view("income", *bounds),
+    ]
+    for call in calls:
+        with pytest.raises(ValueError, match="start|end"):
+            call()
+
+
+def test_unparsable_record_date_is_undated(dm):
+    item_id = dm.add_income("not a date", "job", 5)
+    assert item_id in [r["id"] for r in dm.query_range("income")]
+    assert item_id not in [r["id"] for r in dm.query_range("income", include_undated=False)]
+    newest = dm.range_view("income", newest_first=True)
+    undated = dm.count_range("income") - dm.count_range("income", include_undated=False)
+    assert item_id in [r["id"] for r in newest[len(newest) - undated:]]
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import retirement_sim
+from retirement_sim import SimParams
+
+
+def test_zero_volatility_matches_fixed_rate_projection():
+    params = SimParams(35, 65, 10000, 6000, 0.07, 0.0, 0.02, 0.0, index_contributions=False)
+    result = retirement_sim.simulate(params, n_paths=50, seed=1)
+
+    balance, real = 10000.0, []
+    for year in range(1, 31):
+        balance = balance * 1.07 + 6000
+        real.append(balance / 1.02 ** year)
+
+    assert list(result.ages) == list(range(36, 66))
+    for q in retirement_sim.PERCENTILES:
+        np.testing.assert_allclose(result.percentiles[q], real, rtol=1e-12)
+        assert result.final_nominal[q] == pytest.approx(balance, rel=1e-12)
+
+
+def test_same_seed_gives_same_result():
+    params = SimParams(40, 60, 50000, 10000, 0.06, 0.15, target=400000)
+    first = retirement_sim.simulate(params, n_paths=2000, seed=42)
+    second = retirement_sim.simulate(params, n_paths=2000, seed=42)
+    other = retirement_sim.simulate(params, n_paths=2000, seed=43)
+    for q in retirement_sim.PERCENTILES:
+        np.testing.assert_array_equal(first.percentiles[q], second.percentiles[q])
+    assert first.success_probability == second.success_probability
+    assert 0.0 < first.success_probability < 1.0
+    assert not np.array_equal(first.percentiles[50], other.percentiles[50])
+
+
+@pytest.mark.parametrize("distribution", retirement_sim.DISTRIBUTIONS)
+def test_draw_returns_has_requested_moments(distribution):
+    params = SimParams(30, 60, 0, 0, 0.07, 0.15, distribution=distribution, t_df=8)
+    returns = retirement_sim.draw_returns(np.random.default_rng(0), params, 400000)
+    assert returns.mean() == pytest.approx(0.07, abs=0.002)
+    assert returns.std() == pytest.approx(0.15, abs=0.003)
+    assert returns.min() >= -1.0
+
+
+def test_invalid_parameters_raise():
+    with pytest.raises(ValueError):
+        retirement_sim.simulate(SimParams(65, 65, 0, 0, 0.05), n_paths=10, seed=0)
+    with pytest.raises(ValueError):
+        retirement_sim.simulate(SimParams(30, 65, 0, 0, 0.05, distribution='uniform'), n_paths=10, seed=0)
@@ -0,0 +1,80 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from data_manager import ROLLUPS, DataManager
+
+FIRST_DAY = date(2023, 11, 1)
+CATEGORIES = ("Food", "Rent", "Income Tax", "Property Tax", "Fuel")
+
+
+def random_day(rng):
+    return FIRST_DAY + timedelta(days=rng.randrange(0, 500))
+
+
+def brute_force(dm, name, start, end):
+    category = ROLLUPS[name][0]
+    kind_field = "category" if category == "expenses" else "source"
+    accepts = dm._rollup_filters[name]
+    totals = {}
+    for record in dm.get_expenses() if category == "expenses" else dm.get_income():
+        if record["date"] is not None:
+            day = date.fromisoformat(record["date"])
+            if (start is not None and day < start) or (end is not None and day > end):
+                continue
+        if accepts is None or accepts(record):
+            kind = record[kind_field]
+            totals[kind] = totals.get(kind, 0.0) + record["amount"]
+    return totals
+
+
+def assert_matches(dm, rng, rounds=300):
+    for _ in range(rounds):
+        start = None if rng.random() < 0.15 else random_day(rng)
+        end = None if rng.random() < 0.15 else random_day(rng)
+        if rng.random() < 0.2 and start is not None:
+            # Single-day, same-month and month-edge ranges
+            end = start + timedelta(days=rng.choice((0, 1, 27, 30, 31)))
+        for name in ROLLUPS:
+            got = {kind: total for kind, total in dm.rollup_totals(name, start, end).items() if abs(total) > 1e-9}
+            want = brute_force(dm, name, start, end)
+            assert got.keys() == want.keys(), (name, start, end)
+            for kind in want:
+                assert got[kind] == pytest.approx(want[kind]), (name, start, end, kind)
+
+
+def test_rollup_totals_match_brute_force_over_random_data(tmp_path):
+    rng = random.Random(2024)
+    dm = DataManager(str(tmp_path / "data.json"))
+    with dm.batch():
+        for _ in range(600):
+            day = None if rng.random() < 0.05 else random_day(rng).isoformat()
+            dm.add_expense(day, rng.choice(CATEGORIES), rng.randint(1, 50000) / 100,
+                           is_tax_deductible=rng.random() < 0.3)
+            dm.add_income(random_day(rng).isoformat(), rng.choice(("Salary", "Gift")), rng.randint(1, 9000))
+    assert_matches(dm, rng)
+
+    # Edits that move records between months, kinds and tax classes, and deletes
+    expenses = list(dm.get_expenses())
+    for record in rng.sample(expenses, 150):
+        dm.update_expense(record["id"], date=random_day(rng).isoformat(), amount=rng.randint(1, 100),
+                          category=rng.choice(CATEGORIES), is_tax_deductible=rng.random() < 0.5)
+    for record in rng.sample(expenses, 100):
+        dm.delete_item("expenses", record["id"])
+    assert_matches(dm, rng)
+
+    dm.set_tax_categories(("Rent",))
+    assert_matches(dm, rng, rounds=100)
+
+
+def test_partial_edge_months(tmp_path):
+    dm = DataManager(str(tmp_path / "data.json"))
+    for day, amount in (("2024-01-31", 1), ("2024-02-01", 2), ("2024-02-15", 4), ("2024-02-29", 8), ("2024-03-01", 16)):
+        dm.add_expense(day, "Food", amount)
+    assert dm.rollup_total("expenses", date(2024, 2, 1), date(2024, 2, 29)) == 14
+    assert dm.rollup_total("expenses", date(2024, 1, 31), date(2024, 3, 1)) == 31
+    assert dm.rollup_total("expenses", date(2024, 2, 2), date(2024, 2, 28)) == 4
+    assert dm.rollup_total("expenses", date(2024, 2, 15), date(2024, 2, 15)) == 4
+    assert dm.rollup_total("expenses", "2024-02-16", None) == 24
+    assert dm.rollup_total("expenses", None, "2024-02-14") == 3
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+import retirement_sim
+import sim_runner
+from retirement_sim import SimParams
+
+PARAMS = SimParams(40, 60, 50000, 10000, 0.06, 0.15, target=400000)
+
+
+def test_results_identical_for_any_worker_count():
+    results = [sim_runner.simulate(PARAMS, n_paths=35000, seed=7, workers=w) for w in (1, 2, 3, 4)]
+    first = results[0]
+    for result in results[1:]:
+        for q in retirement_sim.PERCENTILES:
+            np.testing.assert_array_equal(result.percentiles[q], first.percentiles[q])
+            assert result.final_nominal[q] == first.final_nominal[q]
+        assert result.success_probability == first.success_probability
+
+
+def test_sketch_percentiles_close_to_exact():
+    values = np.random.default_rng(3).lognormal(12, 1, size=(2, 20000))
+    estimated = sim_runner.sketch_percentiles(sim_runner.sketch(values), retirement_sim.PERCENTILES)
+    exact = np.percentile(values, retirement_sim.PERCENTILES, axis=1)
+    np.testing.assert_allclose(estimated, exact, rtol=0.01)
+
+
+def test_sketch_edge_bins():
+    counts = sim_runner.sketch([0.0, 0.5, 5e12])
+    assert counts.sum() == 3
+    assert counts[0, 0] == 2 and counts[0, -1] == 1
+    low, high = sim_runner.sketch_percentiles(counts, (0, 100))[:, 0]
+    assert low == 0.0 and high == sim_runner.SKETCH_MAX
+
+
+def test_matches_single_process_simulation():
+    merged = sim_runner.simulate(PARAMS, n_paths=20000, seed=11, workers=1)
+    direct = retirement_sim.simulate(PARAMS, n_paths=20000, seed=11)
+    assert merged.percentiles[50][-1] == pytest.approx(direct.percentiles[50][-1], rel=0.05)
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+import main
+from data_manager import DataManager
+from storage import SqliteStore, migrate_json_to_sqlite
+
+
+def write_json(path):
+    data = {
+        "income": [{"id": 1, "date": "2024-01-05", "source": "Salary", "amount": 3000.0}],
+        "expenses": [
+            {"id": 2, "date": "2024-01-06", "category": "Food", "amount": 12.5, "receipts": ["r1.jpg", "r2.pdf"]},
+            {"id": 4, "date": None, "category": "Rent", "amount": 900.0},
+        ],
+        "debts": [], "assets": [], "investments": [],
+        "next_ids": {"expenses": 7},
+    }
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return data
+
+
+def test_first_sqlite_run_migrates_json(tmp_path):
+    path = str(tmp_path / "data.json")
+    original = write_json(path)
+    dm = DataManager(path, storage="sqlite")
+    assert dm.get_income() == original["income"]
+    assert dm.get_expenses() == original["expenses"]
+    assert dm.add_expense("2024-01-07", "Food", 3) == 7
+    assert dm.add_income("2024-01-07", "Gift", 50) == 2
+
+
+def test_migrate_json_to_sqlite_round_trip(tmp_path):
+    original = write_json(str(tmp_path / "data.json"))
+    assert migrate_json_to_sqlite(str(tmp_path / "data.json"), str(tmp_path / "data.db")) == 3
+    store = SqliteStore(str(tmp_path / "data.db"))
+    try:
+        loaded = store.load()
+    finally:
+        store.close()
+    for category in ("income", "expenses"):
+        assert loaded[category] == original[category]
+    assert loaded["next_ids"]["expenses"] == 7
+
+
+def test_changes_survive_reopen_without_close(tmp_path):
+    path = str(tmp_path / "data.json")
+    dm = DataManager(path, storage="sqlite")
+    first = dm.add_expense("2024-05-01", "Food", 10, "lunch")
+    second = dm.add_expense("2024-05-02", "Fuel", 40)
+    dm._modify("expenses", dm.get_item("expenses", first), {"receipts": ["a.jpg"]})
+    dm.update_expense(second, amount=45)
+    dm.delete_item("expenses", first)
+    third = dm.add_expense("2024-05-03", "Food", 8)
+    dm._modify("expenses", dm.get_item("expenses", third), {"receipts": ["b.jpg", "c.jpg"]})
+
+    reloaded = DataManager(path, storage="sqlite")
+    assert [(r["id"], r["amount"], r.get("receipts")) for r in reloaded.get_expenses()] == [
+        (second, 45, None), (third, 8, ["b.jpg", "c.jpg"])]
+
+
+def test_unknown_storage_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        DataManager(str(tmp_path / "data.json"), storage="csv")
+
+
+def test_storage_is_selectable_from_the_command_line():
+    args = main.parse_args(["--storage", "sqlite", "--data-file", "x.json"])
+    assert (args.storage, args.data_file) == ("sqlite", "x.json")
+    assert main.parse_args([]).storage == "json"
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import withdrawal_sim
+from withdrawal_sim import WithdrawalParams
+
+
+def test_zero_volatility_rate_exhausts_balance_at_end_age():
+    params = WithdrawalParams(1000000, 65, 95, 0.05, 0.0, 0.02, 0.0)
+    paths = withdrawal_sim.draw_paths(params, 10, np.random.default_rng(0))
+    rate = withdrawal_sim.solve_rate(params, paths, tolerance=1e-6)
+    expected = 1 / sum((1.02 / 1.05) ** year for year in range(30))
+    assert rate == pytest.approx(expected, abs=1e-6)
+    assert withdrawal_sim.success_probability(params, paths, rate) == 1.0
+    assert withdrawal_sim.success_probability(params, paths, expected * 1.01) == 0.0
+
+
+def test_success_falls_as_rate_rises():
+    params = WithdrawalParams(800000, 60, 95, 0.05, 0.12)
+    paths = withdrawal_sim.draw_paths(params, 3000, np.random.default_rng(5))
+    success = [withdrawal_sim.success_probability(params, paths, rate) for rate in (0.02, 0.04, 0.06, 0.08)]
+    assert success == sorted(success, reverse=True)
+    assert success[0] > success[-1]
+
+
+def test_rmd_sets_minimum_withdrawal():
+    params = WithdrawalParams(500000, 73, 75, 0.0, 0.0, 0.0, 0.0, rmd=True)
+    paths = withdrawal_sim.draw_paths(params, 1, np.random.default_rng(0))
+    _, real = withdrawal_sim.run_withdrawals(params, paths, 0.0, record=True)
+    first = 500000 * (1 - 1 / 26.5)
+    assert real[0, 0] == pytest.approx(first)
+    assert real[1, 0] == pytest.approx(first * (1 - 1 / 25.5))
+
+
+def test_analyse_is_reproducible_and_shows_sequence_risk():
+    params = WithdrawalParams(1000000, 65, 95, 0.05, 0.15)
+    result = withdrawal_sim.analyse(params, n_paths=4000, target_probability=0.9, seed=9)
+    again = withdrawal_sim.analyse(params, n_paths=4000, target_probability=0.9, seed=9)
+    assert result.rate == again.rate
+    assert result.success_probability >= 0.9
+    worst, best = result.sequence_risk
+    assert worst < best
+    assert list(result.ages) == list(range(66, 96))
+
+
+def test_end_age_must_follow_retirement():
+    with pytest.raises(ValueError):
+        withdrawal_sim.draw_paths(WithdrawalParams(1000, 70, 70, 0.05), 10, np.random.default_rng(0))
@@ -0,0 +1,147 @@
+"""Withdrawal-phase (decumulation) simulation and safe-withdrawal-rate solver.
+
+Each path starts retirement with the same balance and, at the start of every year,
+withdraws the initial withdrawal rate times that balance, raised by the path's own
+inflation so spending keeps its value. The rest then earns the year's return, so a bad
+run of returns early in retirement hurts more than the same returns later (sequence
+risk). With RMDs on, a year's withdrawal is at least the IRS required minimum
+distribution (prior balance / Uniform Lifetime divisor); the excess over spending leaves
+the account. A path fails in the first year it cannot fund its spending.
+
+The solver draws returns and inflation once and bisects on the withdrawal rate, re-running
+only the cheap balance recursion over the same paths at each step, so success
+probability is exactly monotone in the rate and steps are comparable.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+import retirement_sim
+
+# IRS Uniform Lifetime Table (Publication 590-B, from 2022): distribution period by age
+UNIFORM_LIFETIME_TABLE = {
+    72: 27.4, 73: 26.5, 74: 25.5, 75: 24.6, 76: 23.7, 77: 22.9, 78: 22.0, 79: 21.1,
+    80: 20.2, 81: 19.4, 82: 18.5, 83: 17.7, 84: 16.8, 85: 16.0, 86: 15.2, 87: 14.4,
+    88: 13.7, 89: 12.9, 90: 12.2, 91: 11.5, 92: 10.8, 93: 10.1, 94: 9.5, 95: 8.9,
+    96: 8.4, 97: 7.8, 98: 7.3, 99: 6.8, 100: 6.4, 101: 6.0, 102: 5.6, 103: 5.2,
+    104: 4.9, 105: 4.6, 106: 4.3, 107: 4.1, 108: 3.9, 109: 3.7, 110: 3.5, 111: 3.4,
+    112: 3.3, 113: 3.1, 114: 3.0, 115: 2.9, 116: 2.8, 117: 2.7, 118: 2.5, 119: 2.3,
+    120: 2.0,
+}
+RMD_START_AGE = 73
+
+# Years at the start of retirement used to sort paths by early returns (sequence risk)
+SEQUENCE_YEARS = 10
+
+# balance is in today's money at retirement; rates are fractions as in retirement_sim.SimParams
+WithdrawalParams = namedtuple(
+    "WithdrawalParams",
+    "balance retire_age end_age return_mean return_stdev inflation_mean inflation_stdev "
+    "distribution t_df rmd",
+    defaults=(0.15, 0.02, 0.01, 'normal', 5, False),
+)
+
+# growth: 1 + return per year, shaped (years, n_paths); price_index: cumulative inflation
+# at the start of each year (1.0 in the first) and at the end of the last, (years + 1, n_paths)
+WithdrawalPaths = namedtuple("WithdrawalPaths", "growth price_index")
+
+# rate: highest initial withdrawal rate meeting the target; success_probability at that
+# rate; ages and percentiles (real balance at the end of each year, as in SimResult);
+# sequence_risk: success at rate for paths whose first SEQUENCE_YEARS returns were in the
+# worst and best quarter, as (worst, best)
+WithdrawalResult = namedtuple(
+    "WithdrawalResult",
+    "rate success_probability target_probability ages percentiles sequence_risk n_paths seed",
+)
+
+
+def draw_paths(params, n_paths, rng):
+    years = int(params.end_age) - int(params.retire_age)
+    if years <= 0:
+        raise ValueError("End age must be greater than retirement age.")
+    growth = 1.0 + retirement_sim.draw_returns(rng, params, (years, n_paths))
+    inflation = params.inflation_mean + params.inflation_stdev * rng.standard_normal((years, n_paths))
+    price_index = np.ones((years + 1, n_paths))
+    np.cumprod(1.0 + inflation, axis=0, out=price_index[1:])
+    return WithdrawalPaths(growth, price_index)
+
+
+def rmd_divisors(params, years):
+    """Uniform Lifetime divisor for each year (inf where no RMD applies)."""
+    divisors = np.full(years, np.inf)
+    if params.rmd:
+        for year in range(years):
+            age = int(params.retire_age) + year
+            if age >= RMD_START_AGE:
+                divisors[year] = UNIFORM_LIFETIME_TABLE.get(min(age, 120), 2.0)
+    return divisors
+
+
+def run_withdrawals(params, paths, rate, record=False):
+    """Simulate withdrawals at rate over paths.
+
+    Returns (survived bool array, real balances shaped (years, n_paths) or None).
+    """
+    years, n_paths = paths.growth.shape
+    divisors = rmd_divisors(params, years)
+    spending = float(params.balance) * rate
+    balance = np.full(n_paths, float(params.balance))
+    failed = np.zeros(n_paths, dtype=bool)
+    real = np.empty((years, n_paths)) if record else None
+    withdrawal = np.empty(n_paths)
+    for year in range(years):
+        np.multiply(paths.price_index[year], spending, out=withdrawal)
+        if divisors[year] != np.inf:
+            np.maximum(withdrawal, balance / divisors[year], out=withdrawal)
+        failed |= withdrawal > balance
+        balance -= withdrawal
+        np.maximum(balance, 0.0, out=balance)
+        balance *= paths.growth[year]
+        if record:
+            np.divide(balance, paths.price_index[year + 1], out=real[year])
+    return ~failed, real
+
+
+def success_probability(params, paths, rate):
+    return float(np.mean(run_withdrawals(params, paths, rate)[0]))
+
+
+def solve_rate(params, paths, target_probability=0.9, tolerance=1e-4, high=0.2, progress=None):
+    """Highest withdrawal rate (to within tolerance) whose success probability over
+    paths is at least target_probability, by bisection on the same paths.
+
+    progress(step, steps) is called after each bisection step.
+    """
+    low = 0.0
+    while success_probability(params, paths, high) >= target_probability and high < 1.0:
+        low, high = high, min(1.0, high * 2)
+    steps = max(1, int(np.ceil(np.log2((high - low) / tolerance))))
+    for step in range(1, steps + 1):
+        mid = (low + high) / 2
+        if success_probability(params, paths, mid) >= target_probability:
+            low = mid
+        else:
+            high = mid
+        if progress is not None:
+            progress(step, steps)
+    return low
+
+
+def analyse(params, n_paths=20000, target_probability=0.9, seed=None, progress=None):
+    """Solve for the sustainable rate and describe the paths at that rate."""
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    paths = draw_paths(params, int(n_paths), np.random.default_rng(seed))
+    rate = solve_rate(params, paths, target_probability, progress=progress)
+    survived, real = run_withdrawals(params, paths, rate, record=True)
+
+    # Sequence risk: the same rate on paths sorted by their early compound return
+    with np.errstate(divide='ignore'):
+        early = np.log(paths.growth[:SEQUENCE_YEARS]).sum(axis=0)
+    worst_cut, best_cut = np.percentile(early, (25, 75))
+    sequence_risk = (float(np.mean(survived[early <= worst_cut])), float(np.mean(survived[early >= best_cut])))
+
+    ages = np.arange(int(params.retire_age) + 1, int(params.end_age) + 1)
+    percentiles = dict(zip(retirement_sim.PERCENTILES, np.percentile(real, retirement_sim.PERCENTILES, axis=1)))
+    return WithdrawalResult(rate, float(np.mean(survived)), target_probability, ages, percentiles,
+                            sequence_risk, int(n_paths), seed)